@@ -1,13 +1,87 @@
 """API key authentication middleware."""
 
+import hashlib
+import hmac
+import secrets
+import time
+
+from fastapi import HTTPException
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import JSONResponse
 from src.core.config import settings
+from src.core.tracing import span
 
 # Paths that don't require authentication
 PUBLIC_PATHS = {"/", "/openapi.json", "/docs", "/redoc"}
 
+# Webhooks from backends, authenticated by HMAC signature instead of API key
+SIGNED_PATHS = {"/cache/invalidate"}
+
+ADMIN_KEY_HEADER = "X-Admin-Key"
+SIGNATURE_HEADER = "X-Signature"
+TIMESTAMP_HEADER = "X-Timestamp"
+
+
+def require_admin_key(request: Request) -> None:
+    """Dependency guarding admin-only endpoints with the X-Admin-Key header.
+
+    Admin endpoints answer 404 while ADMIN_API_KEY is unset so they are not
+    discoverable on deployments that never enabled them.
+    """
+    if not settings.ADMIN_API_KEY:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+    admin_key = request.headers.get(ADMIN_KEY_HEADER, "")
+    if not secrets.compare_digest(admin_key.encode(), settings.ADMIN_API_KEY.encode()):
+        raise HTTPException(
+            status_code=403,
+            detail={
+                "error": {
+                    "code": "FORBIDDEN",
+                    "message": "Invalid or missing admin key.",
+                }
+            },
+        )
+
+
+def sign_webhook(body: bytes, timestamp: str, secret: str) -> str:
+    """Signature header value for a webhook body sent at ``timestamp``."""
+    message = timestamp.encode() + b"." + body
+    return "sha256=" + hmac.new(secret.encode(), message, hashlib.sha256).hexdigest()
+
+
+async def require_webhook_signature(request: Request) -> None:
+    """Dependency verifying an HMAC-SHA256 signed webhook from a backend.
+
+    The ``X-Signature`` header must be ``sha256=<hex>`` of
+    ``"{X-Timestamp}.{body}"`` keyed with CACHE_WEBHOOK_SECRET, and the
+    timestamp within CACHE_WEBHOOK_MAX_SKEW seconds. Webhooks answer 404
+    while no secret is configured.
+    """
+    if not settings.CACHE_WEBHOOK_SECRET:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+    timestamp = request.headers.get(TIMESTAMP_HEADER, "")
+    signature = request.headers.get(SIGNATURE_HEADER, "")
+    expected = sign_webhook(
+        await request.body(), timestamp, settings.CACHE_WEBHOOK_SECRET
+    )
+    try:
+        fresh = abs(time.time() - int(timestamp)) <= settings.CACHE_WEBHOOK_MAX_SKEW
+    except ValueError:
+        fresh = False
+    if not fresh or not secrets.compare_digest(signature.encode(), expected.encode()):
+        raise HTTPException(
+            status_code=401,
+            detail={
+                "error": {
+                    "code": "INVALID_SIGNATURE",
+                    "message": "Missing, stale or invalid webhook signature.",
+                }
+            },
+        )
+
 
 class APIKeyMiddleware(BaseHTTPMiddleware):
     """Validate API key from X-API-Key header."""
@@ -16,13 +90,24 @@ class APIKeyMiddleware(BaseHTTPMiddleware):
         # Skip auth for public endpoints and OPTIONS preflight
         if request.url.path in PUBLIC_PATHS or request.method == "OPTIONS":
             return await call_next(request)
+        if request.url.path in SIGNED_PATHS:
+            return await call_next(request)
+
+        with span("auth"):
+            rejection = self._check(request)
+        if rejection is not None:
+            return rejection
 
+        return await call_next(request)
+
+    def _check(self, request: Request) -> JSONResponse | None:
+        """Return an error response if the request is not authorized."""
         # Get valid API keys from config
         valid_keys = {k.strip() for k in settings.API_KEYS.split(",") if k.strip()}
 
         # If no keys configured, skip auth (development mode)
         if not valid_keys:
-            return await call_next(request)
+            return None
 
         api_key = request.headers.get("X-API-Key")
 
@@ -48,4 +133,4 @@ class APIKeyMiddleware(BaseHTTPMiddleware):
                 },
             )
 
-        return await call_next(request)
+        return None
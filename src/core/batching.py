@@ -0,0 +1,112 @@
+"""DataLoader-style batching of distinct keys requested close together.
+
+Callers ``load()`` one key at a time. Keys requested within the same event
+loop tick (or a short window) are collected and fetched with a single
+``batch_fn`` call, then each caller gets its own value back. If the batch
+call fails, or leaves some keys out, those keys fall back to ``single_fn``.
+This complements request coalescing: it merges *different* keys.
+"""
+
+import asyncio
+from functools import partial
+from typing import Awaitable, Callable, Generic, Hashable, Optional, TypeVar
+
+from src.core.metrics import UPSTREAM_BATCH_SIZE
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class BatchLoader(Generic[K, V]):
+    """Collect keys for ``window`` seconds (0 = this tick) and fetch them together."""
+
+    def __init__(
+        self,
+        name: str,
+        batch_fn: Callable[[list[K]], Awaitable[dict[K, V]]],
+        single_fn: Callable[[K], Awaitable[V]],
+        window: float = 0.0,
+        max_batch: int = 32,
+    ):
+        self.name = name
+        self.batch_fn = batch_fn
+        self.single_fn = single_fn
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: dict[K, asyncio.Future[V]] = {}
+        self._handle: Optional[asyncio.Handle] = None
+        # The loop only holds weak references to tasks; keep running batches.
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def load(self, key: K) -> V:
+        future = self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._pending[key] = future
+            if len(self._pending) >= self.max_batch:
+                self._dispatch()
+            elif self._handle is None:
+                if self.window > 0:
+                    self._handle = loop.call_later(self.window, self._dispatch)
+                else:
+                    self._handle = loop.call_soon(self._dispatch)
+        # One caller giving up must not cancel the value for the others.
+        return await asyncio.shield(future)
+
+    def _dispatch(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        batch, self._pending = self._pending, {}
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(partial(self._finished, batch))
+
+    def _finished(
+        self, batch: dict[K, "asyncio.Future[V]"], task: "asyncio.Task[None]"
+    ) -> None:
+        self._tasks.discard(task)
+        # Never leave a caller waiting on a batch that died.
+        if task.cancelled():
+            for future in batch.values():
+                future.cancel()
+        elif (error := task.exception()) is not None:
+            for future in batch.values():
+                _settle(future, error=error)
+
+    async def _run(self, batch: dict[K, "asyncio.Future[V]"]) -> None:
+        UPSTREAM_BATCH_SIZE.labels(loader=self.name).observe(len(batch))
+        keys = list(batch)
+        results: dict[K, V] = {}
+        if len(keys) > 1:
+            try:
+                results = await self.batch_fn(keys)
+            except Exception:
+                results = {}  # fall back to individual calls below
+        missing = [key for key in keys if key not in results]
+        outcomes = await asyncio.gather(
+            *(self.single_fn(key) for key in missing), return_exceptions=True
+        )
+        for key, outcome in zip(missing, outcomes):
+            if isinstance(outcome, BaseException):
+                _settle(batch[key], error=outcome)
+            else:
+                _settle(batch[key], value=outcome)
+        for key, value in results.items():
+            if key in batch:
+                _settle(batch[key], value=value)
+
+
+def _settle(
+    future: "asyncio.Future[V]",
+    value: Optional[V] = None,
+    error: Optional[BaseException] = None,
+) -> None:
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(value)  # type: ignore[arg-type]
@@ -0,0 +1,276 @@
+"""Tagged TTL cache for beat-books-data reads, with surrogate-key invalidation.
+
+Each cached response carries tags (surrogate keys) naming what it was built
+from, e.g. ``season:2024`` or ``team:kc:2024``. Invalidating a tag drops
+every entry carrying it, so a finished scrape or a webhook from the backend
+evicts exactly the affected responses and TTLs can be long.
+
+Tags:
+    ``stats``                     every stats response
+    ``season:{year}``             every stats response for a season
+    ``team:{team}:{year}``        one team's stats for a season
+    ``season-summary:{year}``     games, standings and players for a season
+    ``odds``, ``odds:{game_id}``  odds responses / one game's odds history
+
+Cached values are shared between requests and must not be mutated.
+
+An entry also holds the compressed bodies of responses built from it alone
+(see ``src.core.compression``), so they are evicted and invalidated with it.
+"""
+
+import asyncio
+import re
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from itertools import count
+from typing import Any, Awaitable, Callable, Hashable, Iterable, Optional
+
+from src.core.config import settings
+from src.core.metrics import GATEWAY_CACHE
+from src.core.tracing import span
+
+_TEAM_STATS = re.compile(r"^/stats/teams/(?P<team>[^/]+)$")
+_ODDS_HISTORY = re.compile(r"^/odds/history/(?P<game_id>[^/]+)$")
+_SEASON_SUMMARIES = ("/stats/games", "/stats/standings", "/stats/players")
+
+
+def cache_policy(
+    endpoint: str, params: Optional[dict[str, Any]]
+) -> Optional[tuple[float, list[str]]]:
+    """TTL and tags for a backend GET, or None if it is not cached."""
+    season = (params or {}).get("season")
+    if season is not None and settings.CACHE_STATS_TTL > 0:
+        team = _TEAM_STATS.match(endpoint)
+        if team:
+            tags = ["stats", f"season:{season}", _team_tag(team["team"], season)]
+            return settings.CACHE_STATS_TTL, tags
+        if endpoint in _SEASON_SUMMARIES:
+            tags = ["stats", f"season:{season}", f"season-summary:{season}"]
+            return settings.CACHE_STATS_TTL, tags
+    if endpoint.startswith("/odds/") and settings.CACHE_ODDS_TTL > 0:
+        history = _ODDS_HISTORY.match(endpoint)
+        tags = ["odds", f"odds:{history['game_id']}"] if history else ["odds"]
+        return settings.CACHE_ODDS_TTL, tags
+    return None
+
+
+def _team_tag(team: str, season: Any) -> str:
+    return f"team:{team.lower()}:{season}"
+
+
+def scrape_tags(year: Optional[int] = None, team: Optional[str] = None) -> list[str]:
+    """Tags made stale by a scrape of one team, a whole season, or everything."""
+    if year is None:
+        return ["stats"]
+    if team is None:
+        return [f"season:{year}"]
+    return [_team_tag(team, year), f"season-summary:{year}"]
+
+
+def cache_key(endpoint: str, params: Optional[dict[str, Any]]) -> Hashable:
+    return endpoint, tuple(sorted((params or {}).items()))
+
+
+class _LoadAbandoned(Exception):
+    """A shared load stopped because its caller was cancelled; retry it."""
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    expires: float
+    tags: tuple[str, ...]
+    # Compressed response bodies by (body digest, encoding).
+    variants: dict[tuple[bytes, str], bytes] = field(default_factory=dict)
+    live: bool = True
+
+
+# Entries read while handling the current request, when a caller collects them.
+served_entries: ContextVar[Optional[list[CacheEntry]]] = ContextVar(
+    "served_entries", default=None
+)
+
+
+class TaggedCache:
+    """LRU of at most ``max_entries`` values with TTLs and tag invalidation.
+
+    Concurrent misses for the same key share one load; if its caller is
+    cancelled, the waiters start a new one. A load that was in flight when
+    one of its tags was invalidated is returned but not stored.
+    Compressed variants attached to entries share a ``max_variant_bytes``
+    budget.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        max_variant_bytes: int = settings.COMPRESSION_CACHE_MAX_BYTES,
+    ):
+        self.max_entries = max_entries
+        self.max_variant_bytes = max_variant_bytes
+        self.variant_bytes = 0
+        self._entries: OrderedDict[Hashable, CacheEntry] = OrderedDict()
+        self._by_tag: dict[str, set[Hashable]] = {}
+        self._loading: dict[Hashable, asyncio.Future[Any]] = {}
+        self._started: dict[Hashable, int] = {}
+        self._clock = count(1)
+        # Only invalidations newer than the oldest load in flight matter.
+        self._invalidated_at: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> tuple[bool, Any]:
+        entry = self._entry(key)
+        if entry is None:
+            return False, None
+        return True, entry.value
+
+    def _entry(self, key: Hashable) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires <= time.monotonic():
+            self._drop(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def set(
+        self, key: Hashable, value: Any, ttl: float, tags: Iterable[str] = ()
+    ) -> None:
+        self._drop(key)
+        entry = CacheEntry(value, time.monotonic() + ttl, tuple(tags))
+        self._entries[key] = entry
+        for tag in entry.tags:
+            self._by_tag.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._drop(next(iter(self._entries)))
+
+    async def fetch(
+        self,
+        key: Hashable,
+        load: Callable[[], Awaitable[Any]],
+        ttl: float,
+        tags: Iterable[str] = (),
+    ) -> Any:
+        """Return the cached value for ``key``, loading and storing it on a miss."""
+        while True:
+            with span("cache") as record:
+                entry = self._entry(key)
+                loading = None if entry else self._loading.get(key)
+                result = "hit" if entry else "coalesced" if loading else "miss"
+                if record is not None:
+                    record.attributes["result"] = result
+            GATEWAY_CACHE.labels(result=result).inc()
+            if entry is not None:
+                _serve(entry)
+                return entry.value
+            if loading is None:
+                break
+            try:
+                value = await asyncio.shield(loading)
+            except _LoadAbandoned:
+                continue  # its caller was cancelled, not this one
+            _serve(self._entries.get(key))
+            return value
+
+        tags = tuple(tags)
+        started = next(self._clock)
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        self._loading[key] = future
+        self._started[key] = started
+        try:
+            value = await load()
+        except asyncio.CancelledError:
+            future.set_exception(_LoadAbandoned())
+            future.exception()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # retrieved here so waiters are optional
+            raise
+        else:
+            future.set_result(value)
+            if all(self._invalidated_at.get(tag, 0) < started for tag in tags):
+                self.set(key, value, ttl, tags)
+                _serve(self._entries.get(key))
+            return value
+        finally:
+            del self._loading[key]
+            del self._started[key]
+            self._prune_invalidations()
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        """Drop every entry carrying any of ``tags``; returns how many."""
+        stamp = next(self._clock)
+        dropped = 0
+        for tag in tags:
+            self._invalidated_at[tag] = stamp
+            for key in list(self._by_tag.get(tag, ())):
+                self._drop(key)
+                dropped += 1
+        self._prune_invalidations()
+        GATEWAY_CACHE.labels(result="invalidated").inc(dropped)
+        return dropped
+
+    def _prune_invalidations(self) -> None:
+        if not self._invalidated_at:
+            return
+        oldest = min(self._started.values(), default=None)
+        if oldest is None:
+            self._invalidated_at.clear()
+            return
+        for tag, stamp in list(self._invalidated_at.items()):
+            if stamp < oldest:
+                del self._invalidated_at[tag]
+
+    def variant(
+        self, entry: CacheEntry, digest: bytes, encoding: str
+    ) -> Optional[bytes]:
+        """A compressed body stored with ``entry``, if there is one."""
+        return entry.variants.get((digest, encoding))
+
+    def add_variant(
+        self, entry: CacheEntry, digest: bytes, encoding: str, body: bytes
+    ) -> None:
+        """Store a compressed body with ``entry`` while it is cached and in budget."""
+        if not entry.live or self.variant_bytes + len(body) > self.max_variant_bytes:
+            return
+        previous = entry.variants.pop((digest, encoding), None)
+        if previous is not None:
+            self.variant_bytes -= len(previous)
+        entry.variants[(digest, encoding)] = body
+        self.variant_bytes += len(body)
+
+    def clear(self) -> None:
+        for entry in self._entries.values():
+            entry.live = False
+        self._entries.clear()
+        self._by_tag.clear()
+        self._invalidated_at.clear()
+        self.variant_bytes = 0
+
+    def _drop(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        entry.live = False
+        self.variant_bytes -= sum(len(body) for body in entry.variants.values())
+        for tag in entry.tags:
+            keys = self._by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_tag[tag]
+
+
+def _serve(entry: Optional[CacheEntry]) -> None:
+    served = served_entries.get()
+    if served is not None and entry is not None:
+        served.append(entry)
+
+
+response_cache = TaggedCache(settings.CACHE_MAX_ENTRIES)
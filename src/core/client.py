@@ -1,27 +1,281 @@
-"""HTTP client for communicating with beat-books-data service."""
+"""HTTP clients for communicating with backend services."""
 
 import asyncio
 import random
+import re
+import time
+from collections import deque
+from contextlib import asynccontextmanager, suppress
+from functools import partial
 
 import httpx
-from typing import Optional, Dict, Any
+from typing import AsyncIterator, Callable, Optional, Dict, Any, cast
 from fastapi import HTTPException
+from starlette.responses import Response
 from src.core.config import settings
-from src.core.circuit_breaker import CircuitBreaker
+from src.core.batching import BatchLoader
+from src.core.cache import cache_key, cache_policy, response_cache
+from src.core.circuit_breaker import CircuitBreaker, CircuitState
+from src.core.compression import (
+    PREFERENCE,
+    accept_encoding_var,
+    accepted_encodings,
+    codecs,
+)
+from src.core.negotiation import JSON, passthrough_media_type, passthrough_var
+from src.core.tracing import outbound_headers, span
+from src.core.metrics import (
+    LabelLimiter,
+    UPSTREAM_BACKOFF_SECONDS,
+    UPSTREAM_CIRCUIT_REJECTIONS,
+    UPSTREAM_CIRCUIT_STATE,
+    UPSTREAM_POOL_IN_USE,
+    UPSTREAM_POOL_LIMIT,
+    UPSTREAM_POOL_WAIT,
+    UPSTREAM_REQUEST_DURATION,
+    UPSTREAM_RETRIES,
+)
 
 # Status codes that are safe to retry
 _RETRYABLE_STATUS_CODES = {502, 503, 504}
 
+# Endpoints that start work on the backend rather than read data; a retry
+# after a timeout would start the same work again.
+_NON_RETRYABLE_PREFIXES = ("/scrape",)
+
+# Failures raised before the request was sent, so the backend never saw it.
+# These are the only ones retried for non-idempotent calls.
+_UNSENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+# Compressed transport requested from backends, in the gateway's preference
+# order. Only codings we can decode are offered, since non-passthrough
+# responses are still parsed here.
+UPSTREAM_ACCEPT_ENCODING = ", ".join(e for e in PREFERENCE if e in codecs)
+
+# Backend route templates used as metric labels, so per-team and per-game
+# endpoints do not create a time series each.
+_UPSTREAM_ROUTE_TEMPLATES = (
+    (re.compile(r"^/stats/teams/[^/]+$"), "/stats/teams/{team}"),
+    (re.compile(r"^/odds/history/[^/]+$"), "/odds/history/{game_id}"),
+    (re.compile(r"^/scrape/[^/]+/\d+$"), "/scrape/{team}/{year}"),
+    (re.compile(r"^/scrape/\d+$"), "/scrape/{year}"),
+    (re.compile(r"^/backtest/[^/]+$"), "/backtest/{run_id}"),
+)
+
+_TEAM_STATS = re.compile(r"^/stats/teams/(?P<team>[^/]+)$")
+
+_CIRCUIT_STATE_VALUES = {
+    CircuitState.CLOSED: 0,
+    CircuitState.HALF_OPEN: 1,
+    CircuitState.OPEN: 2,
+}
+
+_route_labels = LabelLimiter(settings.METRICS_MAX_HANDLER_LABELS)
+
+
+def upstream_route_template(endpoint: str) -> str:
+    """Map a concrete backend endpoint to its route template for labelling."""
+    for pattern, template in _UPSTREAM_ROUTE_TEMPLATES:
+        if pattern.match(endpoint):
+            return template
+    return _route_labels(endpoint)
+
+
+def _media_type(response: httpx.Response) -> str:
+    return response.headers.get("content-type", "").split(";")[0].strip().lower()
+
+
+def _outcome(status_code: int) -> str:
+    return f"{status_code // 100}xx"
+
+
+class CircuitOpenError(httpx.ConnectError):
+    """Raised instead of calling a backend whose circuit breaker is open."""
+
+
+class _SlotReleasingStream(httpx.AsyncByteStream):
+    """Response body stream that frees its connection slot when closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release: Callable[[], None]):
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            self._release()
+
+
+class ConnectionSlots:
+    """A backend's connection pool, with wait-time and utilization metrics.
+
+    ``client()`` is one long-lived ``httpx.AsyncClient`` per backend whose
+    pool holds up to ``limit`` connections, kept alive between requests.
+    Each request holds a slot for as long as it uses a connection (a
+    streamed response until it is closed), so slots in use are connections
+    in use, and callers queue here, where the wait is measured, rather than
+    inside httpx.
+    """
+
+    def __init__(self, backend: str, limit: int, timeout: float = 30.0):
+        self.backend = backend
+        self.limit = limit
+        self.timeout = timeout
+        self.in_use = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._retiring: set[asyncio.Task[None]] = set()
+        UPSTREAM_POOL_LIMIT.labels(backend=backend).set(limit)
+
+    def client(self) -> httpx.AsyncClient:
+        """The pooled client, made on first use in each event loop.
+
+        Connections are bound to the loop that opened them, so a new loop
+        (a forked worker, or a test) gets a new client, and the old one is
+        closed.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            if self._client is not None and self._loop is not None:
+                self._retire(self._client, self._loop)
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.limit, max_keepalive_connections=self.limit
+                ),
+            )
+            self._loop = loop
+        return self._client
+
+    def _retire(
+        self, client: httpx.AsyncClient, loop: asyncio.AbstractEventLoop
+    ) -> None:
+        if loop.is_running():
+            # Still serving another thread: close it there.
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+            return
+        task = asyncio.get_running_loop().create_task(self._close_stale(client))
+        self._retiring.add(task)
+        task.add_done_callback(self._retiring.discard)
+
+    @staticmethod
+    async def _close_stale(client: httpx.AsyncClient) -> None:
+        # Connections opened on a loop that has since closed cannot shut down
+        # cleanly; closing the client still drops them from its pool.
+        with suppress(RuntimeError):
+            await client.aclose()
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[Callable[[], Callable[[], None]]]:
+        """Hold a slot for the block.
+
+        Yields ``detach``: calling it hands the slot to the caller, returning
+        a function that frees it, so a streamed response can keep its
+        connection after the block.
+        """
+        start = time.perf_counter()
+        if self.in_use >= self.limit or self._waiters:
+            waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except BaseException:
+                if waiter.done() and not waiter.cancelled():
+                    # A slot was handed over just as we were cancelled.
+                    self._release()
+                else:
+                    self._waiters.remove(waiter)
+                raise
+        else:
+            self.in_use += 1
+        UPSTREAM_POOL_WAIT.labels(backend=self.backend).observe(
+            time.perf_counter() - start
+        )
+        UPSTREAM_POOL_IN_USE.labels(backend=self.backend).set(self.in_use)
+        held = True
+
+        def release() -> None:
+            nonlocal held
+            if held:
+                held = False
+                self._release()
+
+        def detach() -> Callable[[], None]:
+            nonlocal held
+            held = False
+            return _once(self._release)
+
+        try:
+            yield detach
+        finally:
+            release()
+
+    def _release(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                # Hand the slot straight to the next waiter.
+                waiter.set_result(None)
+                return
+        self.in_use -= 1
+        UPSTREAM_POOL_IN_USE.labels(backend=self.backend).set(self.in_use)
+
+
+def _once(fn: Callable[[], None]) -> Callable[[], None]:
+    called = False
+
+    def call() -> None:
+        nonlocal called
+        if not called:
+            called = True
+            fn()
+
+    return call
+
 
 class DataServiceClient:
     """Client for making requests to beat-books-data service."""
 
     def __init__(self):
+        self.backend = "beat-books-data"
         self.base_url = settings.DATA_SERVICE_URL
         self.timeout = 30.0
         self.circuit_breaker = CircuitBreaker()
         self.max_retries = settings.RETRY_MAX_ATTEMPTS
         self.base_delay = settings.RETRY_BASE_DELAY
+        self.slots = ConnectionSlots(
+            self.backend, settings.UPSTREAM_MAX_CONNECTIONS, self.timeout
+        )
+        self.team_stats_batch_path = settings.UPSTREAM_TEAM_STATS_BATCH_PATH
+        self.team_stats_loader: Optional[BatchLoader[tuple[Any, str], Any]] = None
+        if self.team_stats_batch_path:
+            self.team_stats_loader = BatchLoader(
+                "team_stats",
+                self._team_stats_batch,
+                self._team_stats_single,
+                window=settings.UPSTREAM_BATCH_WINDOW,
+                max_batch=settings.UPSTREAM_BATCH_MAX_KEYS,
+            )
+
+    def _record_circuit_state(self) -> None:
+        UPSTREAM_CIRCUIT_STATE.labels(backend=self.backend).set(
+            _CIRCUIT_STATE_VALUES[self.circuit_breaker.state]
+        )
+
+    async def aclose(self) -> None:
+        """Close pooled connections."""
+        await self.slots.aclose()
 
     async def _make_request(
         self,
@@ -29,9 +283,27 @@ class DataServiceClient:
         endpoint: str,
         params: Optional[Dict[str, Any]] = None,
         json_data: Optional[Dict[str, Any]] = None,
-    ) -> Dict[str, Any]:
-        """Make HTTP request to data service with retry logic."""
+        accept: Optional[str] = None,
+        encodings: frozenset[str] = frozenset(),
+        stream: bool = False,
+        content: Optional[AsyncIterator[bytes]] = None,
+        content_type: Optional[str] = None,
+    ) -> Any:
+        """Make HTTP request to data service with retry logic.
+
+        Reads are retried on connection errors, timeouts and 502/503/504.
+        POSTs and scrapes are not idempotent: they are retried only when the
+        connection could not be made, since any other failure may have
+        reached the backend and started the work. When ``accept`` names a
+        binary format and the backend answers in it, or the backend
+        compresses its body with one of ``encodings``, the body is returned
+        untouched as a ``Response`` instead of parsed. With ``stream`` the
+        successful ``httpx.Response`` is returned unread.
+        A streamed request ``content`` body is sent once, never retried.
+        """
         if not self.circuit_breaker.allow_request():
+            UPSTREAM_CIRCUIT_REJECTIONS.labels(backend=self.backend).inc()
+            self._record_circuit_state()
             raise HTTPException(
                 status_code=503,
                 detail={
@@ -43,25 +315,64 @@ class DataServiceClient:
             )
 
         url = f"{self.base_url}{endpoint}"
+        route = upstream_route_template(endpoint)
         last_exception: Exception | None = None
+        idempotent = method == "GET" and not endpoint.startswith(
+            _NON_RETRYABLE_PREFIXES
+        )
+        max_attempts = 1 if content is not None else self.max_retries
+        attempts = 0
 
-        for attempt in range(self.max_retries):
+        while attempts < max_attempts:
+            attempt, attempts = attempts, attempts + 1
+            if attempt > 0:
+                UPSTREAM_RETRIES.labels(backend=self.backend, route=route).inc()
+                await self._wait_backoff(attempt - 1)
+            outcome = "error"
+            start = time.perf_counter()
             try:
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
-                    response = await client.request(
-                        method=method, url=url, params=params, json=json_data
-                    )
+                with span(
+                    "upstream",
+                    kind=3,
+                    backend=self.backend,
+                    route=route,
+                    attempt=attempt + 1,
+                ):
+                    async with self.slots.acquire() as detach:
+                        start = time.perf_counter()
+                        response: httpx.Response | Response
+                        if stream:
+                            response = await self._open(method, url, params, detach)
+                        else:
+                            response = await self._send(
+                                method,
+                                url,
+                                params,
+                                json_data,
+                                accept,
+                                encodings,
+                                content,
+                                content_type,
+                            )
+                    outcome = _outcome(response.status_code)
+                    if isinstance(response, Response):
+                        self.circuit_breaker.record_success()
+                        return response
                     response.raise_for_status()
                     self.circuit_breaker.record_success()
+                    if stream:
+                        return response
+                    if accept and _media_type(response) == accept:
+                        return Response(content=response.content, media_type=accept)
                     return response.json()
 
             except httpx.HTTPStatusError as e:
-                if e.response.status_code in _RETRYABLE_STATUS_CODES:
+                outcome = _outcome(e.response.status_code)
+                if idempotent and e.response.status_code in _RETRYABLE_STATUS_CODES:
                     if e.response.status_code >= 500:
                         self.circuit_breaker.record_failure()
                     last_exception = e
-                    if attempt < self.max_retries - 1:
-                        await self._wait_backoff(attempt)
+                    if attempts < max_attempts:
                         continue
                 # Non-retryable HTTP error — raise immediately
                 if e.response.status_code >= 500:
@@ -73,11 +384,18 @@ class DataServiceClient:
                     ),
                 )
             except httpx.RequestError as e:
+                outcome = (
+                    "timeout" if isinstance(e, httpx.TimeoutException) else "error"
+                )
                 self.circuit_breaker.record_failure()
                 last_exception = e
-                if attempt < self.max_retries - 1:
-                    await self._wait_backoff(attempt)
-                    continue
+                if not idempotent and not isinstance(e, _UNSENT_ERRORS):
+                    break
+            finally:
+                UPSTREAM_REQUEST_DURATION.labels(
+                    backend=self.backend, route=route, method=method, outcome=outcome
+                ).observe(time.perf_counter() - start)
+                self._record_circuit_state()
 
         # All retries exhausted
         if isinstance(last_exception, httpx.HTTPStatusError):
@@ -94,22 +412,195 @@ class DataServiceClient:
             detail={
                 "error": {
                     "code": "SERVICE_UNAVAILABLE",
-                    "message": f"Unable to connect to data service after {self.max_retries} attempts: {str(last_exception)}",
+                    "message": f"Unable to connect to data service after {attempts} attempts: {str(last_exception)}",
                 }
             },
         )
 
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        json_data: Optional[Dict[str, Any]],
+        accept: Optional[str] = None,
+        encodings: frozenset[str] = frozenset(),
+        content: Optional[AsyncIterator[bytes]] = None,
+        content_type: Optional[str] = None,
+    ) -> httpx.Response | Response:
+        """Send a single attempt, forwarding the request ID and trace context.
+
+        With ``encodings`` set, a successful body compressed in one of them
+        (and already in the negotiated format) is returned still compressed
+        as a ``Response``, without being inflated.
+        """
+        headers = self._headers(accept)
+        if content_type:
+            headers["Content-Type"] = content_type
+        client = self.slots.client()
+        if not encodings:
+            return await client.request(
+                method=method,
+                url=url,
+                params=params,
+                json=json_data,
+                content=content,
+                headers=headers,
+            )
+        request = client.build_request(
+            method, url, params=params, json=json_data, headers=headers
+        )
+        response = await client.send(request, stream=True)
+        try:
+            encoding = response.headers.get("content-encoding", "")
+            media_type = accept or JSON
+            if (
+                response.is_success
+                and encoding in encodings
+                and _media_type(response) == media_type
+            ):
+                raw = b"".join([chunk async for chunk in response.aiter_raw()])
+                return Response(
+                    content=raw,
+                    media_type=media_type,
+                    headers={"Content-Encoding": encoding},
+                )
+            await response.aread()
+            return response
+        finally:
+            await response.aclose()
+
+    async def _open(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        detach: Callable[[], Callable[[], None]],
+    ) -> httpx.Response:
+        """Send a single attempt, returning a successful response unread.
+
+        The response keeps the connection slot (taken with ``detach``) until
+        it is closed. Error responses are read and closed here so they can be
+        inspected like ``_send``'s.
+        """
+        client = self.slots.client()
+        request = client.build_request(
+            method, url, params=params, headers=self._headers()
+        )
+        response = await client.send(request, stream=True)
+        if not response.is_success:
+            try:
+                await response.aread()
+            finally:
+                await response.aclose()
+            return response
+        if response.is_closed:  # already read, so no connection is held
+            return response
+        response.stream = _SlotReleasingStream(
+            cast(httpx.AsyncByteStream, response.stream), detach()
+        )
+        return response
+
+    def _headers(self, accept: Optional[str] = None) -> dict[str, str]:
+        headers = outbound_headers()
+        headers["Accept-Encoding"] = UPSTREAM_ACCEPT_ENCODING
+        if accept:
+            headers["Accept"] = f"{accept}, application/json;q=0.5"
+        return headers
+
     async def _wait_backoff(self, attempt: int) -> None:
         """Wait with exponential backoff and jitter."""
         delay = self.base_delay * (2**attempt)
         jitter = random.uniform(0, delay * 0.5)  # nosec B311
+        UPSTREAM_BACKOFF_SECONDS.labels(backend=self.backend).inc(delay + jitter)
         await asyncio.sleep(delay + jitter)
 
-    async def get(
+    async def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """Make GET request.
+
+        Returns the parsed JSON body, or the backend's own bytes as a
+        ``Response`` when the calling route allows passthrough and the
+        backend speaks the client's negotiated format and content coding.
+        Stats and odds reads with a cache TTL configured are served from
+        the tagged response cache instead, always parsed. Team stats lookups
+        are merged with concurrent ones for other teams when beat-books-data
+        has a multi-get endpoint configured.
+        """
+        policy = cache_policy(endpoint, params)
+        if policy is not None:
+            ttl, tags = policy
+            return await response_cache.fetch(
+                cache_key(endpoint, params),
+                partial(self._get, endpoint, params, passthrough=False),
+                ttl,
+                tags,
+            )
+        return await self._get(endpoint, params, passthrough=passthrough_var.get())
+
+    async def _get(
+        self, endpoint: str, params: Optional[Dict[str, Any]], passthrough: bool
+    ) -> Any:
+        team = _TEAM_STATS.match(endpoint)
+        if team and self.team_stats_loader and params and set(params) == {"season"}:
+            return await self.team_stats_loader.load((params["season"], team["team"]))
+        if not passthrough:
+            return await self._make_request("GET", endpoint, params=params)
+        return await self._make_request(
+            "GET",
+            endpoint,
+            params=params,
+            accept=passthrough_media_type(),
+            encodings=accepted_encodings(accept_encoding_var.get()),
+        )
+
+    async def _team_stats_single(self, key: tuple[Any, str]) -> Any:
+        season, team = key
+        return await self._make_request(
+            "GET", f"/stats/teams/{team}", params={"season": season}
+        )
+
+    async def _team_stats_batch(
+        self, keys: list[tuple[Any, str]]
+    ) -> dict[tuple[Any, str], Any]:
+        """Fetch team stats for many (season, team) keys, one call per season.
+
+        The multi-get endpoint answers with an object keyed by team whose
+        values are what ``/stats/teams/{team}`` returns. Teams it leaves out
+        are fetched individually by the loader.
+        """
+        seasons: dict[Any, list[str]] = {}
+        for season, team in keys:
+            seasons.setdefault(season, []).append(team)
+
+        async def fetch(season: Any, teams: list[str]) -> dict[tuple[Any, str], Any]:
+            body = await self._make_request(
+                "GET",
+                self.team_stats_batch_path,
+                params={"season": season, "teams": ",".join(teams)},
+            )
+            found = {str(k).upper(): v for k, v in body.items()}
+            return {
+                (season, team): found[team.upper()]
+                for team in teams
+                if team.upper() in found
+            }
+
+        results: dict[tuple[Any, str], Any] = {}
+        for part in await asyncio.gather(
+            *(fetch(season, teams) for season, teams in seasons.items())
+        ):
+            results.update(part)
+        return results
+
+    async def stream(
         self, endpoint: str, params: Optional[Dict[str, Any]] = None
-    ) -> Dict[str, Any]:
-        """Make GET request."""
-        return await self._make_request("GET", endpoint, params=params)
+    ) -> httpx.Response:
+        """Make GET request, returning the response before its body is read.
+
+        Retries and the circuit breaker apply up to the response headers.
+        Iterate ``aiter_bytes()`` and ``aclose()`` the response when done.
+        """
+        return await self._make_request("GET", endpoint, params=params, stream=True)
 
     async def post(
         self, endpoint: str, json_data: Optional[Dict[str, Any]] = None
@@ -117,6 +608,89 @@ class DataServiceClient:
         """Make POST request."""
         return await self._make_request("POST", endpoint, json_data=json_data)
 
+    async def upload(
+        self, endpoint: str, content: AsyncIterator[bytes], content_type: str
+    ) -> Dict[str, Any]:
+        """POST a body streamed from ``content`` without buffering it.
+
+        The stream can only be read once, so the upload is not retried.
+        """
+        return await self._make_request(
+            "POST", endpoint, content=content, content_type=content_type
+        )
+
+
+class ModelServiceClient:
+    """Instrumented client for beat-books-model.
+
+    Unlike the data client this does not retry or translate errors: httpx
+    exceptions propagate so each prediction route can map them to its own
+    responses. Connection failures, timeouts and 5xx responses count against
+    a circuit breaker; while it is open calls fail fast with
+    ``CircuitOpenError``, a ``httpx.ConnectError``.
+    """
+
+    def __init__(self):
+        self.backend = "beat-books-model"
+        self.base_url = settings.MODEL_SERVICE_URL
+        self.timeout = 10.0
+        self.circuit_breaker = CircuitBreaker()
+        self.slots = ConnectionSlots(
+            self.backend, settings.UPSTREAM_MAX_CONNECTIONS, self.timeout
+        )
+
+    def _record_circuit_state(self) -> None:
+        UPSTREAM_CIRCUIT_STATE.labels(backend=self.backend).set(
+            _CIRCUIT_STATE_VALUES[self.circuit_breaker.state]
+        )
+
+    async def aclose(self) -> None:
+        """Close pooled connections."""
+        await self.slots.aclose()
+
+    async def get(
+        self, endpoint: str, params: Optional[Dict[str, Any]] = None
+    ) -> httpx.Response:
+        """Make GET request and raise ``httpx.HTTPStatusError`` on 4xx/5xx."""
+        if not self.circuit_breaker.allow_request():
+            UPSTREAM_CIRCUIT_REJECTIONS.labels(backend=self.backend).inc()
+            self._record_circuit_state()
+            raise CircuitOpenError("Model service circuit breaker is open")
+
+        route = upstream_route_template(endpoint)
+        outcome = "error"
+        start = time.perf_counter()
+        try:
+            with span("upstream", kind=3, backend=self.backend, route=route):
+                async with self.slots.acquire():
+                    start = time.perf_counter()
+                    response = await self.slots.client().get(
+                        f"{self.base_url}{endpoint}",
+                        params=params,
+                        headers=outbound_headers(),
+                    )
+                if response.status_code >= 500:
+                    self.circuit_breaker.record_failure()
+                else:
+                    self.circuit_breaker.record_success()
+                response.raise_for_status()
+                outcome = "2xx"
+                return response
+        except httpx.HTTPStatusError as e:
+            outcome = _outcome(e.response.status_code)
+            raise
+        except httpx.RequestError as e:
+            if isinstance(e, httpx.TimeoutException):
+                outcome = "timeout"
+            self.circuit_breaker.record_failure()
+            raise
+        finally:
+            UPSTREAM_REQUEST_DURATION.labels(
+                backend=self.backend, route=route, method="GET", outcome=outcome
+            ).observe(time.perf_counter() - start)
+            self._record_circuit_state()
+
 
-# Singleton instance
+# Singleton instances
 data_client = DataServiceClient()
+model_client = ModelServiceClient()
@@ -0,0 +1,380 @@
+"""Response compression — gzip, brotli and zstd negotiated from Accept-Encoding.
+
+Bodies of known length below ``COMPRESSION_MIN_SIZE`` are sent as-is. Larger
+ones are compressed in one shot. When a response was built from a single
+gateway cache entry, the compressed body is stored with that entry (keyed by
+a digest of the body), so a hot payload (the same season of games served
+over and over) is compressed once per encoding rather than once per request,
+and is dropped when the entry is evicted or invalidated. Other bodies are
+neither hashed nor kept. Streamed responses are compressed incrementally and
+flushed per chunk, so clients still receive data as it is produced.
+
+Run ``python -m src.core.compression <file>`` against a captured response
+body to compare ratio and CPU cost across encodings and levels.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import logging
+import sys
+import time
+import zlib
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Iterable,
+    Optional,
+    Protocol,
+    cast,
+)
+
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
+
+from src.core.cache import CacheEntry, TaggedCache, response_cache, served_entries
+from src.core.config import settings
+from src.core.metrics import (
+    RESPONSE_COMPRESSION_BYTES,
+    RESPONSE_COMPRESSION_CACHE,
+    RESPONSE_COMPRESSION_SECONDS,
+    LabelLimiter,
+    route_template,
+)
+from src.core.tracing import span
+
+GZIP = "gzip"
+BROTLI = "br"
+ZSTD = "zstd"
+
+# Server preference when the client accepts several encodings equally.
+PREFERENCE = (ZSTD, BROTLI, GZIP)
+
+# Bodies at least this large are compressed in a worker thread so a single
+# full-season export does not stall the event loop.
+OFFLOAD_BYTES = 256 * 1024
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/x-ndjson",
+    "application/msgpack",
+    "application/cbor",
+    "application/xml",
+    "application/javascript",
+    "image/svg+xml",
+)
+
+
+class StreamCompressor(Protocol):
+    def compress(self, data: bytes) -> bytes: ...
+
+    def finish(self) -> bytes: ...
+
+
+@dataclass(frozen=True)
+class Codec:
+    """One-shot and incremental compressors for a content coding."""
+
+    name: str
+    level: int
+    compress: Callable[[bytes], bytes]
+    stream: Callable[[], StreamCompressor]
+
+
+class _GzipStream:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+def _gzip(level: int) -> Codec:
+    return Codec(
+        GZIP,
+        level,
+        lambda data: gzip.compress(data, compresslevel=level, mtime=0),
+        lambda: _GzipStream(level),
+    )
+
+
+_factories: dict[str, Callable[[int], Codec]] = {GZIP: _gzip}
+
+try:
+    import brotli
+
+    class _BrotliStream:
+        def __init__(self, quality: int):
+            self._compressor = brotli.Compressor(quality=quality)
+
+        def compress(self, data: bytes) -> bytes:
+            return self._compressor.process(data) + self._compressor.flush()
+
+        def finish(self) -> bytes:
+            return self._compressor.finish()
+
+    def _brotli(level: int) -> Codec:
+        return Codec(
+            BROTLI,
+            level,
+            lambda data: brotli.compress(data, quality=level),
+            lambda: _BrotliStream(level),
+        )
+
+    _factories[BROTLI] = _brotli
+except ModuleNotFoundError:
+    logging.getLogger(__name__).info("brotli not installed — br encoding disabled")
+
+try:
+    import zstandard
+
+    class _ZstdStream:
+        def __init__(self, level: int):
+            self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+        def compress(self, data: bytes) -> bytes:
+            return self._compressor.compress(data) + self._compressor.flush(
+                zstandard.COMPRESSOBJ_FLUSH_BLOCK
+            )
+
+        def finish(self) -> bytes:
+            return self._compressor.flush()
+
+    def _zstd(level: int) -> Codec:
+        compressor = zstandard.ZstdCompressor(level=level)
+        return Codec(ZSTD, level, compressor.compress, lambda: _ZstdStream(level))
+
+    _factories[ZSTD] = _zstd
+except ModuleNotFoundError:
+    logging.getLogger(__name__).info("zstandard not installed — zstd encoding disabled")
+
+_LEVELS = {
+    GZIP: settings.COMPRESSION_GZIP_LEVEL,
+    BROTLI: settings.COMPRESSION_BROTLI_QUALITY,
+    ZSTD: settings.COMPRESSION_ZSTD_LEVEL,
+}
+
+codecs: dict[str, Codec] = {
+    name: factory(_LEVELS[name]) for name, factory in _factories.items()
+}
+
+
+# The inbound request's Accept-Encoding, for upstream clients that can
+# forward an already-compressed backend body.
+accept_encoding_var: ContextVar[str] = ContextVar("accept_encoding", default="")
+
+
+def _weights(accept_encoding: str) -> dict[str, float]:
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, *params = [p.strip() for p in part.split(";")]
+        q = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        weights[coding.lower()] = q
+    return weights
+
+
+def accepted_encodings(accept_encoding: str) -> frozenset[str]:
+    """Content codings the client accepts, whether or not we can produce them."""
+    weights = _weights(accept_encoding)
+    wildcard = weights.get("*", 0.0)
+    return frozenset(name for name in PREFERENCE if weights.get(name, wildcard) > 0)
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick a supported content coding from ``Accept-Encoding``, if any."""
+    if not accept_encoding:
+        return None
+    weights = _weights(accept_encoding)
+    wildcard = weights.get("*", 0.0)
+    best, best_q = None, 0.0
+    for name in PREFERENCE:
+        q = weights.get(name, wildcard)
+        if name in codecs and q > best_q:
+            best, best_q = name, q
+    return best
+
+
+def is_compressible(content_type: str) -> bool:
+    content_type = content_type.lower()
+    return content_type.startswith(COMPRESSIBLE_TYPES) or "+json" in content_type
+
+
+def _timed(fn: Callable[[bytes], bytes], body: bytes) -> tuple[bytes, float]:
+    start = time.perf_counter()
+    result = fn(body)
+    return result, time.perf_counter() - start
+
+
+async def _single(body: bytes) -> AsyncIterator[bytes]:
+    yield body
+
+
+class CompressionMiddleware(BaseHTTPMiddleware):
+    """Compress compressible responses in the client's preferred encoding."""
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = settings.COMPRESSION_MIN_SIZE,
+        cache: TaggedCache = response_cache,
+    ):
+        super().__init__(app)
+        self.minimum_size = minimum_size
+        self.cache = cache
+        self.routes = LabelLimiter(settings.METRICS_MAX_HANDLER_LABELS)
+
+    async def dispatch(
+        self, request: Request, call_next: RequestResponseEndpoint
+    ) -> Response:
+        entries: list[CacheEntry] = []
+        token = accept_encoding_var.set(request.headers.get("accept-encoding", ""))
+        served = served_entries.set(entries)
+        try:
+            # call_next always returns a streaming response wrapper.
+            response = cast(StreamingResponse, await call_next(request))
+        finally:
+            served_entries.reset(served)
+            accept_encoding_var.reset(token)
+        if (
+            response.status_code < 200
+            or response.status_code in (204, 304)
+            or not is_compressible(response.headers.get("content-type", ""))
+        ):
+            return response
+        response.headers.add_vary_header("Accept-Encoding")
+        if "content-encoding" in response.headers:
+            # Already compressed, e.g. a backend body forwarded verbatim.
+            return response
+        encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+        if encoding is None or request.method == "HEAD":
+            return response
+
+        route = self.routes(route_template(request))
+        length = response.headers.get("content-length")
+        if length is None:
+            # Unknown length: a genuine stream, compress as it flows.
+            response.body_iterator = self._stream(
+                response.body_iterator, encoding, route
+            )
+        else:
+            if int(length) < self.minimum_size:
+                return response
+            chunks = [chunk async for chunk in response.body_iterator]
+            body = b"".join(cast(Iterable[bytes], chunks))
+            with span("compress", encoding=encoding):
+                compressed = await self._compress(body, encoding, route, entries)
+            response.body_iterator = _single(compressed)
+            response.headers["content-length"] = str(len(compressed))
+        response.headers["content-encoding"] = encoding
+        return response
+
+    async def _compress(
+        self, body: bytes, encoding: str, route: str, entries: list[CacheEntry]
+    ) -> bytes:
+        # Only a body built from one cache entry has somewhere to be kept.
+        entry = entries[0] if len(entries) == 1 else None
+        digest = None
+        if entry is not None and len(body) <= settings.COMPRESSION_CACHE_MAX_BODY:
+            digest = hashlib.blake2b(body, digest_size=16).digest()
+            cached = self.cache.variant(entry, digest, encoding)
+            if cached is not None:
+                RESPONSE_COMPRESSION_CACHE.labels(result="hit").inc()
+                return cached
+            RESPONSE_COMPRESSION_CACHE.labels(result="miss").inc()
+
+        codec = codecs[encoding]
+        if len(body) >= OFFLOAD_BYTES:
+            compressed, elapsed = await asyncio.to_thread(_timed, codec.compress, body)
+        else:
+            compressed, elapsed = _timed(codec.compress, body)
+        _observe(route, encoding, elapsed, len(body), len(compressed))
+        if entry is not None and digest is not None:
+            self.cache.add_variant(entry, digest, encoding, compressed)
+        return compressed
+
+    async def _stream(
+        self, chunks: AsyncIterable[Any], encoding: str, route: str
+    ) -> AsyncIterator[bytes]:
+        compressor = codecs[encoding].stream()
+        elapsed = 0.0
+        size_in = size_out = 0
+        async for chunk in chunks:
+            out, took = _timed(compressor.compress, chunk)
+            elapsed += took
+            size_in += len(chunk)
+            size_out += len(out)
+            if out:
+                yield out
+        start = time.perf_counter()
+        out = compressor.finish()
+        elapsed += time.perf_counter() - start
+        yield out
+        _observe(route, encoding, elapsed, size_in, size_out + len(out))
+
+
+def _observe(
+    route: str, encoding: str, seconds: float, size_in: int, size_out: int
+) -> None:
+    RESPONSE_COMPRESSION_SECONDS.labels(route=route, encoding=encoding).observe(seconds)
+    RESPONSE_COMPRESSION_BYTES.labels(
+        route=route, encoding=encoding, direction="in"
+    ).inc(size_in)
+    RESPONSE_COMPRESSION_BYTES.labels(
+        route=route, encoding=encoding, direction="out"
+    ).inc(size_out)
+
+
+BENCHMARK_LEVELS = {GZIP: (1, 6, 9), BROTLI: (1, 4, 5, 8, 11), ZSTD: (1, 3, 9, 19)}
+
+
+def benchmark(body: bytes, rounds: int = 5) -> list[dict[str, Any]]:
+    """Measure ratio and per-call CPU time for each encoding and level."""
+    results = []
+    for name, factory in _factories.items():
+        for level in BENCHMARK_LEVELS[name]:
+            codec = factory(level)
+            best = float("inf")
+            for _ in range(rounds):
+                compressed, elapsed = _timed(codec.compress, body)
+                best = min(best, elapsed)
+            results.append(
+                {
+                    "encoding": name,
+                    "level": level,
+                    "bytes": len(compressed),
+                    "ratio": round(len(body) / max(len(compressed), 1), 2),
+                    "ms": round(best * 1000, 3),
+                    "mb_per_s": round(len(body) / best / 1e6, 1) if best else None,
+                }
+            )
+    return results
+
+
+if __name__ == "__main__":
+    for path in sys.argv[1:]:
+        with open(path, "rb") as f:
+            sample = f.read()
+        print(f"{path}: {len(sample)} bytes")
+        for row in benchmark(sample):
+            print(
+                f"  {row['encoding']:>4} level {row['level']:>2}: "
+                f"{row['bytes']:>9} bytes  x{row['ratio']:<6} "
+                f"{row['ms']:>9} ms  {row['mb_per_s']} MB/s"
+            )
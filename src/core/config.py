@@ -23,6 +23,12 @@ class Settings(BaseSettings):
     # Authentication
     API_KEYS: str = ""  # Comma-separated list of valid API keys
 
+    ADMIN_API_KEY: str = ""  # Enables /debug endpoints; empty = disabled
+
+    # Profiling
+    PROFILER_SAMPLE_INTERVAL: float = 0.005
+    PROFILER_MAX_SECONDS: float = 60.0
+
     # Circuit breaker
     CB_FAILURE_THRESHOLD: int = 5
     CB_RESET_TIMEOUT: float = 30.0
@@ -31,6 +37,95 @@ class Settings(BaseSettings):
     RETRY_MAX_ATTEMPTS: int = 3
     RETRY_BASE_DELAY: float = 0.1
 
+    # Fraction of trusted upstream responses validated against their models
+    UPSTREAM_VALIDATION_SAMPLE_RATE: float = 1.0
+
+    # beat-books-data applies ?fields= projection itself
+    UPSTREAM_SUPPORTS_FIELDS: bool = False
+
+    # Pooled, kept-alive upstream connections per backend
+    UPSTREAM_MAX_CONNECTIONS: int = 100
+
+    # Batched team stats lookups: beat-books-data multi-get endpoint taking
+    # ?season=&teams=KC,BUF (empty = backend has none, one call per team)
+    UPSTREAM_TEAM_STATS_BATCH_PATH: str = ""
+    UPSTREAM_BATCH_WINDOW: float = 0.0  # seconds to collect keys; 0 = same tick
+    UPSTREAM_BATCH_MAX_KEYS: int = 32
+
+    # Tracing
+    TRACE_SAMPLE_RATE: float = 0.01
+    TRACE_EXPORT_PATH: str = ""  # OTLP-JSON file for sampled traces; empty = off
+    SERVER_TIMING_ENABLED: bool = True
+
+    # Event loop lag monitor / load shedding
+    LOOP_LAG_SAMPLE_INTERVAL: float = 0.1
+    LOOP_LAG_WINDOW: int = 600  # samples kept for percentiles (~1 min)
+    LOAD_SHED_LAG_THRESHOLD: float = 0.25  # seconds; 0 disables shedding
+    LOAD_SHED_CRITICAL_PATHS: list[str] = ["/", "/metrics", "/predictions/predict"]
+    LOAD_SHED_LOW_PRIORITY_PREFIXES: list[str] = [
+        "/scrape",
+        "/predictions/batch",
+        "/predictions/week",
+        "/export",
+        "/players/all",
+    ]
+
+    # Metrics
+    METRICS_MAX_HANDLER_LABELS: int = 100
+
+    # Response compression
+    COMPRESSION_MIN_SIZE: int = 1024  # bytes; smaller bodies are sent as-is
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 5
+    COMPRESSION_ZSTD_LEVEL: int = 3
+    COMPRESSION_CACHE_MAX_BYTES: int = 32 * 1024 * 1024  # precompressed variants
+    COMPRESSION_CACHE_MAX_BODY: int = 4 * 1024 * 1024  # larger bodies aren't cached
+
+    # Concurrent page fetches for /players/all
+    PAGINATION_CONCURRENCY: int = 4
+
+    # Per-section time limit for /teams/{team}/dashboard
+    DASHBOARD_SECTION_TIMEOUT: float = 10.0
+
+    # /batch sub-requests
+    BATCH_MAX_REQUESTS: int = 50
+    BATCH_CONCURRENCY: int = 8  # sub-requests in flight per batch
+
+    # Response cache for beat-books-data reads (TTL seconds; 0 = not cached)
+    CACHE_STATS_TTL: float = 0.0
+    CACHE_ODDS_TTL: float = 0.0
+    CACHE_MAX_ENTRIES: int = 10000
+    CACHE_WEBHOOK_SECRET: str = ""  # HMAC key for /cache/invalidate; empty = off
+    CACHE_WEBHOOK_MAX_SKEW: int = 300  # seconds a signed timestamp stays valid
+
+    # Background scrape jobs
+    SCRAPE_WORKERS: int = 2  # scrapes run against beat-books-data at once
+    SCRAPE_JOB_HISTORY: int = 500  # finished jobs kept for status lookups
+    SCRAPE_TEAM_CONCURRENCY: int = 4  # teams in flight for per-team season scrapes
+    SCRAPE_TEAM_ATTEMPTS: int = 3  # tries per team before it is reported failed
+    SCRAPE_UPLOAD_MAX_BYTES: int = 50 * 1024 * 1024  # Excel uploads to /scrape/excel
+
+    # Prediction cache; /models is polled this often for the active version
+    MODEL_VERSION_POLL_INTERVAL: float = 30.0  # seconds; 0 = no prediction cache
+    MODEL_MATRIX_PRECOMPUTE: bool = False  # predict all 992 matchups per model
+    MODEL_MATRIX_ROW_PATH: str = ""  # bulk endpoint: one home team vs many
+    MODEL_MATRIX_CONCURRENCY: int = 4  # home teams predicted at once
+    PREDICTION_CONCURRENCY: int = 8  # games predicted at once per week or stream
+    PREDICTION_STREAM_MAX_GAMES: int = 10000  # lines read by /predictions/batch/stream
+    PREWARM_INTERVAL: float = 0.0  # seconds between warming upcoming weeks; 0 = off
+
+    # Last-known-good predictions, served while beat-books-model is down
+    LKG_DB_PATH: str = ""  # SQLite file; empty = off
+    LKG_MAX_AGE: float = 7 * 24 * 60 * 60  # oldest prediction served; 0 = any
+
+    # Idempotency-Key results for POST routes
+    IDEMPOTENCY_TTL: float = 24 * 60 * 60  # seconds a result is replayed
+    IDEMPOTENCY_MAX_KEYS: int = 10000
+
+    # Bulk export
+    EXPORT_CONCURRENCY: int = 4  # backend calls in flight per export
+    EXPORT_PAGE_SIZE: int = 200
+
     model_config = {"env_file": ".env"}
 
 
@@ -0,0 +1,176 @@
+"""Incremental row-to-file writers for bulk exports (Arrow IPC, Parquet, CSV).
+
+Each writer takes batches of row dicts and returns only the bytes produced by
+that batch, so an export can be streamed while holding a single batch in
+memory. The column set and types are fixed by the first non-empty batch;
+later batches are conformed to it.
+"""
+
+import csv
+import io
+import logging
+from enum import Enum
+from typing import Any, Optional, Protocol
+
+from fastapi import HTTPException
+
+pa: Any
+pq: Any
+try:
+    import pyarrow
+    import pyarrow.parquet
+
+    pa, pq = pyarrow, pyarrow.parquet
+except ModuleNotFoundError:
+    pa = pq = None
+    logging.getLogger(__name__).info(
+        "pyarrow not installed — Arrow and Parquet exports disabled"
+    )
+
+
+class ExportFormat(str, Enum):
+    """Supported bulk export formats."""
+
+    ARROW = "arrow"
+    PARQUET = "parquet"
+    CSV = "csv"
+
+
+MEDIA_TYPES = {
+    ExportFormat.ARROW: "application/vnd.apache.arrow.stream",
+    ExportFormat.PARQUET: "application/vnd.apache.parquet",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+class BatchWriter(Protocol):
+    def write(self, rows: list[dict[str, Any]]) -> bytes: ...
+
+    def close(self) -> bytes: ...
+
+
+class CSVWriter:
+    """CSV with a header row taken from the first batch's columns."""
+
+    def __init__(self) -> None:
+        self._buffer = io.StringIO()
+        self._writer: Optional[csv.DictWriter] = None
+
+    def write(self, rows: list[dict[str, Any]]) -> bytes:
+        if not rows:
+            return b""
+        if self._writer is None:
+            columns = list(dict.fromkeys(key for row in rows for key in row))
+            self._writer = csv.DictWriter(
+                self._buffer, fieldnames=columns, extrasaction="ignore"
+            )
+            self._writer.writeheader()
+        self._writer.writerows(rows)
+        return self._drain()
+
+    def close(self) -> bytes:
+        return self._drain()
+
+    def _drain(self) -> bytes:
+        data = self._buffer.getvalue().encode("utf-8")
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return data
+
+
+class _DrainableSink(io.RawIOBase):
+    """Write-only file that hands written bytes back on ``drain()``.
+
+    ``tell()`` keeps counting across drains, since Parquet records absolute
+    offsets in its footer.
+    """
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _conform(batch: Any, schema: Any) -> Any:
+    """Cast ``batch`` to ``schema``, filling missing columns with nulls."""
+    columns = []
+    for field in schema:
+        index = batch.schema.get_field_index(field.name)
+        if index == -1:
+            columns.append(pa.nulls(batch.num_rows, field.type))
+            continue
+        column = batch.column(index)
+        if column.type != field.type:
+            column = column.cast(field.type)
+        columns.append(column)
+    return pa.RecordBatch.from_arrays(columns, schema=schema)
+
+
+class ArrowWriter:
+    """Arrow IPC stream, or Parquet with one row group per batch."""
+
+    def __init__(self, parquet: bool = False) -> None:
+        self.parquet = parquet
+        self._sink = _DrainableSink()
+        self._writer: Any = None
+        self._schema: Any = None
+
+    def _open(self, schema: Any) -> None:
+        # A column that is entirely null in the first batch has no type yet.
+        self._schema = pa.schema(
+            [
+                pa.field(f.name, pa.string()) if pa.types.is_null(f.type) else f
+                for f in schema
+            ]
+        )
+        if self.parquet:
+            self._writer = pq.ParquetWriter(self._sink, self._schema)
+        else:
+            self._writer = pa.ipc.new_stream(self._sink, self._schema)
+
+    def write(self, rows: list[dict[str, Any]]) -> bytes:
+        if not rows:
+            return b""
+        batch = pa.RecordBatch.from_pylist(rows)
+        if self._writer is None:
+            self._open(batch.schema)
+        self._writer.write_batch(_conform(batch, self._schema))
+        return self._sink.drain()
+
+    def close(self) -> bytes:
+        if self._writer is None:
+            self._open(pa.schema([]))
+        self._writer.close()
+        return self._sink.drain()
+
+
+def new_writer(fmt: ExportFormat) -> BatchWriter:
+    """Create a writer for ``fmt``.
+
+    Raises:
+        HTTPException: 406 if ``fmt`` needs pyarrow and it is not installed
+    """
+    if fmt == ExportFormat.CSV:
+        return CSVWriter()
+    if pa is None:
+        raise HTTPException(
+            status_code=406,
+            detail=f"Export format '{fmt.value}' is not available on this server.",
+        )
+    return ArrowWriter(parquet=fmt == ExportFormat.PARQUET)
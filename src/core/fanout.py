@@ -0,0 +1,81 @@
+"""Bounded concurrent fan-out over backend calls."""
+
+import asyncio
+from collections import deque
+from typing import (
+    AsyncGenerator,
+    AsyncIterable,
+    Awaitable,
+    Callable,
+    Iterable,
+    TypeVar,
+)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+async def ordered_map(
+    fn: Callable[[T], Awaitable[R]], items: Iterable[T], limit: int
+) -> AsyncGenerator[R, None]:
+    """Run ``fn`` over ``items`` concurrently, yielding results in input order.
+
+    At most ``limit`` calls are in flight or waiting to be consumed, so memory
+    stays bounded however many items there are. A new call starts as soon as
+    the oldest result is handed to the consumer. If a call fails, or the
+    consumer stops early, every outstanding call is cancelled.
+    """
+    iterator = iter(items)
+    pending: deque[asyncio.Future[R]] = deque()
+
+    def start_next() -> None:
+        for item in iterator:
+            pending.append(asyncio.ensure_future(fn(item)))
+            return
+
+    try:
+        for _ in range(max(limit, 1)):
+            start_next()
+        while pending:
+            result = await pending.popleft()
+            start_next()
+            yield result
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def unordered_map(
+    fn: Callable[[T], Awaitable[R]], items: AsyncIterable[T], limit: int
+) -> AsyncGenerator[R, None]:
+    """Run ``fn`` over an async stream of ``items``, yielding results as they finish.
+
+    Items are pulled from ``items`` only while fewer than ``limit`` calls are
+    running, so a slow consumer slows reading too and memory stays bounded.
+    If a call fails, or the consumer stops early, every outstanding call is
+    cancelled.
+    """
+    iterator = aiter(items)
+    running: set[asyncio.Future[R]] = set()
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(running) < max(limit, 1):
+                try:
+                    item = await anext(iterator)
+                except StopAsyncIteration:
+                    exhausted = True
+                else:
+                    running.add(asyncio.ensure_future(fn(item)))
+            if not running:
+                return
+            done, running = await asyncio.wait(
+                running, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                yield task.result()
+    finally:
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
@@ -0,0 +1,167 @@
+"""Idempotency-Key support for POST routes that start work on a backend.
+
+A client retrying a POST after a slow or lost response sends the same
+``Idempotency-Key`` header. The first request with a key runs; duplicates
+arriving while it is in flight wait for it, and later ones replay its result
+(marked ``Idempotent-Replayed: true``) until ``IDEMPOTENCY_TTL`` expires.
+Keys are scoped per API key and route, and a key reused with a different
+request is rejected. Server errors are not remembered, so a retry after a
+5xx runs the request again.
+"""
+
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional
+
+from fastapi import HTTPException, Request
+from starlette.responses import Response
+
+from src.core.config import settings
+from src.core.metrics import IDEMPOTENT_REQUESTS
+from src.core.responses import FastJSONResponse
+
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+
+@dataclass
+class _Record:
+    fingerprint: str
+    outcome: asyncio.Future[Any]
+    expires: float = float("inf")  # until the first request finishes
+
+
+class IdempotencyStore:
+    """Results of keyed requests, kept ``ttl`` seconds, at most ``max_entries``."""
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._records: OrderedDict[str, _Record] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    async def run(
+        self, key: str, fingerprint: str, call: Callable[[], Awaitable[Any]]
+    ) -> tuple[Any, bool]:
+        """Run ``call`` once per ``key``; returns its result and whether it was reused.
+
+        Raises:
+            HTTPException: 422 if ``key`` was used for a different request,
+                or whatever the original request raised
+        """
+        record = self._records.get(key)
+        if record is not None and record.expires <= time.monotonic():
+            del self._records[key]
+            record = None
+        if record is not None:
+            if record.fingerprint != fingerprint:
+                IDEMPOTENT_REQUESTS.labels(outcome="conflict").inc()
+                raise HTTPException(
+                    status_code=422,
+                    detail={
+                        "error": {
+                            "code": "IDEMPOTENCY_KEY_REUSED",
+                            "message": "Idempotency-Key was already used for a different request.",
+                        }
+                    },
+                )
+            done = record.outcome.done()
+            IDEMPOTENT_REQUESTS.labels(outcome="replayed" if done else "attached").inc()
+            return await asyncio.shield(record.outcome), True
+
+        IDEMPOTENT_REQUESTS.labels(outcome="executed").inc()
+        record = _Record(fingerprint, asyncio.get_running_loop().create_future())
+        self._records[key] = record
+        self._trim()
+        try:
+            result = await call()
+        except BaseException as e:
+            if isinstance(e, HTTPException) and e.status_code < 500:
+                record.outcome.set_exception(e)
+                record.outcome.exception()  # retrieved here so waiters are optional
+                record.expires = time.monotonic() + self.ttl
+            else:
+                if self._records.get(key) is record:
+                    del self._records[key]
+                error = e
+                if isinstance(e, asyncio.CancelledError):
+                    error = HTTPException(
+                        status_code=503, detail="Original request was interrupted."
+                    )
+                record.outcome.set_exception(error)
+                record.outcome.exception()
+            raise
+        record.outcome.set_result(result)
+        record.expires = time.monotonic() + self.ttl
+        return result, False
+
+    def clear(self) -> None:
+        self._records.clear()
+
+    def _trim(self) -> None:
+        """Forget the oldest finished records beyond ``max_entries``."""
+        excess = len(self._records) - self.max_entries
+        if excess <= 0:
+            return
+        finished = [k for k, r in self._records.items() if r.outcome.done()]
+        for key in finished[:excess]:
+            del self._records[key]
+
+
+idempotency_store = IdempotencyStore(
+    settings.IDEMPOTENCY_TTL, settings.IDEMPOTENCY_MAX_KEYS
+)
+
+
+async def _fingerprint(request: Request, body_digest: Optional[str]) -> str:
+    digest = hashlib.sha256()
+    for part in (request.method, request.url.path, request.url.query):
+        digest.update(part.encode() + b"\0")
+    if body_digest is None:
+        digest.update(await request.body())
+    else:
+        digest.update(body_digest.encode())
+    return digest.hexdigest()
+
+
+def _replay(result: Any) -> Response:
+    """A fresh response for a stored result, marked as replayed."""
+    if isinstance(result, Response):
+        response = Response(
+            content=result.body,
+            status_code=result.status_code,
+            headers=dict(result.headers),
+        )
+    else:
+        response = FastJSONResponse(result)
+    response.headers[REPLAYED_HEADER] = "true"
+    return response
+
+
+async def idempotent(
+    request: Request,
+    key: Optional[str],
+    call: Callable[[], Awaitable[Any]],
+    body_digest: Optional[str] = None,
+) -> Any:
+    """Run a route's ``call`` under the request's Idempotency-Key, if any.
+
+    Requests are told apart by method, path, query and body. Routes that
+    stream their body pass ``body_digest`` (e.g. a declared checksum) so it
+    is not read here.
+    """
+    if key is None:
+        return await call()
+    api_key = request.headers.get("X-API-Key", "")
+    scope = hashlib.sha256(api_key.encode()).hexdigest()[:16]
+    result, reused = await idempotency_store.run(
+        f"{scope}:{request.url.path}:{key}",
+        await _fingerprint(request, body_digest),
+        call,
+    )
+    return _replay(result) if reused else result
@@ -0,0 +1,195 @@
+"""In-memory background job registry with a bounded worker pool.
+
+Long-running backend operations (scrapes) are submitted as jobs keyed by what
+they do, so a duplicate submission attaches to the job already queued or
+running instead of starting another. ``start()`` (called from the app
+lifespan) runs a fixed number of workers; until it is called, jobs run as
+soon as they are submitted.
+"""
+
+import asyncio
+import logging
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
+
+from fastapi import HTTPException
+
+from src.core.config import settings
+from src.core.metrics import BACKGROUND_JOBS
+
+logger = logging.getLogger(__name__)
+
+
+class JobStatus(str, Enum):
+    """Lifecycle of a background job."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+@dataclass(eq=False)
+class Job:
+    """A submitted unit of work and its outcome.
+
+    ``completed``/``total`` report progress; runners doing several steps
+    update them as they go and ``publish()`` an event per step. A final
+    ``done`` event is published when the job finishes.
+    """
+
+    id: str
+    key: str
+    run: Optional[Callable[["Job"], Awaitable[Any]]] = field(default=None, repr=False)
+    status: JobStatus = JobStatus.QUEUED
+    submitted_at: datetime = field(default_factory=_now)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    completed: int = 0
+    total: int = 1
+    result: Any = None
+    error: Optional[dict[str, Any]] = None
+    done: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+    events: list[dict[str, Any]] = field(default_factory=list, repr=False)
+    _changed: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JobStatus.SUCCEEDED, JobStatus.FAILED)
+
+    def publish(self, event: dict[str, Any]) -> None:
+        """Record a progress event and wake everyone following the job."""
+        self.events.append(event)
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    async def follow(self) -> AsyncIterator[dict[str, Any]]:
+        """Yield every event published so far, then new ones until finished."""
+        seen = 0
+        while True:
+            changed = self._changed
+            while seen < len(self.events):
+                yield self.events[seen]
+                seen += 1
+            if self.finished:
+                return
+            await changed.wait()
+
+
+class JobRegistry:
+    """Run jobs on ``workers`` background tasks, keeping the last ``history``."""
+
+    def __init__(self, name: str, workers: int, history: int):
+        self.name = name
+        self.workers = workers
+        self.history = history
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._active: dict[str, Job] = {}
+        self._queue: Optional[asyncio.Queue[Job]] = None
+        self._tasks: list[asyncio.Task[None]] = []
+
+    def start(self) -> None:
+        self._queue = asyncio.Queue()
+        self._tasks = [
+            asyncio.create_task(self._worker()) for _ in range(max(self.workers, 1))
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+    def submit(
+        self, key: str, run: Callable[[Job], Awaitable[Any]]
+    ) -> tuple[Job, bool]:
+        """Queue ``run`` under ``key``; returns the job and whether it is new.
+
+        While a job with the same key is queued or running, it is returned
+        instead of creating another.
+        """
+        job = self._active.get(key)
+        if job is not None:
+            BACKGROUND_JOBS.labels(registry=self.name, outcome="attached").inc()
+            return job, False
+        job = Job(id=uuid.uuid4().hex, key=key, run=run)
+        self._jobs[job.id] = job
+        self._active[key] = job
+        self._trim()
+        BACKGROUND_JOBS.labels(registry=self.name, outcome="created").inc()
+        if self._queue is not None:
+            self._queue.put_nowait(job)
+        else:
+            asyncio.ensure_future(self._execute(job))
+        return job, True
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    async def wait(self, job: Job) -> Any:
+        """Wait for ``job`` and return its result, re-raising its error."""
+        await job.done.wait()
+        if job.error is not None:
+            raise HTTPException(
+                status_code=job.error["status_code"], detail=job.error["detail"]
+            )
+        return job.result
+
+    async def _worker(self) -> None:
+        assert self._queue is not None
+        while True:
+            job = await self._queue.get()
+            await self._execute(job)
+
+    async def _execute(self, job: Job) -> None:
+        job.status, job.started_at = JobStatus.RUNNING, _now()
+        try:
+            assert job.run is not None
+            job.result = await job.run(job)
+            job.status, job.completed = JobStatus.SUCCEEDED, job.total
+        except HTTPException as e:
+            job.status = JobStatus.FAILED
+            job.error = {"status_code": e.status_code, "detail": e.detail}
+        except Exception:
+            logger.exception("Job %s (%s) failed", job.id, job.key)
+            job.status = JobStatus.FAILED
+            job.error = {"status_code": 500, "detail": "Job failed unexpectedly."}
+        finally:
+            if not job.finished:  # cancelled, e.g. at shutdown
+                job.status = JobStatus.FAILED
+                job.error = {"status_code": 503, "detail": "Job was interrupted."}
+            job.finished_at, job.run = _now(), None
+            if self._active.get(job.key) is job:
+                del self._active[job.key]
+            BACKGROUND_JOBS.labels(registry=self.name, outcome=job.status.value).inc()
+            job.publish(
+                {
+                    "event": "done",
+                    "status": job.status.value,
+                    "result": job.result,
+                    "error": job.error,
+                }
+            )
+            job.done.set()
+
+    def _trim(self) -> None:
+        """Forget the oldest finished jobs beyond ``history``."""
+        excess = len(self._jobs) - self.history
+        if excess <= 0:
+            return
+        for job_id in [j.id for j in self._jobs.values() if j.finished][:excess]:
+            del self._jobs[job_id]
+
+
+scrape_jobs = JobRegistry(
+    "scrape", workers=settings.SCRAPE_WORKERS, history=settings.SCRAPE_JOB_HISTORY
+)
@@ -0,0 +1,160 @@
+"""Last-known-good predictions, kept on disk for when the model is down.
+
+Every prediction the model makes is written to a local SQLite database
+(``LKG_DB_PATH``), one row per matchup, replacing the previous one. When
+beat-books-model cannot be reached (its circuit is open, or the call fails to
+connect, times out or errors), prediction routes answer from this store
+instead of failing, flagged as degraded and with the prediction's age.
+
+The database runs in WAL mode with ``synchronous=NORMAL``, so a write is a
+small append to the log, and reads go through SQLite's memory-mapped I/O.
+Reads and writes both run in worker threads, each on its own connection
+(WAL lets a reader proceed while a write is in progress), so neither stalls
+the event loop. Writes are fire-and-forget: a prediction is returned without
+waiting for it to be stored. The store survives restarts, which the
+in-memory prediction cache does not.
+"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from src.core.config import settings
+from src.core.metrics import LAST_KNOWN_GOOD
+
+logger = logging.getLogger(__name__)
+
+MMAP_BYTES = 64 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS predictions (
+    home TEXT NOT NULL,
+    away TEXT NOT NULL,
+    data TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (home, away)
+) WITHOUT ROWID
+"""
+
+_UPSERT = """
+INSERT INTO predictions (home, away, data, updated_at) VALUES (?, ?, ?, ?)
+ON CONFLICT (home, away)
+DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at
+"""
+
+
+@dataclass(frozen=True)
+class StoredPrediction:
+    """A prediction payload and when the model made it (epoch seconds)."""
+
+    data: dict[str, Any]
+    updated_at: float
+
+    @property
+    def age(self) -> float:
+        """Seconds since the prediction was made."""
+        return max(time.time() - self.updated_at, 0.0)
+
+
+class LastKnownGoodStore:
+    """The latest successful prediction for each matchup, in SQLite.
+
+    Disabled when ``path`` is empty. Predictions older than ``max_age``
+    seconds are not served (0 = any age). Database errors are logged and
+    never fail a request.
+    """
+
+    def __init__(self, path: str, max_age: float):
+        self.path = path
+        self.max_age = max_age
+        # Separate reader and writer connections, each used by one thread at a time.
+        self._reader: Optional[sqlite3.Connection] = None
+        self._writer: Optional[sqlite3.Connection] = None
+        self._read_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._writes: set[asyncio.Task[None]] = set()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute(f"PRAGMA mmap_size={MMAP_BYTES}")
+        db.execute(_SCHEMA)
+        return db
+
+    def put(self, home: str, away: str, data: Any) -> None:
+        """Record ``data`` as the latest prediction for the matchup.
+
+        The write runs in the background; ``flush`` waits for pending ones.
+        """
+        if not self.enabled or not isinstance(data, dict):
+            return
+        row = (home, away, json.dumps(data), time.time())
+        task = asyncio.create_task(asyncio.to_thread(self._write, row))
+        self._writes.add(task)
+        task.add_done_callback(self._writes.discard)
+
+    async def flush(self) -> None:
+        """Wait for background writes started so far."""
+        if self._writes:
+            await asyncio.gather(*self._writes)
+
+    def _write(self, row: tuple[str, str, str, float]) -> None:
+        try:
+            with self._write_lock:
+                if self._writer is None:
+                    self._writer = self._connect()
+                self._writer.execute(_UPSERT, row)
+        except sqlite3.Error as e:
+            logger.warning("Could not store last-known-good prediction: %s", e)
+
+    def _read(self, home: str, away: str) -> Optional[tuple[str, float]]:
+        try:
+            with self._read_lock:
+                if self._reader is None:
+                    self._reader = self._connect()
+                return self._reader.execute(
+                    "SELECT data, updated_at FROM predictions"
+                    " WHERE home = ? AND away = ?",
+                    (home, away),
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning("Could not read last-known-good prediction: %s", e)
+            return None
+
+    async def get(self, home: str, away: str) -> Optional[StoredPrediction]:
+        """The stored prediction for the matchup, if there is a fresh one."""
+        if not self.enabled:
+            return None
+        row = await asyncio.to_thread(self._read, home, away)
+        if row is None:
+            LAST_KNOWN_GOOD.labels(result="miss").inc()
+            return None
+        stored = StoredPrediction(json.loads(row[0]), row[1])
+        if self.max_age > 0 and stored.age > self.max_age:
+            LAST_KNOWN_GOOD.labels(result="expired").inc()
+            return None
+        LAST_KNOWN_GOOD.labels(result="served").inc()
+        return stored
+
+    def close(self) -> None:
+        with self._read_lock:
+            if self._reader is not None:
+                self._reader.close()
+                self._reader = None
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+
+last_known_good = LastKnownGoodStore(settings.LKG_DB_PATH, settings.LKG_MAX_AGE)
@@ -0,0 +1,146 @@
+"""Event loop lag monitor and lag-driven admission control.
+
+A background task repeatedly sleeps for a fixed interval and measures how
+late it wakes up. Anything beyond the interval is time the loop spent
+blocked (large JSON parses, validating big batches, ...) and is felt by
+every in-flight request. When the recent lag crosses the configured
+threshold the admission middleware sheds low-priority work first, then
+normal work, and always keeps serving the critical paths.
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from enum import Enum
+from typing import Optional
+
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+
+from src.core.config import settings
+from src.core.metrics import (
+    EVENT_LOOP_LAG,
+    EVENT_LOOP_LAG_QUANTILE,
+    LOAD_SHED_REJECTIONS,
+)
+
+QUANTILES = (0.5, 0.9, 0.99)
+
+# Number of most recent samples that define the "current" lag used for
+# admission — short enough to recover quickly once the loop is healthy.
+_RECENT_SAMPLES = 5
+
+
+class Priority(str, Enum):
+    CRITICAL = "critical"
+    NORMAL = "normal"
+    LOW = "low"
+
+
+class LoopLagMonitor:
+    """Sample event loop lag in the background and keep a rolling window."""
+
+    def __init__(
+        self,
+        interval: float = settings.LOOP_LAG_SAMPLE_INTERVAL,
+        window: int = settings.LOOP_LAG_WINDOW,
+    ):
+        self.interval = interval
+        self.samples: deque[float] = deque(maxlen=window)
+        self._task: Optional[asyncio.Task[None]] = None
+        self._expected_wakeup: Optional[float] = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(
+                self._run(), name="loop-lag-monitor"
+            )
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._expected_wakeup = None
+
+    async def _run(self) -> None:
+        while True:
+            start = time.monotonic()
+            self._expected_wakeup = start + self.interval
+            await asyncio.sleep(self.interval)
+            self.record(max(0.0, time.monotonic() - start - self.interval))
+
+    def record(self, lag: float) -> None:
+        self.samples.append(lag)
+        EVENT_LOOP_LAG.observe(lag)
+        for q, value in self.percentiles().items():
+            EVENT_LOOP_LAG_QUANTILE.labels(quantile=str(q)).set(value)
+
+    def percentiles(self) -> dict[float, float]:
+        if not self.samples:
+            return {q: 0.0 for q in QUANTILES}
+        ordered = sorted(self.samples)
+        last = len(ordered) - 1
+        return {q: ordered[min(last, int(q * len(ordered)))] for q in QUANTILES}
+
+    def current_lag(self) -> float:
+        """Worst lag over the last few samples, including one still pending."""
+        recent = list(self.samples)[-_RECENT_SAMPLES:]
+        lag = max(recent, default=0.0)
+        if self._expected_wakeup is not None:
+            lag = max(lag, time.monotonic() - self._expected_wakeup)
+        return lag
+
+
+loop_monitor = LoopLagMonitor()
+
+
+def classify(path: str) -> Priority:
+    """Map a request path to its shedding priority."""
+    if path in settings.LOAD_SHED_CRITICAL_PATHS or path.startswith("/debug/"):
+        return Priority.CRITICAL
+    for prefix in settings.LOAD_SHED_LOW_PRIORITY_PREFIXES:
+        if path == prefix or path.startswith(prefix.rstrip("/") + "/"):
+            return Priority.LOW
+    return Priority.NORMAL
+
+
+def should_shed(priority: Priority, lag: float, threshold: float) -> bool:
+    """Shed low priority above the threshold and normal above twice it."""
+    if threshold <= 0 or priority == Priority.CRITICAL:
+        return False
+    if priority == Priority.LOW:
+        return lag >= threshold
+    return lag >= 2 * threshold
+
+
+class LoadSheddingMiddleware(BaseHTTPMiddleware):
+    """Reject work with 503 + Retry-After while the event loop is lagging."""
+
+    def __init__(self, app, monitor: LoopLagMonitor = loop_monitor):
+        super().__init__(app)
+        self.monitor = monitor
+
+    async def dispatch(
+        self, request: Request, call_next: RequestResponseEndpoint
+    ) -> Response:
+        priority = classify(request.url.path)
+        lag = self.monitor.current_lag()
+        if should_shed(priority, lag, settings.LOAD_SHED_LAG_THRESHOLD):
+            LOAD_SHED_REJECTIONS.labels(priority=priority.value).inc()
+            return JSONResponse(
+                status_code=503,
+                content={
+                    "error": {
+                        "code": "OVERLOADED",
+                        "message": "Gateway is overloaded. Retry later.",
+                    }
+                },
+                headers={"Retry-After": str(max(1, math.ceil(lag * 2)))},
+            )
+        return await call_next(request)
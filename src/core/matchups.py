@@ -0,0 +1,232 @@
+"""Precomputed matchup matrix: every team-vs-team prediction for a model.
+
+With 32 teams there are 992 ordered matchups per model version, so when
+``MODEL_MATRIX_PRECOMPUTE`` is on the gateway predicts them all in the
+background whenever the active model changes. The result is a
+``32 x 32 x len(FIELDS)`` float64 array indexed by ``NFLTeam`` ordinal (home,
+away), so serving a prediction is one dict lookup and an array read.
+
+A matrix is built completely before it replaces the previous one, and always
+for a single model version; lookups compare that version with the active
+one, so a stale matrix is never served. Matchups the model failed to
+predict are NaN and fall back to a live call.
+
+Rows come from ``MODEL_MATRIX_ROW_PATH`` when beat-books-model has a bulk
+endpoint (``?team1=<home>&team2=<away,away,...>`` answering an object keyed
+by away team), otherwise from one ``/predict`` call per matchup.
+"""
+
+import asyncio
+import io
+import logging
+import math
+import time
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Any, Optional
+
+import httpx
+
+from src.core.client import model_client
+from src.core.config import settings
+from src.core.metrics import MATCHUP_MATRIX_BUILDS
+from src.core.model_versions import ModelVersion, model_versions, prediction_version
+from src.core.teams import NFLTeam
+
+np: Any
+try:
+    import numpy as np
+except ModuleNotFoundError:
+    np = None
+    logging.getLogger(__name__).info("numpy not installed — no matchup matrix")
+
+logger = logging.getLogger(__name__)
+
+NPY = "application/x-npy"
+
+TEAMS: tuple[str, ...] = tuple(team.value for team in NFLTeam)
+TEAM_INDEX: dict[str, int] = {team: i for i, team in enumerate(TEAMS)}
+
+# Numeric prediction fields, in array order; BET is stored as 1.0.
+FIELDS = (
+    "home_win_probability",
+    "away_win_probability",
+    "predicted_spread",
+    "edge_vs_market",
+    "recommended_bet_size",
+    "bet",
+)
+
+
+@dataclass(frozen=True)
+class MatchupMatrix:
+    """Predictions for every matchup under one model version."""
+
+    version: ModelVersion
+    values: Any  # numpy array, TEAMS x TEAMS x FIELDS
+    built_at: float = field(default_factory=time.time)
+
+    def lookup(self, home: str, away: str) -> Optional[dict[str, Any]]:
+        """The prediction for ``home`` vs ``away``, or None if it is missing.
+
+        Names outside ``TEAMS`` (such as schedule abbreviations) are missing.
+        """
+        if home not in TEAM_INDEX or away not in TEAM_INDEX:
+            return None
+        row = self.values[TEAM_INDEX[home], TEAM_INDEX[away]]
+        if math.isnan(row[0]):
+            return None
+        return {
+            "home_team": home,
+            "away_team": away,
+            "home_win_probability": float(row[0]),
+            "away_win_probability": float(row[1]),
+            "predicted_spread": float(row[2]),
+            "model_version": self.version.model,
+            "feature_version": self.version.features,
+            "edge_vs_market": float(row[3]),
+            "recommended_bet_size": float(row[4]),
+            "bet_recommendation": "BET" if row[5] else "NO_BET",
+        }
+
+    @property
+    def coverage(self) -> int:
+        """Number of matchups with a prediction."""
+        return int((~np.isnan(self.values[:, :, 0])).sum())
+
+    def to_json(self) -> dict[str, Any]:
+        values = np.where(np.isnan(self.values), None, self.values)
+        return {
+            "model_version": self.version.model,
+            "feature_version": self.version.features,
+            "teams": TEAMS,
+            "fields": FIELDS,
+            "values": values.tolist(),
+        }
+
+    @cached_property
+    def npy(self) -> bytes:
+        """The array in NumPy ``.npy`` format (little-endian float64)."""
+        buffer = io.BytesIO()
+        np.save(buffer, self.values.astype("<f8"), allow_pickle=False)
+        return buffer.getvalue()
+
+
+def _row(data: Any, version: ModelVersion) -> Optional[list[float]]:
+    """Array row for one prediction payload, if it is for ``version``."""
+    if prediction_version(data) != version:
+        return None
+    try:
+        return [
+            *(float(data[name]) for name in FIELDS[:-1]),
+            1.0 if data["bet_recommendation"] == "BET" else 0.0,
+        ]
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class MatchupMatrixBuilder:
+    """Rebuild the matrix whenever the active model version changes."""
+
+    def __init__(self) -> None:
+        self.current: Optional[MatchupMatrix] = None
+        self._task: Optional[asyncio.Task[None]] = None
+
+    @property
+    def enabled(self) -> bool:
+        return settings.MODEL_MATRIX_PRECOMPUTE and np is not None
+
+    def lookup(
+        self, home: str, away: str, version: Optional[ModelVersion]
+    ) -> Optional[dict[str, Any]]:
+        matrix = self.current
+        if matrix is None or version is None or matrix.version != version:
+            return None
+        return matrix.lookup(home, away)
+
+    def on_version_change(self, version: ModelVersion) -> None:
+        """Start building for ``version``, abandoning any older build."""
+        if not self.enabled:
+            return
+        if self._task is not None:
+            self._task.cancel()
+        self._task = asyncio.get_running_loop().create_task(
+            self._build(version), name="matchup-matrix-build"
+        )
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _build(self, version: ModelVersion) -> None:
+        start = time.perf_counter()
+        try:
+            matrix = await self.build(version)
+        except asyncio.CancelledError:
+            MATCHUP_MATRIX_BUILDS.labels(outcome="cancelled").inc()
+            raise
+        except Exception:
+            logger.exception("Matchup matrix build for %s failed", version)
+            MATCHUP_MATRIX_BUILDS.labels(outcome="failed").inc()
+            return
+        self.current = matrix  # one reference swap; readers never see a partial
+        MATCHUP_MATRIX_BUILDS.labels(outcome="built").inc()
+        logger.info(
+            "Matchup matrix for %s built in %.1fs (%d matchups)",
+            version,
+            time.perf_counter() - start,
+            matrix.coverage,
+        )
+
+    async def build(self, version: ModelVersion) -> MatchupMatrix:
+        """Predict every matchup for ``version`` into a new matrix."""
+        values = np.full((len(TEAMS), len(TEAMS), len(FIELDS)), np.nan)
+        limit = asyncio.Semaphore(max(settings.MODEL_MATRIX_CONCURRENCY, 1))
+
+        async def fill(home: str) -> None:
+            async with limit:
+                rows = await self._predict_row(home)
+            for away, data in rows.items():
+                row = _row(data, version)
+                if row is not None and away in TEAM_INDEX and away != home:
+                    values[TEAM_INDEX[home], TEAM_INDEX[away]] = row
+
+        await asyncio.gather(*(fill(home) for home in TEAMS))
+        values.setflags(write=False)
+        return MatchupMatrix(version, values)
+
+    async def _predict_row(self, home: str) -> dict[str, Any]:
+        """Predictions for ``home`` against every other team, keyed by away team."""
+        opponents = [team for team in TEAMS if team != home]
+        if settings.MODEL_MATRIX_ROW_PATH:
+            try:
+                response = await model_client.get(
+                    settings.MODEL_MATRIX_ROW_PATH,
+                    params={"team1": home, "team2": ",".join(opponents)},
+                )
+                body = response.json()
+                if isinstance(body, dict):
+                    return {str(k).lower(): v for k, v in body.items()}
+            except (httpx.HTTPError, ValueError) as e:
+                logger.warning("Bulk predictions for %s failed: %s", home, e)
+            return {}
+
+        rows: dict[str, Any] = {}
+        for away in opponents:
+            try:
+                response = await model_client.get(
+                    "/predict", params={"team1": home, "team2": away}
+                )
+                rows[away] = response.json()
+            except (httpx.HTTPError, ValueError):
+                pass  # left NaN; served live
+        return rows
+
+
+matchup_matrix = MatchupMatrixBuilder()
+model_versions.listeners.append(matchup_matrix.on_version_change)
@@ -0,0 +1,304 @@
+"""Prometheus metrics helpers — route-template labels and multiprocess exposition."""
+
+import os
+import time
+from typing import Any, Callable
+
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.requests import Request
+from starlette.responses import Response
+
+from src.core.config import settings
+
+# Latency buckets tuned for a gateway: most responses are a single proxied hop
+# (5–250ms), with a long tail out to the 30s upstream client timeout.
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+# Time spent queueing for an upstream connection slot should be near zero;
+# anything past a few hundred milliseconds means the pool is undersized.
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+
+UNMATCHED_LABEL = "<unmatched>"
+OVERFLOW_LABEL = "<other>"
+
+# Upstream (gateway -> backend) metrics, shared by every backend client.
+UPSTREAM_REQUEST_DURATION = Histogram(
+    "upstream_request_duration_seconds",
+    "Duration of a single upstream attempt in seconds",
+    ["backend", "route", "method", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+UPSTREAM_RETRIES = Counter(
+    "upstream_retries_total",
+    "Upstream attempts that were retried",
+    ["backend", "route"],
+)
+UPSTREAM_BACKOFF_SECONDS = Counter(
+    "upstream_backoff_seconds_total",
+    "Total time spent sleeping between upstream retries",
+    ["backend"],
+)
+UPSTREAM_CIRCUIT_REJECTIONS = Counter(
+    "upstream_circuit_rejections_total",
+    "Upstream calls rejected because the circuit breaker was open",
+    ["backend"],
+)
+UPSTREAM_CIRCUIT_STATE = Gauge(
+    "upstream_circuit_state",
+    "Circuit breaker state (0=closed, 1=half_open, 2=open)",
+    ["backend"],
+    multiprocess_mode="livemax",
+)
+UPSTREAM_POOL_WAIT = Histogram(
+    "upstream_pool_wait_seconds",
+    "Time spent waiting for a free pooled upstream connection",
+    ["backend"],
+    buckets=POOL_WAIT_BUCKETS,
+)
+UPSTREAM_POOL_IN_USE = Gauge(
+    "upstream_pool_connections_in_use",
+    "Pooled upstream connections currently in use",
+    ["backend"],
+    multiprocess_mode="livesum",
+)
+UPSTREAM_POOL_LIMIT = Gauge(
+    "upstream_pool_connections_max",
+    "Upstream connection pool size (utilization = in_use / max)",
+    ["backend"],
+    multiprocess_mode="livesum",
+)
+UPSTREAM_BATCH_SIZE = Histogram(
+    "upstream_batch_keys",
+    "Distinct keys merged into one batched upstream lookup",
+    ["loader"],
+    buckets=(1, 2, 4, 8, 16, 32, 64),
+)
+
+# Event loop health and admission control.
+LOOP_LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "How late the event loop woke the lag sampler",
+    buckets=LOOP_LAG_BUCKETS,
+)
+EVENT_LOOP_LAG_QUANTILE = Gauge(
+    "event_loop_lag_quantile_seconds",
+    "Event loop lag percentiles over the recent sampling window",
+    ["quantile"],
+    multiprocess_mode="livemax",
+)
+LOAD_SHED_REJECTIONS = Counter(
+    "load_shed_rejections_total",
+    "Requests rejected by the admission controller",
+    ["priority"],
+)
+
+# Response compression cost and effectiveness, per route and encoding.
+COMPRESSION_BUCKETS = (
+    0.0001,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.5,
+)
+
+RESPONSE_COMPRESSION_SECONDS = Histogram(
+    "response_compression_seconds",
+    "CPU time spent compressing response bodies",
+    ["route", "encoding"],
+    buckets=COMPRESSION_BUCKETS,
+)
+RESPONSE_COMPRESSION_BYTES = Counter(
+    "response_compression_bytes_total",
+    "Response bytes before (in) and after (out) compression",
+    ["route", "encoding", "direction"],
+)
+RESPONSE_COMPRESSION_CACHE = Counter(
+    "response_compression_cache_total",
+    "Lookups of precompressed response variants",
+    ["result"],
+)
+
+# Gateway response cache.
+GATEWAY_CACHE = Counter(
+    "gateway_cache_total",
+    "Response cache lookups (hit/miss/coalesced) and invalidated entries",
+    ["result"],
+)
+
+# Prediction cache, keyed by matchup and active model version.
+PREDICTION_CACHE = Counter(
+    "prediction_cache_total",
+    "Prediction cache lookups (hit/miss) and clears on model changes",
+    ["result"],
+)
+
+LAST_KNOWN_GOOD = Counter(
+    "last_known_good_total",
+    "Degraded-mode lookups in the last-known-good store (served/miss/expired)",
+    ["result"],
+)
+
+MATCHUP_MATRIX_BUILDS = Counter(
+    "matchup_matrix_builds_total",
+    "Precomputed matchup matrix builds (built/failed/cancelled)",
+    ["outcome"],
+)
+
+PREWARM_RUNS = Counter(
+    "prewarm_runs_total",
+    "Background pre-warming of a week's schedule and predictions",
+    ["outcome"],
+)
+
+# Requests carrying an Idempotency-Key.
+IDEMPOTENT_REQUESTS = Counter(
+    "idempotent_requests_total",
+    "Keyed POST requests executed, replayed, attached to one in flight, or rejected",
+    ["outcome"],
+)
+
+# File uploads relayed to backends.
+UPLOAD_BYTES = Counter(
+    "upload_bytes_total",
+    "File bytes streamed through the gateway to a backend",
+)
+
+# Background jobs (scrapes), per registry.
+BACKGROUND_JOBS = Counter(
+    "background_jobs_total",
+    "Background job submissions (created/attached) and completions",
+    ["registry", "outcome"],
+)
+
+
+class LabelLimiter:
+    """Cap the number of distinct values a metric label may take.
+
+    Values seen before the cap is reached are passed through; anything new
+    after that collapses into a single overflow bucket so a misbehaving
+    caller cannot create unbounded time series.
+    """
+
+    def __init__(self, max_values: int, overflow: str = OVERFLOW_LABEL):
+        self.max_values = max_values
+        self.overflow = overflow
+        self._seen: set[str] = set()
+
+    def __call__(self, value: str) -> str:
+        if value in self._seen:
+            return value
+        if len(self._seen) >= self.max_values:
+            return self.overflow
+        self._seen.add(value)
+        return value
+
+
+def capped_handlers(
+    instrumentation: Callable[[Any], None],
+    max_handlers: int = settings.METRICS_MAX_HANDLER_LABELS,
+) -> Callable[[Any], None]:
+    """Cap the ``handler`` label of a prometheus-fastapi-instrumentator
+    instrumentation, as MetricsMiddleware does for the fallback metrics."""
+    handlers = LabelLimiter(max_handlers)
+
+    def instrument(info: Any) -> None:
+        info.modified_handler = handlers(info.modified_handler)
+        instrumentation(info)
+
+    return instrument
+
+
+def route_template(request: Request) -> str:
+    """Return the matched route template (e.g. ``/teams/{team}/stats``)."""
+    route = request.scope.get("route")
+    path = getattr(route, "path", None)
+    return path if path else UNMATCHED_LABEL
+
+
+def render_latest() -> bytes:
+    """Render the current metrics, aggregating across workers when needed.
+
+    When ``PROMETHEUS_MULTIPROC_DIR`` is set every worker writes its samples
+    to shared memory-mapped files in that directory; a fresh registry with a
+    ``MultiProcessCollector`` merges them so any worker can serve /metrics.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+
+class MetricsMiddleware(BaseHTTPMiddleware):
+    """Fallback request metrics, labelled by route template rather than raw path."""
+
+    def __init__(
+        self,
+        app,
+        registry: CollectorRegistry = REGISTRY,
+        max_handlers: int = settings.METRICS_MAX_HANDLER_LABELS,
+    ):
+        super().__init__(app)
+        self.request_count = Counter(
+            "http_requests_total",
+            "Total HTTP requests",
+            ["method", "handler", "status"],
+            registry=registry,
+        )
+        self.request_duration = Histogram(
+            "http_request_duration_seconds",
+            "HTTP request duration in seconds",
+            ["method", "handler"],
+            buckets=LATENCY_BUCKETS,
+            registry=registry,
+        )
+        self.handlers = LabelLimiter(max_handlers)
+
+    async def dispatch(
+        self, request: Request, call_next: RequestResponseEndpoint
+    ) -> Response:
+        if request.url.path == "/metrics":
+            return await call_next(request)
+        start = time.perf_counter()
+        response = await call_next(request)
+        duration = time.perf_counter() - start
+        handler = self.handlers(route_template(request))
+        self.request_count.labels(
+            method=request.method,
+            handler=handler,
+            status=response.status_code,
+        ).inc()
+        self.request_duration.labels(
+            method=request.method,
+            handler=handler,
+        ).observe(duration)
+        return response
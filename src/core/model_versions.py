@@ -0,0 +1,152 @@
+"""Active model tracking and the prediction cache it keys.
+
+A prediction for a matchup only changes when beat-books-model activates a
+new model or feature set, so predictions are cached under
+``(home, away, model_version, feature_version)``. ``ModelVersionWatcher``
+polls ``/models`` in the background (started from the app lifespan) and
+clears the cache when the active model changes. Until a poll has succeeded,
+or after one fails, no version is known and every request goes to the model.
+
+Entries also keep each encoded response body, so a hit is a dict lookup.
+The number of matchups is bounded by the league, so no eviction is needed
+beyond clearing on a version change.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+import httpx
+
+from src.core.client import model_client
+from src.core.config import settings
+from src.core.metrics import PREDICTION_CACHE
+
+logger = logging.getLogger(__name__)
+
+MODEL_VERSION_HEADER = "X-Model-Version"
+FEATURE_VERSION_HEADER = "X-Feature-Version"
+
+
+@dataclass(frozen=True)
+class ModelVersion:
+    """The model and feature set predictions are made with."""
+
+    model: str
+    features: str
+
+    def headers(self) -> dict[str, str]:
+        return {MODEL_VERSION_HEADER: self.model, FEATURE_VERSION_HEADER: self.features}
+
+
+def prediction_version(data: Any) -> Optional[ModelVersion]:
+    """Version stamped on a prediction payload, if it has one."""
+    if isinstance(data, dict):
+        model, features = data.get("model_version"), data.get("feature_version")
+        if isinstance(model, str) and isinstance(features, str):
+            return ModelVersion(model, features)
+    return None
+
+
+@dataclass
+class CachedPrediction:
+    """A prediction payload and its encoded bodies, by media type."""
+
+    data: dict[str, Any]
+    bodies: dict[str, bytes] = field(default_factory=dict)
+
+
+class PredictionCache:
+    """Predictions by matchup and the model version that made them."""
+
+    def __init__(self) -> None:
+        self._entries: dict[tuple[str, str, ModelVersion], CachedPrediction] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(
+        self, home: str, away: str, version: Optional[ModelVersion]
+    ) -> Optional[CachedPrediction]:
+        if version is None:
+            return None
+        entry = self._entries.get((home, away, version))
+        PREDICTION_CACHE.labels(result="hit" if entry else "miss").inc()
+        return entry
+
+    def set(self, home: str, away: str, data: dict[str, Any]) -> CachedPrediction:
+        """Store ``data`` under the version it was made with."""
+        entry = CachedPrediction(data)
+        version = prediction_version(data)
+        if version is not None:
+            self._entries[(home, away, version)] = entry
+        return entry
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class ModelVersionWatcher:
+    """Poll beat-books-model for its active version every ``interval`` seconds.
+
+    ``listeners`` are called with the new version whenever it changes.
+    """
+
+    def __init__(self, cache: PredictionCache, interval: float):
+        self.cache = cache
+        self.interval = interval
+        self.active: Optional[ModelVersion] = None
+        self._cached: Optional[ModelVersion] = None  # version the cache holds
+        self.listeners: list[Callable[[ModelVersion], None]] = []
+        self._task: Optional[asyncio.Task[None]] = None
+
+    def start(self) -> None:
+        if self.interval <= 0:
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(
+                self._run(), name="model-version-watcher"
+            )
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.active = None
+
+    async def _run(self) -> None:
+        while True:
+            await self.refresh()
+            await asyncio.sleep(self.interval)
+
+    async def refresh(self) -> Optional[ModelVersion]:
+        """Fetch the active version, clearing the cache if it changed."""
+        try:
+            response = await model_client.get("/models")
+            models = response.json().get("models", [])
+            active = next((m for m in models if m.get("is_active")), None)
+            version = prediction_version(active)
+        except (httpx.HTTPError, ValueError, AttributeError) as e:
+            logger.warning("Could not poll active model version: %s", e)
+            version = None
+        if version is not None and version != self._cached:
+            if self._cached is not None:
+                logger.info("Active model changed to %s; clearing cache", version)
+            self.cache.clear()
+            self._cached = version
+            PREDICTION_CACHE.labels(result="cleared").inc()
+            for listener in self.listeners:
+                listener(version)
+        self.active = version
+        return version
+
+
+prediction_cache = PredictionCache()
+model_versions = ModelVersionWatcher(
+    prediction_cache, settings.MODEL_VERSION_POLL_INTERVAL
+)
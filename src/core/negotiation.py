@@ -0,0 +1,115 @@
+"""Content negotiation for compact binary encodings (MessagePack / CBOR).
+
+JSON stays the default. When a client's ``Accept`` header prefers
+``application/msgpack`` or ``application/cbor`` the default response class
+encodes the same payload in that format instead — for proxied and cached
+responses alike. Proxy routes that return backend payloads untouched can
+additionally opt in to passthrough: the data client then asks the backend
+for the negotiated format and forwards its bytes without transcoding.
+"""
+
+import logging
+from contextvars import ContextVar
+from typing import Any, Callable, Optional
+
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.requests import Request
+from starlette.responses import Response
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+CBOR = "application/cbor"
+
+# Legacy / alternative spellings clients send for the same formats.
+_ALIASES = {
+    "application/x-msgpack": MSGPACK,
+    "application/vnd.msgpack": MSGPACK,
+}
+
+_encoders: dict[str, Callable[[Any, Callable[[Any], Any]], bytes]] = {}
+
+try:
+    import msgpack
+
+    _encoders[MSGPACK] = lambda content, default: msgpack.packb(
+        content, default=default
+    )
+except ModuleNotFoundError:
+    logging.getLogger(__name__).info("msgpack not installed — MessagePack disabled")
+
+try:
+    import cbor2
+
+    _encoders[CBOR] = lambda content, default: cbor2.dumps(
+        content, default=lambda encoder, obj: encoder.encode(default(obj))
+    )
+except ModuleNotFoundError:
+    logging.getLogger(__name__).info("cbor2 not installed — CBOR disabled")
+
+# Negotiated media type for the current request.
+response_format_var: ContextVar[str] = ContextVar("response_format", default=JSON)
+
+# Set by proxy routes whose response is the backend payload unchanged.
+passthrough_var: ContextVar[bool] = ContextVar("passthrough", default=False)
+
+
+def supported_media_types() -> list[str]:
+    return [JSON, *_encoders]
+
+
+def negotiate(accept: Optional[str]) -> str:
+    """Pick the response media type from an ``Accept`` header."""
+    if not accept:
+        return JSON
+    best, best_q = JSON, 0.0
+    for position, part in enumerate(accept.split(",")):
+        media, *params = [p.strip() for p in part.split(";")]
+        media = _ALIASES.get(media.lower(), media.lower())
+        q = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        if media in ("*/*", "application/*"):
+            media = JSON
+        if media not in supported_media_types() or q <= 0:
+            continue
+        # Earlier entries win ties, as listed order expresses preference.
+        if q > best_q:
+            best, best_q = media, q
+    return best
+
+
+def encode(content: Any, media_type: str, default: Callable[[Any], Any]) -> bytes:
+    """Encode ``content`` as ``media_type`` (a non-JSON negotiated format)."""
+    return _encoders[media_type](content, default)
+
+
+def passthrough_media_type() -> Optional[str]:
+    """Binary format the backend may return verbatim for this request, if any."""
+    media_type = response_format_var.get()
+    if passthrough_var.get() and media_type != JSON:
+        return media_type
+    return None
+
+
+async def allow_passthrough() -> None:
+    """Route dependency: the route returns the backend payload unchanged."""
+    passthrough_var.set(True)
+
+
+class ContentNegotiationMiddleware(BaseHTTPMiddleware):
+    """Record the negotiated response format for the current request."""
+
+    async def dispatch(
+        self, request: Request, call_next: RequestResponseEndpoint
+    ) -> Response:
+        token = response_format_var.set(negotiate(request.headers.get("accept")))
+        try:
+            response = await call_next(request)
+        finally:
+            response_format_var.reset(token)
+        response.headers.append("Vary", "Accept")
+        return response
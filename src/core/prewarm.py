@@ -0,0 +1,107 @@
+"""Background pre-warming of the current and next NFL week.
+
+Every ``PREWARM_INTERVAL`` seconds, and right after the active model changes,
+the scheduler (started from the app lifespan) runs each registered warmer for
+the current week and the one after it. The predictions router registers one
+that fetches the week's schedule and predicts every game, which leaves the
+schedule in the response cache and the predictions in the prediction cache,
+so the first user of ``/predictions/week`` after an update is served warm.
+"""
+
+import asyncio
+import logging
+from datetime import date, timedelta
+from typing import Awaitable, Callable, Optional
+
+from src.core.config import settings
+from src.core.metrics import PREWARM_RUNS
+from src.core.model_versions import ModelVersion, model_versions
+
+logger = logging.getLogger(__name__)
+
+REGULAR_SEASON_WEEKS = 18
+
+Warmer = Callable[[int, int], Awaitable[object]]
+
+
+def season_kickoff(season: int) -> date:
+    """Opening Thursday of ``season``: the Thursday after Labor Day."""
+    first = date(season, 9, 1)
+    labor_day = first + timedelta(days=-first.weekday() % 7)
+    return labor_day + timedelta(days=3)
+
+
+def nfl_week(day: date) -> tuple[int, int]:
+    """Season and regular-season week that ``day`` falls in.
+
+    Weeks run Thursday to Wednesday. Days before kickoff count as week 1 of
+    the coming season; postseason days count as the last week.
+    """
+    season = day.year if day.month >= 3 else day.year - 1
+    week = (day - season_kickoff(season)).days // 7 + 1
+    return season, min(max(week, 1), REGULAR_SEASON_WEEKS)
+
+
+def upcoming_weeks(day: date) -> list[tuple[int, int]]:
+    """The current week and, during the regular season, the next one."""
+    season, week = nfl_week(day)
+    if week < REGULAR_SEASON_WEEKS:
+        return [(season, week), (season, week + 1)]
+    return [(season, week)]
+
+
+class Prewarmer:
+    """Run ``warmers`` for the upcoming weeks every ``interval`` seconds."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.warmers: list[Warmer] = []
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task[None]] = None
+
+    def start(self) -> None:
+        if self.interval <= 0 or not self.warmers:
+            return
+        if self._task is None or self._task.done():
+            self._wake = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(
+                self._run(), name="prewarmer"
+            )
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def trigger(self, _version: Optional[ModelVersion] = None) -> None:
+        """Warm again now instead of waiting for the next interval."""
+        self._wake.set()
+
+    async def _run(self) -> None:
+        while True:
+            self._wake.clear()
+            await self.warm(date.today())
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def warm(self, day: date) -> None:
+        """Run every warmer for the weeks around ``day``; failures are logged."""
+        for season, week in upcoming_weeks(day):
+            for warmer in self.warmers:
+                try:
+                    await warmer(season, week)
+                except Exception:
+                    logger.exception("Pre-warming %s week %s failed", season, week)
+                    PREWARM_RUNS.labels(outcome="failed").inc()
+                else:
+                    PREWARM_RUNS.labels(outcome="succeeded").inc()
+
+
+prewarmer = Prewarmer(settings.PREWARM_INTERVAL)
+model_versions.listeners.append(prewarmer.trigger)
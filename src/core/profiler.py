@@ -0,0 +1,153 @@
+"""On-demand statistical profiler for the event loop thread.
+
+A background thread periodically snapshots the event loop thread's stack via
+``sys._current_frames()``. No tracing hooks are installed, so overhead is a
+few microseconds per sample and the loop keeps serving traffic while a
+profile is being taken.
+"""
+
+import asyncio
+import html
+import sys
+import threading
+import time
+import zlib
+from collections import Counter
+from types import FrameType
+from typing import Any, Optional
+
+MAX_STACK_DEPTH = 128
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    parts = code.co_filename.replace("\\", "/").rsplit("/", 2)
+    filename = "/".join(parts[-2:])
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+def _collapse_frame(frame: Optional[FrameType]) -> str:
+    labels: list[str] = []
+    while frame is not None and len(labels) < MAX_STACK_DEPTH:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class ProfilerBusyError(RuntimeError):
+    """Raised when a profile is requested while another is in progress."""
+
+
+class SamplingProfiler:
+    """Sample one thread's stack at a fixed interval."""
+
+    # Only one profile may run at a time per process.
+    _lock = threading.Lock()
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: Counter[str] = Counter()
+
+    def run(self, seconds: float) -> Counter[str]:
+        """Sample for ``seconds`` (blocking — call from a worker thread).
+
+        Raises:
+            ProfilerBusyError: if another profile is already running
+        """
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusyError("A profile is already running")
+        try:
+            deadline = time.monotonic() + seconds
+            while time.monotonic() < deadline:
+                frame = sys._current_frames().get(self.thread_id)
+                if frame is not None:
+                    self.samples[_collapse_frame(frame)] += 1
+                time.sleep(self.interval)
+        finally:
+            self._lock.release()
+        return self.samples
+
+
+def collapsed(samples: Counter[str]) -> str:
+    """Render samples in Brendan Gregg's collapsed-stack format."""
+    return "".join(f"{stack} {count}\n" for stack, count in samples.most_common())
+
+
+def _build_tree(samples: Counter[str]) -> dict[str, Any]:
+    root: dict[str, Any] = {"name": "all", "value": 0, "children": {}}
+    for stack, count in samples.items():
+        root["value"] += count
+        node = root
+        for name in stack.split(";"):
+            child = node["children"].setdefault(
+                name, {"name": name, "value": 0, "children": {}}
+            )
+            child["value"] += count
+            node = child
+    return root
+
+
+def flamegraph_svg(
+    samples: Counter[str], width: int = 1200, frame_height: int = 16
+) -> str:
+    """Render samples as a self-contained flamegraph SVG."""
+    root = _build_tree(samples)
+    total = root["value"] or 1
+    max_depth = max((stack.count(";") + 1 for stack in samples), default=0)
+    height = (max_depth + 1) * frame_height
+    parts: list[str] = []
+
+    def layout(node: dict[str, Any], x: float, depth: int) -> None:
+        w = node["value"] / total * width
+        if w < 0.5:
+            return
+        # Flamegraphs grow upwards: the root sits at the bottom.
+        y = height - (depth + 1) * frame_height
+        hue = zlib.crc32(node["name"].encode()) % 40
+        pct = node["value"] / total * 100
+        parts.append(
+            f"<g><title>{html.escape(node['name'])} "
+            f"({node['value']} samples, {pct:.1f}%)</title>"
+            f'<rect x="{x:.1f}" y="{y}" width="{w:.1f}" '
+            f'height="{frame_height - 1}" fill="hsl({hue},80%,60%)"/>'
+        )
+        chars = int(w / 7)
+        if chars > 3:
+            text = node["name"]
+            if len(text) > chars:
+                text = text[: chars - 2] + ".."
+            parts.append(
+                f'<text x="{x + 3:.1f}" y="{y + frame_height - 4}" '
+                f'font-size="11">{html.escape(text)}</text>'
+            )
+        parts.append("</g>")
+        child_x = x
+        for child in sorted(node["children"].values(), key=lambda c: c["name"]):
+            layout(child, child_x, depth + 1)
+            child_x += child["value"] / total * width
+
+    layout(root, 0.0, 0)
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" '
+        f'height="{height}" font-family="monospace">{"".join(parts)}</svg>'
+    )
+
+
+def dump_tasks() -> list[dict[str, Any]]:
+    """Describe every asyncio task on the running loop with its current stack."""
+    tasks = []
+    for task in asyncio.all_tasks():
+        coro = task.get_coro()
+        tasks.append(
+            {
+                "name": task.get_name(),
+                "coroutine": getattr(coro, "__qualname__", repr(coro)),
+                "done": task.done(),
+                "stack": [
+                    f"{frame.f_code.co_filename}:{frame.f_lineno} in {frame.f_code.co_name}"
+                    for frame in task.get_stack(limit=MAX_STACK_DEPTH)
+                ],
+            }
+        )
+    return tasks
@@ -0,0 +1,277 @@
+"""Field projection (``?fields=``) for proxied stats and odds routes.
+
+Fields are comma-separated, with dotted paths for nested values
+(``name,team.abbr,stats.passing.yards``). They select from each record under
+the response's record key, ``data`` unless the route says otherwise (a list
+of records or a single record); other envelope keys such as ``pagination``
+are kept as they are.
+
+When beat-books-data applies ``fields`` itself (``UPSTREAM_SUPPORTS_FIELDS``)
+the parameter is forwarded. Otherwise the backend body is streamed through
+``JSONProjector``, which holds one record at a time, so large payloads are
+never fully materialized in the gateway.
+"""
+
+import json
+import re
+from typing import Any, AsyncIterator, Optional
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from starlette.responses import Response
+
+from src.core.client import data_client
+from src.core.config import settings
+from src.core.negotiation import JSON, passthrough_var, response_format_var
+from src.core.responses import FastJSONResponse, dumps
+
+FIELDS_DESCRIPTION = (
+    "Comma-separated fields to return for each record; "
+    "dotted paths select nested values (e.g. name,stats.passing.yards)"
+)
+
+# Envelope key whose records are projected, unless a route names another.
+DATA_KEY = "data"
+
+FieldTree = dict[str, Any]
+
+_STRUCTURAL = re.compile(rb'["\[\]{}]')
+_STRING = re.compile(rb'"(?:[^"\\]|\\.)*"', re.S)
+_SCALAR_END = re.compile(rb"[\s,\]}]")
+_KEY = re.compile(rb'("(?:[^"\\]|\\.)*")\s*:\s*', re.S)
+_SEPARATORS = re.compile(rb"[\s,]*")
+_WHITESPACE = re.compile(rb"\s*")
+
+
+def parse_fields(fields: str) -> FieldTree:
+    """Parse a ``fields`` parameter into a nested selection tree.
+
+    Raises:
+        HTTPException: 400 if a field path is empty or malformed
+    """
+    tree: FieldTree = {}
+    for path in fields.split(","):
+        parts = path.strip().split(".")
+        if not all(part.strip() for part in parts):
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid fields: '{fields}'. Use comma-separated names or dotted paths.",
+            )
+        node = tree
+        for part in parts:
+            node = node.setdefault(part.strip(), {})
+    return tree
+
+
+def project(value: Any, tree: FieldTree) -> Any:
+    """Keep only the parts of ``value`` selected by ``tree``."""
+    if not tree:
+        return value
+    if isinstance(value, list):
+        return [project(item, tree) for item in value]
+    if not isinstance(value, dict):
+        return value
+    return {key: project(value[key], sub) for key, sub in tree.items() if key in value}
+
+
+def project_envelope(payload: Any, tree: FieldTree, data_key: str = DATA_KEY) -> Any:
+    """Apply ``tree`` to the records of an already-parsed response."""
+    if isinstance(payload, dict) and data_key in payload:
+        return {**payload, data_key: project(payload[data_key], tree)}
+    return project(payload, tree)
+
+
+class JSONProjector:
+    """Incrementally project a JSON response body fed in arbitrary chunks.
+
+    Top-level members are copied through verbatim. Each element of the
+    ``data_key`` array is scanned to its end, parsed on its own, projected
+    and re-encoded, so memory is bounded by the largest single record.
+    """
+
+    def __init__(self, tree: FieldTree, data_key: str = DATA_KEY):
+        self.tree = tree
+        self.data_key = data_key
+        self._buf = bytearray()
+        self._state = "start"
+        self._top_array = False
+        self._first_member = True
+        self._first_item = True
+        self._scan_pos = 0
+        self._depth = 0
+
+    def feed(self, chunk: bytes) -> bytes:
+        self._buf += chunk
+        out: list[bytes] = []
+        while self._step(out):
+            pass
+        return b"".join(out)
+
+    def close(self) -> bytes:
+        tail = self.feed(b"")
+        if self._state != "end":
+            raise ValueError("Truncated JSON response from upstream")
+        return tail
+
+    def _consume(self, n: int) -> None:
+        del self._buf[:n]
+
+    def _scan_value(self) -> Optional[int]:
+        """End offset of the complete JSON value at the buffer start, if any."""
+        buf = self._buf
+        if self._scan_pos == 0:
+            first = buf[:1]
+            if first == b'"':
+                match = _STRING.match(buf)
+                return match.end() if match else None
+            if first not in (b"{", b"["):
+                scalar_end = _SCALAR_END.search(buf)
+                return scalar_end.start() if scalar_end else None
+            self._depth = 0
+        pos = self._scan_pos
+        while True:
+            match = _STRUCTURAL.search(buf, pos)
+            if match is None:
+                self._scan_pos = len(buf)
+                return None
+            pos = match.start()
+            char = buf[pos]
+            if char == ord('"'):
+                string = _STRING.match(buf, pos)
+                if string is None:
+                    self._scan_pos = pos
+                    return None
+                pos = string.end()
+                continue
+            pos += 1
+            if char in (ord("{"), ord("[")):
+                self._depth += 1
+            else:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._scan_pos = 0
+                    return pos
+
+    def _project_value(self, end: int) -> bytes:
+        return dumps(project(json.loads(bytes(self._buf[:end])), self.tree))
+
+    def _step(self, out: list[bytes]) -> bool:
+        """Advance the parser one token; False when more input is needed."""
+        buf = self._buf
+        if self._state in ("start", "members", "items", "end"):
+            skip = _SEPARATORS if self._state in ("members", "items") else _WHITESPACE
+            match = skip.match(buf)
+            if match:
+                self._consume(match.end())
+        if not buf:
+            return False
+
+        if self._state == "start":
+            if buf[:1] == b"{":
+                self._state = "members"
+            elif buf[:1] == b"[":
+                self._state, self._top_array = "items", True
+            else:
+                raise ValueError("Upstream response is not a JSON object or array")
+            out.append(bytes(buf[:1]))
+            self._consume(1)
+            return True
+
+        if self._state == "members":
+            if buf[:1] == b"}":
+                out.append(b"}")
+                self._consume(1)
+                self._state = "end"
+                return True
+            key = _KEY.match(buf)
+            if key is None:
+                return False
+            if len(buf) == key.end():
+                return False  # need the first byte of the value
+            out.append((b"" if self._first_member else b",") + key.group(1) + b":")
+            self._first_member = False
+            is_data = json.loads(key.group(1)) == self.data_key
+            self._consume(key.end())
+            if is_data and buf[:1] == b"[":
+                out.append(b"[")
+                self._consume(1)
+                self._state, self._first_item = "items", True
+            else:
+                self._state = "project" if is_data else "raw"
+            return True
+
+        if self._state == "items":
+            if buf[:1] == b"]":
+                out.append(b"]")
+                self._consume(1)
+                self._state = "end" if self._top_array else "members"
+                return True
+            end = self._scan_value()
+            if end is None:
+                return False
+            out.append((b"" if self._first_item else b",") + self._project_value(end))
+            self._first_item = False
+            self._consume(end)
+            return True
+
+        if self._state in ("raw", "project"):
+            end = self._scan_value()
+            if end is None:
+                return False
+            if self._state == "raw":
+                out.append(bytes(buf[:end]))
+            else:
+                out.append(self._project_value(end))
+            self._consume(end)
+            self._state = "members"
+            return True
+
+        # "end": ignore trailing whitespace, reject anything else.
+        raise ValueError("Unexpected data after JSON response from upstream")
+
+
+async def _projected_body(
+    chunks: AsyncIterator[bytes], projector: JSONProjector
+) -> AsyncIterator[bytes]:
+    async for chunk in chunks:
+        out = projector.feed(chunk)
+        if out:
+            yield out
+    yield projector.close()
+
+
+async def projected_get(
+    endpoint: str,
+    params: Optional[dict[str, Any]],
+    fields: str,
+    data_key: str = DATA_KEY,
+) -> Response:
+    """Proxy a GET to beat-books-data, returning only the requested fields.
+
+    ``data_key`` names the envelope key holding the records to project.
+    """
+    tree = parse_fields(fields)
+    # Projection transforms the body, so backend bytes cannot be relayed.
+    passthrough_var.set(False)
+    if settings.UPSTREAM_SUPPORTS_FIELDS:
+        result = await data_client.get(
+            endpoint, params={**(params or {}), "fields": fields}
+        )
+        return FastJSONResponse(result)
+    if response_format_var.get() != JSON:
+        # Binary encodings are produced from the parsed payload anyway.
+        result = await data_client.get(endpoint, params=params)
+        return FastJSONResponse(project_envelope(result, tree, data_key))
+
+    upstream = await data_client.stream(endpoint, params=params)
+
+    async def body() -> AsyncIterator[bytes]:
+        try:
+            async for chunk in _projected_body(
+                upstream.aiter_bytes(), JSONProjector(tree, data_key)
+            ):
+                yield chunk
+        finally:
+            await upstream.aclose()
+
+    return StreamingResponse(body(), media_type=JSON)
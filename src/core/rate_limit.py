@@ -1,10 +1,22 @@
 """Rate limiting configuration."""
 
+from typing import Any
+
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 from src.core.config import settings
+from src.core.tracing import span
+
+
+class TracedLimiter(Limiter):
+    """Limiter that records each limit check as a ``ratelimit`` span."""
+
+    def _check_request_limit(self, *args: Any, **kwargs: Any) -> None:
+        with span("ratelimit"):
+            super()._check_request_limit(*args, **kwargs)
+
 
-limiter = Limiter(
+limiter = TracedLimiter(
     key_func=get_remote_address,
     default_limits=[settings.RATE_LIMIT_DEFAULT],
 )
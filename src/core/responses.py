@@ -0,0 +1,169 @@
+"""Response classes and trusted-upstream response helpers shared across routers.
+
+Routes that proxy a backend normally pay for validation twice: once when they
+build a model from ``response.json()`` and again when FastAPI checks the
+return value against ``response_model`` and runs ``jsonable_encoder``. The
+helpers here validate once with a cached ``TypeAdapter`` (or, for trusted
+upstreams, only a sample of responses) and hand the result straight to
+``FastJSONResponse``, which FastAPI returns without further processing.
+"""
+
+import json
+import logging
+import random
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, Callable, Optional, TypeVar
+
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from starlette.responses import Response, StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from src.core.config import settings
+from src.core.negotiation import JSON, encode, passthrough_var, response_format_var
+from src.core.tracing import span
+
+_orjson: Any
+try:
+    import orjson as _orjson
+except ModuleNotFoundError:
+    _orjson = None
+    logging.getLogger(__name__).info("orjson not installed — using stdlib json")
+
+M = TypeVar("M", bound=BaseModel)
+
+# Per-request validation decision made by ``sampled_passthrough``.
+_validate_var: ContextVar[Optional[bool]] = ContextVar(
+    "validate_upstream", default=None
+)
+
+
+def _default(obj: Any) -> Any:
+    """Encode objects the JSON library does not handle natively."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize ``content`` (including Pydantic models) to JSON bytes."""
+    if _orjson is not None:
+        return _orjson.dumps(content, default=_default)
+    return json.dumps(
+        content,
+        default=_default,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response encoded with orjson when available.
+
+    Accepts Pydantic models anywhere in ``content`` and records encoding
+    time as a ``serialize`` span. When the client negotiated MessagePack or
+    CBOR the same content is encoded in that format instead.
+    """
+
+    def render(self, content: Any) -> bytes:
+        with span("serialize"):
+            media_type = response_format_var.get()
+            if media_type != JSON:
+                self.media_type = media_type
+                return encode(content, media_type, _default)
+            return dumps(content)
+
+
+class RequestStreamingResponse(StreamingResponse):
+    """Streaming response whose body is produced while the request is read.
+
+    ``StreamingResponse`` listens for a client disconnect on ``receive()``
+    alongside the body on ASGI servers older than spec 2.4, which races a
+    body iterator still reading ``request.stream()`` and can hang both. This
+    one only sends; a disconnect surfaces as ``ClientDisconnect`` from the
+    request stream or as a failed send instead.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+def sse_event(event: str, data: Any) -> bytes:
+    """Encode one Server-Sent Events message with a JSON ``data`` field."""
+    return b"event: " + event.encode() + b"\ndata: " + dumps(data) + b"\n\n"
+
+
+@lru_cache(maxsize=None)
+def adapter_for(tp: Any) -> TypeAdapter:
+    """Return a compiled ``TypeAdapter`` for ``tp``, built once per type."""
+    return TypeAdapter(tp)
+
+
+def _should_validate(sample_rate: Optional[float]) -> bool:
+    decided = _validate_var.get()
+    if sample_rate is None and decided is not None:
+        return decided
+    rate = (
+        settings.UPSTREAM_VALIDATION_SAMPLE_RATE if sample_rate is None else sample_rate
+    )
+    return rate >= 1.0 or random.random() < rate  # nosec B311
+
+
+async def sampled_passthrough() -> None:
+    """Route dependency: relay backend bytes unless sampled for validation.
+
+    Validated routes can only skip parsing the backend body when this
+    request would not have been validated anyway.
+    """
+    validate = _should_validate(None)
+    _validate_var.set(validate)
+    passthrough_var.set(not validate)
+
+
+def trusted_model(model: type[M], data: Any, sample_rate: Optional[float] = None) -> M:
+    """Build ``model`` from upstream data, validating only sampled calls.
+
+    Raises:
+        ValidationError: if a sampled payload does not match ``model``
+    """
+    if _should_validate(sample_rate):
+        return adapter_for(model).validate_python(data)
+    return model.model_construct(**data)
+
+
+def trusted_response(
+    data: Any,
+    model: Any,
+    sample_rate: Optional[float] = None,
+    response_class: Callable[..., Response] = FastJSONResponse,
+) -> Response:
+    """Validate upstream data against ``model`` once and encode it directly.
+
+    Unsampled payloads, and responses the backend already encoded in the
+    negotiated format, are passed through as-is.
+
+    Raises:
+        HTTPException: 502 if a sampled payload does not match ``model``
+    """
+    if isinstance(data, Response):
+        return data
+    if not _should_validate(sample_rate):
+        return response_class(content=data)
+    try:
+        validated = adapter_for(model).validate_python(data)
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=502,
+            detail={
+                "error": {
+                    "code": "BAD_UPSTREAM_RESPONSE",
+                    "message": f"Upstream response failed validation: {e.error_count()} error(s)",
+                }
+            },
+        )
+    return response_class(content=validated)
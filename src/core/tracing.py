@@ -1,33 +1,253 @@
-"""Request tracing middleware — generates and forwards X-Request-ID."""
+"""Request tracing — request IDs, W3C trace context and lightweight spans.
 
+Every request gets an ``X-Request-ID`` and a W3C ``traceparent``. Work inside
+the gateway (auth, rate limiting, each upstream attempt, serialization) is
+recorded as spans, summarised in a ``Server-Timing`` response header and,
+for sampled traces, appended to a local file in OTLP-JSON format.
+"""
+
+import asyncio
+import json
+import random
+import re
+import secrets
+import threading
+import time
 import uuid
+from contextlib import contextmanager
 from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Iterator, Optional
 
 from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
 from starlette.requests import Request
 from starlette.responses import Response
 
+from src.core.config import settings
+
 REQUEST_ID_HEADER = "X-Request-ID"
+TRACEPARENT_HEADER = "traceparent"
+SERVER_TIMING_HEADER = "Server-Timing"
+
+_TRACEPARENT_RE = re.compile(
+    r"^00-(?P<trace_id>[0-9a-f]{32})-(?P<parent_id>[0-9a-f]{16})-(?P<flags>[0-9a-f]{2})$"
+)
 
 # Context variable for accessing request ID anywhere in the call stack
 request_id_var: ContextVar[str] = ContextVar("request_id", default="")
 
 
+@dataclass
+class Span:
+    """A single timed operation within a trace."""
+
+    name: str
+    span_id: str
+    parent_span_id: str
+    start_ns: int
+    end_ns: int = 0
+    kind: int = 1  # OTLP SPAN_KIND_INTERNAL
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1_000_000
+
+
+@dataclass
+class Trace:
+    """Spans collected for one inbound request."""
+
+    trace_id: str
+    sampled: bool
+    spans: list[Span] = field(default_factory=list)
+
+
+trace_var: ContextVar[Optional[Trace]] = ContextVar("trace", default=None)
+current_span_var: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def _new_span_id() -> str:
+    return secrets.token_hex(8)
+
+
+@contextmanager
+def span(name: str, kind: int = 1, **attributes: Any) -> Iterator[Optional[Span]]:
+    """Record a span under the current request's trace (no-op outside one)."""
+    trace = trace_var.get()
+    if trace is None:
+        yield None
+        return
+    parent = current_span_var.get()
+    record = Span(
+        name=name,
+        span_id=_new_span_id(),
+        parent_span_id=parent.span_id if parent else "",
+        start_ns=time.time_ns(),
+        kind=kind,
+        attributes=attributes,
+    )
+    token = current_span_var.set(record)
+    try:
+        yield record
+    finally:
+        record.end_ns = time.time_ns()
+        current_span_var.reset(token)
+        trace.spans.append(record)
+
+
+def outbound_headers() -> dict[str, str]:
+    """Headers that carry the request ID and trace context to a backend."""
+    headers: dict[str, str] = {}
+    request_id = request_id_var.get()
+    if request_id:
+        headers[REQUEST_ID_HEADER] = request_id
+    trace = trace_var.get()
+    parent = current_span_var.get()
+    if trace is not None and parent is not None:
+        flags = "01" if trace.sampled else "00"
+        headers[TRACEPARENT_HEADER] = f"00-{trace.trace_id}-{parent.span_id}-{flags}"
+    return headers
+
+
+def server_timing(spans: list[Span]) -> str:
+    """Format spans as a ``Server-Timing`` header value."""
+    entries = []
+    for record in spans:
+        entry = f"{record.name};dur={record.duration_ms:.2f}"
+        desc = record.attributes.get("backend")
+        if desc:
+            entry += f';desc="{desc}"'
+        entries.append(entry)
+    return ", ".join(entries)
+
+
+def _otlp_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp_json(trace: Trace) -> dict[str, Any]:
+    """Encode a trace as an OTLP/JSON ``ExportTraceServiceRequest``."""
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": [
+                        {
+                            "key": "service.name",
+                            "value": {"stringValue": "beat-books-api"},
+                        }
+                    ]
+                },
+                "scopeSpans": [
+                    {
+                        "scope": {"name": "src.core.tracing"},
+                        "spans": [
+                            {
+                                "traceId": trace.trace_id,
+                                "spanId": s.span_id,
+                                "parentSpanId": s.parent_span_id,
+                                "name": s.name,
+                                "kind": s.kind,
+                                "startTimeUnixNano": str(s.start_ns),
+                                "endTimeUnixNano": str(s.end_ns),
+                                "attributes": [
+                                    {"key": k, "value": _otlp_value(v)}
+                                    for k, v in s.attributes.items()
+                                ],
+                            }
+                            for s in trace.spans
+                        ],
+                    }
+                ],
+            }
+        ]
+    }
+
+
+class FileSpanExporter:
+    """Append sampled traces to a file, one OTLP/JSON request per line.
+
+    This is the layout the OpenTelemetry Collector's ``file`` exporter writes
+    and its ``otlpjsonfile`` receiver reads, so traces can be replayed into
+    any OTLP backend later.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, trace: Trace) -> None:
+        line = json.dumps(to_otlp_json(trace), separators=(",", ":"))
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+
+_exporter: Optional[FileSpanExporter] = (
+    FileSpanExporter(settings.TRACE_EXPORT_PATH) if settings.TRACE_EXPORT_PATH else None
+)
+
+
+def _start_trace(request: Request) -> tuple[Trace, str]:
+    """Continue the caller's trace if it sent a valid traceparent."""
+    match = _TRACEPARENT_RE.match(request.headers.get(TRACEPARENT_HEADER, ""))
+    if match and match["trace_id"] != "0" * 32:
+        sampled = bool(int(match["flags"], 16) & 0x01)
+        return Trace(trace_id=match["trace_id"], sampled=sampled), match["parent_id"]
+    sampled = random.random() < settings.TRACE_SAMPLE_RATE  # nosec B311
+    return Trace(trace_id=secrets.token_hex(16), sampled=sampled), ""
+
+
 class RequestTracingMiddleware(BaseHTTPMiddleware):
-    """Middleware that assigns a unique request ID to every request."""
+    """Middleware that assigns a request ID and trace to every request."""
 
     async def dispatch(
         self, request: Request, call_next: RequestResponseEndpoint
     ) -> Response:
         # Use client-provided ID or generate a new one
         request_id = request.headers.get(REQUEST_ID_HEADER) or str(uuid.uuid4())
+        trace, remote_parent = _start_trace(request)
+        root = Span(
+            name="total",
+            span_id=_new_span_id(),
+            parent_span_id=remote_parent,
+            start_ns=time.time_ns(),
+            kind=2,  # OTLP SPAN_KIND_SERVER
+            attributes={
+                "http.method": request.method,
+                "http.target": request.url.path,
+                "request_id": request_id,
+            },
+        )
 
-        # Store in context var for downstream access
+        # Store in context vars for downstream access
         token = request_id_var.set(request_id)
+        trace_token = trace_var.set(trace)
+        span_token = current_span_var.set(root)
 
         try:
             response = await call_next(request)
+            root.end_ns = time.time_ns()
+            root.attributes["http.status_code"] = response.status_code
             response.headers[REQUEST_ID_HEADER] = request_id
+            if settings.SERVER_TIMING_ENABLED:
+                response.headers[SERVER_TIMING_HEADER] = server_timing(
+                    trace.spans + [root]
+                )
+            if trace.sampled and _exporter is not None:
+                trace.spans.append(root)
+                asyncio.get_running_loop().run_in_executor(
+                    None, _exporter.export, trace
+                )
             return response
         finally:
+            current_span_var.reset(span_token)
+            trace_var.reset(trace_token)
             request_id_var.reset(token)
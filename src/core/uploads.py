@@ -0,0 +1,210 @@
+"""Streaming multipart/form-data uploads, relayed to a backend chunk by chunk.
+
+``MultipartReader`` finds the first file part of an incoming request body and
+yields its content as it arrives, holding back only enough bytes to spot the
+closing boundary. ``checked_upload`` enforces a size limit and an optional
+SHA-256 on the way through, and ``multipart_body`` wraps the chunks in a new
+multipart body for the backend. Memory use stays at a few chunks whatever the
+file size.
+
+A limit or checksum failure is raised before the outgoing body's closing
+boundary is sent, so the backend sees a truncated upload and never a
+complete, wrong file.
+"""
+
+import hashlib
+import logging
+import uuid
+from dataclasses import dataclass
+from email.message import Message
+from email.parser import HeaderParser
+from typing import AsyncIterator, Optional
+
+from fastapi import HTTPException
+
+from src.core.metrics import UPLOAD_BYTES
+
+logger = logging.getLogger(__name__)
+
+CRLF = b"\r\n"
+MAX_PART_HEADER_BYTES = 16 * 1024
+
+
+def _upload_error(status_code: int, code: str, message: str) -> HTTPException:
+    return HTTPException(
+        status_code=status_code, detail={"error": {"code": code, "message": message}}
+    )
+
+
+def multipart_boundary(content_type: str) -> bytes:
+    """The boundary of a ``multipart/form-data`` Content-Type header.
+
+    Raises:
+        HTTPException: 400 if the header has no usable boundary
+    """
+    message = Message()
+    message["content-type"] = content_type
+    boundary = message.get_param("boundary")
+    if not isinstance(boundary, str) or not 0 < len(boundary) <= 70:
+        raise _upload_error(400, "INVALID_UPLOAD", "Missing multipart boundary.")
+    return boundary.encode("latin-1")
+
+
+class MultipartReader:
+    """Read a multipart body from ``body`` without buffering whole parts."""
+
+    def __init__(self, body: AsyncIterator[bytes], boundary: bytes):
+        self._body = body.__aiter__()
+        self._delimiter = CRLF + b"--" + boundary
+        # The first boundary has no leading CRLF; pretend it does.
+        self._buffer = bytearray(CRLF)
+        self._at_boundary = False
+
+    async def next_file(self) -> Optional[Message]:
+        """Advance to the next part with a filename; returns its headers.
+
+        Parts without a filename (plain form fields) are skipped. Returns
+        None when the body has no more parts.
+        """
+        while True:
+            if not self._at_boundary:
+                async for _ in self._until(self._delimiter):
+                    pass  # preamble, or the rest of the previous part
+            self._at_boundary = False
+            after = await self._read(2)
+            if after == b"--":
+                return None
+            if after != CRLF:
+                raise _upload_error(400, "INVALID_UPLOAD", "Malformed multipart body.")
+            header = bytearray()
+            async for chunk in self._until(CRLF + CRLF, keep_crlf=True):
+                header += chunk
+                if len(header) > MAX_PART_HEADER_BYTES:
+                    raise _upload_error(
+                        400, "INVALID_UPLOAD", "Part headers too large."
+                    )
+            headers = HeaderParser().parsestr(header.decode("latin-1"))
+            if headers.get_filename():
+                return headers
+
+    def read(self) -> AsyncIterator[bytes]:
+        """Content of the current part, up to its closing boundary."""
+        return self._until(self._delimiter)
+
+    async def _fill(self) -> None:
+        try:
+            self._buffer += await self._body.__anext__()
+        except StopAsyncIteration:
+            raise _upload_error(
+                400, "INVALID_UPLOAD", "Multipart body ended unexpectedly."
+            ) from None
+
+    async def _read(self, size: int) -> bytes:
+        while len(self._buffer) < size:
+            await self._fill()
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    async def _until(
+        self, marker: bytes, keep_crlf: bool = False
+    ) -> AsyncIterator[bytes]:
+        """Yield the body up to ``marker`` and consume the marker.
+
+        Only ``len(marker) - 1`` bytes are held back between reads. With
+        ``keep_crlf`` the marker's first CRLF is left in the data, so header
+        blocks keep their last line ending.
+        """
+        hold = len(marker) - 1
+        while True:
+            index = self._buffer.find(marker)
+            if index >= 0:
+                end = index + 2 if keep_crlf else index
+                if end:
+                    yield bytes(self._buffer[:end])
+                del self._buffer[: index + len(marker)]
+                self._at_boundary = marker == self._delimiter
+                return
+            if len(self._buffer) > hold:
+                yield bytes(self._buffer[:-hold])
+                del self._buffer[:-hold]
+            await self._fill()
+
+
+@dataclass
+class UploadSummary:
+    """What was relayed: filename, size and SHA-256 (hex) of the file."""
+
+    filename: str
+    bytes: int = 0
+    sha256: str = ""
+
+
+async def checked_upload(
+    chunks: AsyncIterator[bytes],
+    summary: UploadSummary,
+    max_bytes: int,
+    expected_sha256: Optional[str] = None,
+    total: Optional[int] = None,
+) -> AsyncIterator[bytes]:
+    """Pass ``chunks`` through, counting and hashing them into ``summary``.
+
+    Progress is logged every tenth of ``total`` (the request's length, when
+    known) and exported as ``upload_bytes_total``.
+
+    Raises:
+        HTTPException: 413 past ``max_bytes``, 422 if the SHA-256 differs
+            from ``expected_sha256``
+    """
+    digest = hashlib.sha256()
+    step = max(total // 10, 1) if total else 0
+    reported = 0
+    async for chunk in chunks:
+        summary.bytes += len(chunk)
+        if summary.bytes > max_bytes:
+            raise _upload_error(
+                413, "UPLOAD_TOO_LARGE", f"Upload exceeds {max_bytes} bytes."
+            )
+        digest.update(chunk)
+        UPLOAD_BYTES.inc(len(chunk))
+        if step and summary.bytes - reported >= step:
+            reported = summary.bytes
+            logger.info(
+                "Upload %s: %d of ~%d bytes", summary.filename, summary.bytes, total
+            )
+        yield chunk
+    summary.sha256 = digest.hexdigest()
+    if expected_sha256 and summary.sha256 != expected_sha256.lower():
+        raise _upload_error(
+            422,
+            "CHECKSUM_MISMATCH",
+            f"Upload SHA-256 {summary.sha256} does not match {expected_sha256}.",
+        )
+
+
+def _header_safe(value: str) -> str:
+    return value.replace("\r", "").replace("\n", "")
+
+
+def new_boundary() -> str:
+    return f"beat-books-{uuid.uuid4().hex}"
+
+
+async def multipart_body(
+    boundary: str,
+    field_name: str,
+    filename: str,
+    content_type: str,
+    chunks: AsyncIterator[bytes],
+) -> AsyncIterator[bytes]:
+    """A one-file multipart/form-data body around ``chunks``."""
+    quoted = _header_safe(filename).replace("\\", "\\\\").replace('"', '\\"')
+    content_type = _header_safe(content_type)
+    yield (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="{field_name}"; filename="{quoted}"\r\n'
+        f"Content-Type: {content_type}\r\n\r\n"
+    ).encode()
+    async for chunk in chunks:
+        yield chunk
+    yield f"\r\n--{boundary}--\r\n".encode()
@@ -1,39 +1,88 @@
 import logging
-import time
+import os
+from contextlib import asynccontextmanager
 from typing import Any
 
 from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from prometheus_client import (
-    Counter,
-    Histogram,
-    generate_latest,
-    CONTENT_TYPE_LATEST,
-)
+from prometheus_client import CONTENT_TYPE_LATEST, multiprocess
 from slowapi.errors import RateLimitExceeded
-from starlette.middleware.base import BaseHTTPMiddleware
 
 from src.core.auth import APIKeyMiddleware
+from src.core.client import data_client, model_client
+from src.core.compression import CompressionMiddleware
 from src.core.config import settings
+from src.core.jobs import scrape_jobs
 from src.core.logging import RequestLoggingMiddleware
+from src.core.loop_monitor import LoadSheddingMiddleware, loop_monitor
+from src.core.last_known_good import last_known_good
+from src.core.matchups import matchup_matrix
+from src.core.metrics import (
+    LATENCY_BUCKETS,
+    MetricsMiddleware,
+    capped_handlers,
+    render_latest,
+)
+from src.core.model_versions import model_versions
+from src.core.negotiation import ContentNegotiationMiddleware
+from src.core.prewarm import prewarmer
 from src.core.rate_limit import limiter
+from src.core.responses import FastJSONResponse
 from src.core.tracing import RequestTracingMiddleware
-from src.routes import health, scrape, stats, predictions, odds
+from src.routes import (
+    health,
+    scrape,
+    stats,
+    predictions,
+    odds,
+    debug,
+    export,
+    dashboard,
+    batch,
+    cache,
+)
 
 Instrumentator: Any
+instrumentator_metrics: Any
 try:
     from prometheus_fastapi_instrumentator import Instrumentator
+    from prometheus_fastapi_instrumentator import metrics as instrumentator_metrics
 except ModuleNotFoundError:
-    Instrumentator = None
+    Instrumentator = instrumentator_metrics = None
     logging.getLogger(__name__).info(
         "prometheus-fastapi-instrumentator not installed — using fallback metrics"
     )
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start and stop background tasks with the application."""
+    loop_monitor.start()
+    scrape_jobs.start()
+    model_versions.start()
+    prewarmer.start()
+    yield
+    await prewarmer.stop()
+    await model_versions.stop()
+    await matchup_matrix.stop()
+    await scrape_jobs.stop()
+    await last_known_good.flush()
+    last_known_good.close()
+    await data_client.aclose()
+    await model_client.aclose()
+    await loop_monitor.stop()
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        # Drop this worker's live gauges from the multiprocess aggregate.
+        multiprocess.mark_process_dead(os.getpid())
+
+
 app = FastAPI(
     title="BeatTheBooks API",
     description="NFL game prediction platform — API gateway",
     version="1.0.0",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan,
 )
 
 # CORS middleware
@@ -48,9 +97,18 @@ app.add_middleware(
 # Authentication middleware
 app.add_middleware(APIKeyMiddleware)
 
+# Load shedding while the event loop is lagging
+app.add_middleware(LoadSheddingMiddleware)
+
+# MessagePack / CBOR content negotiation
+app.add_middleware(ContentNegotiationMiddleware)
+
 # Request/response logging middleware
 app.add_middleware(RequestLoggingMiddleware)
 
+# gzip / brotli / zstd response compression
+app.add_middleware(CompressionMiddleware)
+
 # Request tracing middleware
 app.add_middleware(RequestTracingMiddleware)
 
@@ -78,54 +136,35 @@ async def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded):
 app.include_router(health.router, tags=["Health"])
 app.include_router(scrape.router, prefix="/scrape", tags=["Scraping"])
 app.include_router(stats.router, tags=["Statistics"])
+app.include_router(dashboard.router, tags=["Dashboard"])
+app.include_router(batch.router, tags=["Batch"])
 app.include_router(predictions.router, prefix="/predictions", tags=["Predictions"])
 app.include_router(odds.router, prefix="/odds", tags=["Odds"])
+app.include_router(export.router, prefix="/export", tags=["Export"])
+app.include_router(debug.router, prefix="/debug", tags=["Debug"])
+app.include_router(cache.router, prefix="/cache", tags=["Cache"])
 
-# Prometheus metrics — exposes /metrics endpoint
+# Prometheus metrics — exposes /metrics endpoint. Both paths label requests by
+# route template, capped at METRICS_MAX_HANDLER_LABELS distinct handlers, and
+# aggregate across workers when PROMETHEUS_MULTIPROC_DIR is set.
 if Instrumentator is not None:
     Instrumentator(
         excluded_handlers=["/metrics"],
-    ).instrument(
-        app
-    ).expose(app, endpoint="/metrics", include_in_schema=True, tags=["Monitoring"])
+    ).add(
+        capped_handlers(
+            instrumentator_metrics.default(latency_highr_buckets=LATENCY_BUCKETS)
+        )
+    ).instrument(app).expose(
+        app, endpoint="/metrics", include_in_schema=True, tags=["Monitoring"]
+    )
 else:
     # Fallback: manual metrics collection via prometheus_client
-    REQUEST_COUNT = Counter(
-        "http_requests_total",
-        "Total HTTP requests",
-        ["method", "handler", "status"],
-    )
-    REQUEST_DURATION = Histogram(
-        "http_request_duration_seconds",
-        "HTTP request duration in seconds",
-        ["method", "handler"],
-    )
-
-    class MetricsMiddleware(BaseHTTPMiddleware):
-        async def dispatch(self, request: Request, call_next):
-            if request.url.path == "/metrics":
-                return await call_next(request)
-            start = time.time()
-            response = await call_next(request)
-            duration = time.time() - start
-            handler = request.url.path
-            REQUEST_COUNT.labels(
-                method=request.method,
-                handler=handler,
-                status=response.status_code,
-            ).inc()
-            REQUEST_DURATION.labels(
-                method=request.method,
-                handler=handler,
-            ).observe(duration)
-            return response
-
     app.add_middleware(MetricsMiddleware)
 
     @app.get("/metrics", tags=["Monitoring"], include_in_schema=True)
     async def metrics_endpoint():
         """Prometheus metrics."""
         return Response(
-            content=generate_latest(),
+            content=render_latest(),
             media_type=CONTENT_TYPE_LATEST,
         )
@@ -0,0 +1,139 @@
+"""Batch endpoint — many GET sub-requests in one HTTP call.
+
+Sub-requests are dispatched in-process through the full application (auth,
+rate limits, load shedding and the route itself) via an ASGI transport, so
+there is no loopback HTTP and each item is checked exactly as if it had been
+sent on its own.
+"""
+
+import json
+from typing import Any, AsyncIterator, List, Literal
+
+import httpx
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+
+from src.core.config import settings
+from src.core.fanout import ordered_map
+from src.core.negotiation import JSON
+from src.core.responses import FastJSONResponse, dumps
+
+router = APIRouter()
+
+NDJSON = "application/x-ndjson"
+
+# Parent headers not copied to sub-requests: they describe the batch body or
+# its encoding, or identify the batch request itself.
+_DROPPED_HEADERS = {
+    "host",
+    "content-length",
+    "content-type",
+    "transfer-encoding",
+    "connection",
+    "accept",
+    "accept-encoding",
+    "x-request-id",
+}
+
+
+class SubRequest(BaseModel):
+    """A relative GET request, e.g. ``/standings?season=2024``."""
+
+    method: Literal["GET"] = "GET"
+    path: str = Field(..., min_length=1)
+
+
+class BatchRequest(BaseModel):
+    """Request body for ``/batch``."""
+
+    requests: List[SubRequest] = Field(..., max_length=settings.BATCH_MAX_REQUESTS)
+
+
+class BatchItem(BaseModel):
+    """Outcome of one sub-request, in request order."""
+
+    index: int
+    path: str
+    status: int
+    body: Any = None
+
+
+class BatchResponse(BaseModel):
+    """All sub-request outcomes."""
+
+    results: List[BatchItem]
+
+
+def _check_path(path: str) -> str | None:
+    """Reason ``path`` cannot be dispatched, or None if it can."""
+    if not path.startswith("/") or path.startswith("//"):
+        return "Sub-request path must be relative and start with '/'."
+    if path.split("?", 1)[0].rstrip("/") == "/batch":
+        return "Batch requests cannot be nested."
+    return None
+
+
+def _body(response: httpx.Response) -> Any:
+    if not response.content:
+        return None
+    if response.headers.get("content-type", "").startswith(JSON):
+        return json.loads(response.content)
+    return response.text
+
+
+@router.post("/batch", response_model=BatchResponse)
+async def batch(body: BatchRequest, request: Request):
+    """
+    Run GET sub-requests concurrently and return their results in order.
+
+    Each item reports its own status and body, so failed sub-requests do not
+    fail the batch. Send ``Accept: application/x-ndjson`` to receive one
+    result per line as soon as it (and every item before it) is ready.
+    """
+    headers = {
+        key: value
+        for key, value in request.headers.items()
+        if key.lower() not in _DROPPED_HEADERS
+    }
+    headers.update({"Accept": JSON, "Accept-Encoding": "identity"})
+    # Sub-requests keep the caller's address, so per-client rate limits apply.
+    peer = request.client or ("127.0.0.1", 123)
+    transport = httpx.ASGITransport(
+        app=request.app, client=(peer[0], peer[1]), raise_app_exceptions=False
+    )
+    items = list(enumerate(body.requests))
+
+    async def run(item: tuple[int, SubRequest]) -> BatchItem:
+        index, sub = item
+        reason = _check_path(sub.path)
+        if reason:
+            return BatchItem(index=index, path=sub.path, status=400, body=reason)
+        response = await client.get(sub.path, headers=headers)
+        return BatchItem(
+            index=index,
+            path=sub.path,
+            status=response.status_code,
+            body=_body(response),
+        )
+
+    client = httpx.AsyncClient(transport=transport, base_url="http://batch")
+    results = ordered_map(run, items, settings.BATCH_CONCURRENCY)
+
+    if NDJSON in request.headers.get("accept", ""):
+
+        async def lines() -> AsyncIterator[bytes]:
+            try:
+                async for result in results:
+                    yield dumps(result) + b"\n"
+            finally:
+                await results.aclose()
+                await client.aclose()
+
+        return StreamingResponse(lines(), media_type=NDJSON)
+
+    try:
+        collected = [result async for result in results]
+    finally:
+        await client.aclose()
+    return FastJSONResponse(BatchResponse(results=collected))
@@ -0,0 +1,31 @@
+"""Cache invalidation webhook for beat-books-data."""
+
+from fastapi import APIRouter, Depends
+from pydantic import BaseModel, Field
+
+from src.core.auth import require_webhook_signature
+from src.core.cache import response_cache
+
+router = APIRouter(dependencies=[Depends(require_webhook_signature)])
+
+
+class InvalidateRequest(BaseModel):
+    """Surrogate keys whose cached responses are stale."""
+
+    tags: list[str] = Field(..., min_length=1, max_length=100)
+
+
+class InvalidateResponse(BaseModel):
+    invalidated: int
+
+
+@router.post("/invalidate", response_model=InvalidateResponse)
+async def invalidate_cache(body: InvalidateRequest):
+    """
+    Drop every cached response carrying any of ``tags``.
+
+    Sent by beat-books-data when it changes data outside a scrape proxied by
+    the gateway, e.g. ``{"tags": ["team:kc:2024"]}``. Requests must be signed
+    with CACHE_WEBHOOK_SECRET (see ``require_webhook_signature``).
+    """
+    return InvalidateResponse(invalidated=response_cache.invalidate(body.tags))
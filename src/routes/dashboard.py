@@ -0,0 +1,147 @@
+"""Composite team dashboard — one response built from concurrent upstream calls."""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Literal, Optional
+
+import httpx
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel
+
+from src.core.client import data_client
+from src.core.config import settings
+from src.core.responses import FastJSONResponse
+from src.routes.predictions import predict_matchup, validate_team_name
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+class SectionError(BaseModel):
+    """Why a dashboard section could not be filled."""
+
+    status_code: int
+    detail: Any
+
+
+class DashboardSection(BaseModel):
+    """One section of the dashboard with its own outcome."""
+
+    status: Literal["ok", "error", "skipped"]
+    data: Any = None
+    error: Optional[SectionError] = None
+
+
+class DashboardResponse(BaseModel):
+    """Team page data, with per-section status for partial failures."""
+
+    team: str
+    season: int
+    sections: dict[str, DashboardSection]
+
+
+async def _section(name: str, call: Awaitable[Any]) -> DashboardSection:
+    """Await ``call`` and report its result or failure as a section.
+
+    Any exception becomes the section's error, so one broken section never
+    fails the whole dashboard.
+    """
+    try:
+        data = await asyncio.wait_for(call, settings.DASHBOARD_SECTION_TIMEOUT)
+        return DashboardSection(status="ok", data=data)
+    except HTTPException as e:
+        error = SectionError(status_code=e.status_code, detail=e.detail)
+    except httpx.HTTPStatusError as e:
+        error = SectionError(
+            status_code=e.response.status_code,
+            detail=f"Model service error: {e.response.text}",
+        )
+    except (asyncio.TimeoutError, httpx.TimeoutException):
+        error = SectionError(status_code=504, detail="Upstream request timed out")
+    except httpx.HTTPError:
+        error = SectionError(status_code=503, detail="Upstream service unavailable")
+    except Exception:
+        logger.exception("Dashboard section %r failed", name)
+        error = SectionError(status_code=500, detail="Internal error")
+    return DashboardSection(status="error", error=error)
+
+
+def _involving(payload: Any, team: str) -> Any:
+    """Keep only the records in ``payload['data']`` that involve ``team``."""
+    if not isinstance(payload, dict) or not isinstance(payload.get("data"), list):
+        return payload
+    team = team.lower()
+    records = [
+        record
+        for record in payload["data"]
+        if team
+        in (
+            str(record.get("home_team", "")).lower(),
+            str(record.get("away_team", "")).lower(),
+        )
+    ]
+    return {**payload, "data": records}
+
+
+async def _games(team: str, season: int) -> Any:
+    result = await data_client.get("/stats/games", params={"season": season})
+    return _involving(result, team)
+
+
+async def _odds(team: str) -> Any:
+    result = await data_client.get("/odds/live", params={"sport": "nfl"})
+    return _involving(result, team)
+
+
+async def _prediction(team: str, opponent: str) -> Any:
+    home, away = validate_team_name(team), validate_team_name(opponent)
+    item = await predict_matchup(home, away)
+    if item.degraded:
+        return {
+            **dict(item.prediction or {}),
+            "degraded": True,
+            "age_seconds": item.age_seconds,
+        }
+    return item.prediction
+
+
+@router.get("/teams/{team}/dashboard", response_model=DashboardResponse)
+async def get_team_dashboard(
+    team: str,
+    season: int = Query(..., ge=1920, le=2100),
+    opponent: Optional[str] = Query(
+        None, description="Opponent for the prediction section (home = team)"
+    ),
+):
+    """
+    Everything a team page needs in one call.
+
+    Team stats, the team's games, standings, live odds for the team and,
+    given an ``opponent``, a game prediction are fetched concurrently. A
+    failing section is reported in place and does not fail the others;
+    503 is returned only if every section failed.
+    """
+    calls: dict[str, Awaitable[Any]] = {
+        "stats": data_client.get(f"/stats/teams/{team}", params={"season": season}),
+        "games": _games(team, season),
+        "standings": data_client.get("/stats/standings", params={"season": season}),
+        "odds": _odds(team),
+    }
+    if opponent:
+        calls["prediction"] = _prediction(team, opponent)
+
+    results = await asyncio.gather(
+        *(_section(name, call) for name, call in calls.items())
+    )
+    sections = dict(zip(calls, results))
+    if not opponent:
+        sections["prediction"] = DashboardSection(status="skipped")
+
+    status_code = 200
+    if all(section.status == "error" for section in results):
+        status_code = 503
+    return FastJSONResponse(
+        DashboardResponse(team=team, season=season, sections=sections),
+        status_code=status_code,
+    )
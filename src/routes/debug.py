@@ -0,0 +1,66 @@
+"""Admin-only diagnostics: sampling profiler and asyncio task dump."""
+
+import asyncio
+import threading
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse, Response
+
+from src.core.auth import require_admin_key
+from src.core.config import settings
+from src.core.profiler import (
+    ProfilerBusyError,
+    SamplingProfiler,
+    collapsed,
+    dump_tasks,
+    flamegraph_svg,
+)
+
+router = APIRouter(dependencies=[Depends(require_admin_key)])
+
+
+@router.get("/profile")
+async def profile(
+    seconds: float = Query(
+        5.0, gt=0, le=settings.PROFILER_MAX_SECONDS, description="Sampling duration"
+    ),
+    format: Literal["collapsed", "svg"] = Query(
+        "collapsed", description="Collapsed stacks or flamegraph SVG"
+    ),
+):
+    """
+    Sample the event loop thread's stack for ``seconds``.
+
+    Sampling runs in a worker thread, so the loop keeps serving requests and
+    shows up in the profile exactly as it behaves under load.
+
+    Raises:
+        HTTPException: 409 if another profile is already running
+    """
+    profiler = SamplingProfiler(
+        threading.get_ident(), settings.PROFILER_SAMPLE_INTERVAL
+    )
+    try:
+        samples = await asyncio.to_thread(profiler.run, seconds)
+    except ProfilerBusyError:
+        raise HTTPException(
+            status_code=409,
+            detail={
+                "error": {
+                    "code": "PROFILE_IN_PROGRESS",
+                    "message": "A profile is already running. Try again later.",
+                }
+            },
+        )
+
+    if format == "svg":
+        return Response(content=flamegraph_svg(samples), media_type="image/svg+xml")
+    return PlainTextResponse(collapsed(samples))
+
+
+@router.get("/tasks")
+async def tasks():
+    """Dump every asyncio task currently in flight with its stack."""
+    current = dump_tasks()
+    return {"total": len(current), "tasks": current}
@@ -0,0 +1,135 @@
+"""Bulk export of stats in columnar formats, streamed as they are fetched."""
+
+from contextlib import aclosing
+from functools import partial
+from typing import Any, AsyncGenerator, AsyncIterator
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from src.core.client import data_client
+from src.core.config import settings
+from src.core.export import MEDIA_TYPES, BatchWriter, ExportFormat, new_writer
+from src.core.fanout import ordered_map
+
+router = APIRouter()
+
+MIN_SEASON, MAX_SEASON = 1920, 2100
+
+
+def parse_seasons(value: str) -> list[int]:
+    """Parse ``2024``, ``2000-2025`` or ``2019,2021,2023`` into a season list."""
+    try:
+        if "-" in value:
+            start, end = (int(part) for part in value.split("-", 1))
+            seasons = list(range(start, end + 1))
+        else:
+            seasons = [int(part) for part in value.split(",")]
+    except ValueError:
+        seasons = []
+    if not seasons or not all(MIN_SEASON <= s <= MAX_SEASON for s in seasons):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid seasons: '{value}'. Use a year, a range (2000-2025) or a comma-separated list.",
+        )
+    return seasons
+
+
+def _season_label(seasons: list[int]) -> str:
+    """Filename part for a parsed season list, e.g. ``2024`` or ``2000-2025``."""
+    first, last = min(seasons), max(seasons)
+    return str(first) if first == last else f"{first}-{last}"
+
+
+def _with_season(season: int, rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    return [{"season": season, **row} for row in rows]
+
+
+async def _games(season: int) -> list[dict[str, Any]]:
+    result = await data_client.get("/stats/games", params={"season": season})
+    return _with_season(season, result.get("data") or [])
+
+
+async def _players_page(season: int, page: int) -> dict[str, Any]:
+    return await data_client.get(
+        "/stats/players",
+        params={"season": season, "page": page, "limit": settings.EXPORT_PAGE_SIZE},
+    )
+
+
+async def _first_players_page(season: int) -> tuple[int, dict[str, Any]]:
+    return season, await _players_page(season, 1)
+
+
+async def _players(seasons: list[int]) -> AsyncGenerator[list[dict[str, Any]], None]:
+    limit = settings.EXPORT_CONCURRENCY
+    async with aclosing(ordered_map(_first_players_page, seasons, limit)) as firsts:
+        async for season, first in firsts:
+            yield _with_season(season, first.get("data") or [])
+            total_pages = (first.get("pagination") or {}).get("total_pages") or 1
+            pages = ordered_map(
+                partial(_players_page, season), range(2, total_pages + 1), limit
+            )
+            async with aclosing(pages):
+                async for page in pages:
+                    yield _with_season(season, page.get("data") or [])
+
+
+async def _stream_export(
+    batches: AsyncGenerator[list[dict[str, Any]], None],
+    writer: BatchWriter,
+    fmt: ExportFormat,
+    filename: str,
+) -> StreamingResponse:
+    # Fetch the first batch before committing to a 200, so an unreachable
+    # backend still surfaces as a proper error response.
+    first: list[dict[str, Any]] = await anext(batches, [])
+
+    async def body() -> AsyncIterator[bytes]:
+        try:
+            yield writer.write(first)
+            async for rows in batches:
+                chunk = writer.write(rows)
+                if chunk:
+                    yield chunk
+            yield writer.close()
+        finally:
+            await batches.aclose()
+
+    return StreamingResponse(
+        body(),
+        media_type=MEDIA_TYPES[fmt],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}.{fmt.value}"'
+        },
+    )
+
+
+@router.get("/games")
+async def export_games(
+    seasons: str = Query(..., description="Season, range (2000-2025) or list"),
+    format: ExportFormat = Query(ExportFormat.CSV),
+):
+    """Export game results for many seasons. Fans out to beat-books-data."""
+    season_list = parse_seasons(seasons)
+    writer = new_writer(format)
+    batches = ordered_map(_games, season_list, settings.EXPORT_CONCURRENCY)
+    return await _stream_export(
+        batches, writer, format, f"games_{_season_label(season_list)}"
+    )
+
+
+@router.get("/players")
+async def export_players(
+    seasons: str = Query(..., description="Season, range (2000-2025) or list"),
+    format: ExportFormat = Query(ExportFormat.CSV),
+):
+    """Export every page of player statistics for many seasons."""
+    season_list = parse_seasons(seasons)
+    writer = new_writer(format)
+    return await _stream_export(
+        _players(season_list),
+        writer,
+        format,
+        f"players_{_season_label(season_list)}",
+    )
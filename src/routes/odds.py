@@ -1,11 +1,13 @@
 """Odds endpoints — delegates to beat-books-data service."""
 
-from typing import List
-from fastapi import APIRouter, Query
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query
 from pydantic import BaseModel
 from src.core.client import data_client
+from src.core.projection import FIELDS_DESCRIPTION, projected_get
+from src.core.responses import sampled_passthrough, trusted_response
 
-router = APIRouter()
+router = APIRouter(dependencies=[Depends(sampled_passthrough)])
 
 
 # Response Models
@@ -45,23 +47,36 @@ class BestOddsResponse(BaseModel):
 @router.get("/live", response_model=LiveOddsResponse)
 async def get_live_odds(
     sport: str = Query("nfl", description="Sport league"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
 ):
     """Get current live odds for upcoming games. Delegates to beat-books-data."""
+    if fields:
+        return await projected_get("/odds/live", {"sport": sport}, fields)
     result = await data_client.get("/odds/live", params={"sport": sport})
-    return result
+    return trusted_response(result, LiveOddsResponse)
 
 
 @router.get("/history/{game_id}", response_model=OddsHistoryResponse)
-async def get_odds_history(game_id: str):
+async def get_odds_history(
+    game_id: str,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+):
     """Get odds movement history for a specific game. Delegates to beat-books-data."""
+    if fields:
+        return await projected_get(
+            f"/odds/history/{game_id}", None, fields, data_key="history"
+        )
     result = await data_client.get(f"/odds/history/{game_id}")
-    return result
+    return trusted_response(result, OddsHistoryResponse)
 
 
 @router.get("/best", response_model=BestOddsResponse)
 async def get_best_odds(
     sport: str = Query("nfl", description="Sport league"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
 ):
     """Get best available line across all books. Delegates to beat-books-data."""
+    if fields:
+        return await projected_get("/odds/best", {"sport": sport}, fields)
     result = await data_client.get("/odds/best", params={"sport": sport})
-    return result
+    return trusted_response(result, BestOddsResponse)
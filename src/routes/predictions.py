@@ -1,14 +1,61 @@
-from fastapi import APIRouter, HTTPException, Query, Request
-from pydantic import BaseModel, Field
-from typing import Optional, List, Literal, Union
+from contextlib import aclosing
+from functools import partial
+
+from fastapi import APIRouter, Header, HTTPException, Query, Request
+from pydantic import BaseModel, Field, ValidationError
+from typing import Any, AsyncIterator, Optional, List, Literal
 import httpx
 from src.core.config import settings
 from src.core.teams import VALID_NFL_TEAMS
 from src.core.rate_limit import limiter
-from src.core.client import data_client
+from src.core.client import data_client, model_client
+from src.core.fanout import ordered_map, unordered_map
+from src.core.idempotency import IDEMPOTENCY_KEY_HEADER, idempotent
+from src.core.last_known_good import StoredPrediction, last_known_good
+from src.core.matchups import FIELDS, NPY, TEAMS, matchup_matrix
+from src.core.model_versions import (
+    CachedPrediction,
+    model_versions,
+    prediction_cache,
+    prediction_version,
+)
+from src.core.negotiation import response_format_var
+from src.core.prewarm import prewarmer
+from src.core.responses import (
+    FastJSONResponse,
+    RequestStreamingResponse,
+    dumps,
+    sse_event,
+    trusted_model,
+    trusted_response,
+)
+from starlette.responses import Response
 
 router = APIRouter()
 
+DEGRADED_HEADER = "X-Degraded"
+NDJSON = "application/x-ndjson"
+SSE = "text/event-stream"
+MAX_STREAM_LINE_BYTES = 4096
+
+PREDICTION_STREAM_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            NDJSON: {
+                "schema": {
+                    "type": "object",
+                    "required": ["team1", "team2"],
+                    "properties": {
+                        "team1": {"type": "string"},
+                        "team2": {"type": "string"},
+                    },
+                }
+            }
+        },
+    }
+}
+
 
 # Response Models
 class PredictionResponse(BaseModel):
@@ -79,10 +126,22 @@ class BatchPredictionError(BaseModel):
 
 
 class BatchPredictionItem(BaseModel):
-    """Result for a single game — either a prediction or an error."""
+    """Result for a single game — either a prediction or an error.
+
+    ``degraded`` marks a last-known-good prediction served while the model
+    service is down, made ``age_seconds`` ago.
+    """
 
     prediction: Optional[PredictionResponse] = None
     error: Optional[BatchPredictionError] = None
+    degraded: bool = False
+    age_seconds: Optional[float] = None
+
+
+class StreamedPredictionItem(BatchPredictionItem):
+    """A streamed batch result and the position of its game in the request."""
+
+    index: int
 
 
 class BatchPredictionResponse(BaseModel):
@@ -105,6 +164,33 @@ def validate_team_name(team: str) -> str:
     return normalized
 
 
+def _model_down(error: httpx.HTTPError) -> bool:
+    """Whether ``error`` means the model service is unavailable."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code >= 500
+    return isinstance(error, (httpx.ConnectError, httpx.TimeoutException))
+
+
+async def _last_known_good(
+    home_team: str, away_team: str, error: httpx.HTTPError
+) -> Optional[StoredPrediction]:
+    """The stored prediction to serve in place of a failed model call."""
+    if not _model_down(error):
+        return None
+    return await last_known_good.get(home_team, away_team)
+
+
+def _cached_response(entry: CachedPrediction) -> Response:
+    """Response for a cached prediction, encoding it once per media type."""
+    media_type = response_format_var.get()
+    body = entry.bodies.get(media_type)
+    if body is None:
+        body = entry.bodies[media_type] = bytes(FastJSONResponse(entry.data).body)
+    version = prediction_version(entry.data)
+    headers = version.headers() if version else None
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
 @router.get("/predict", response_model=PredictionResponse)
 @limiter.limit(settings.RATE_LIMIT_PREDICTIONS)
 async def predict_game(
@@ -122,7 +208,12 @@ async def predict_game(
         team2: Away team name (NFL abbreviation, e.g., 'eagles')
 
     Returns:
-        PredictionResponse with probabilities, spread, and betting recommendation
+        PredictionResponse with probabilities, spread, and betting recommendation,
+        stamped with X-Model-Version and X-Feature-Version headers. Predictions
+        are served from cache while the model that made them is still active.
+        While the model service is down the last-known-good prediction is
+        returned instead, with ``degraded: true``, its ``age_seconds`` and
+        ``X-Degraded``/``Age`` headers.
 
     Raises:
         HTTPException: 400 if team names are invalid
@@ -132,30 +223,92 @@ async def predict_game(
     home_team = validate_team_name(team1)
     away_team = validate_team_name(team2)
 
+    active = model_versions.active
+    matchup = matchup_matrix.lookup(home_team, away_team, active)
+    if matchup is not None and active is not None:
+        return FastJSONResponse(matchup, headers=active.headers())
+    cached = prediction_cache.get(home_team, away_team, active)
+    if cached is not None:
+        return _cached_response(cached)
+
     # Delegate to beat-books-model service
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{settings.MODEL_SERVICE_URL}/predict",
-                params={"team1": home_team, "team2": away_team},
-                timeout=10.0,
-            )
-            response.raise_for_status()
-            return response.json()
-    except httpx.ConnectError:
-        raise HTTPException(
+        response = await model_client.get(
+            "/predict", params={"team1": home_team, "team2": away_team}
+        )
+        data = response.json()
+        result = trusted_response(data, PredictionResponse)
+    except (httpx.ConnectError, httpx.HTTPStatusError, httpx.TimeoutException) as e:
+        stored = await _last_known_good(home_team, away_team, e)
+        if stored is None:
+            raise _model_error(e)
+        age = stored.age
+        headers = {DEGRADED_HEADER: "true", "Age": str(int(age))}
+        stored_version = prediction_version(stored.data)
+        if stored_version is not None:
+            headers.update(stored_version.headers())
+        return FastJSONResponse(
+            {**stored.data, "degraded": True, "age_seconds": round(age, 1)},
+            headers=headers,
+        )
+    last_known_good.put(home_team, away_team, data)
+    version = prediction_version(data)
+    if version is not None:
+        result.headers.update(version.headers())
+        if model_versions.active is not None:
+            entry = prediction_cache.set(home_team, away_team, data)
+            entry.bodies[response_format_var.get()] = bytes(result.body)
+    return result
+
+
+def _model_error(error: httpx.HTTPError) -> HTTPException:
+    if isinstance(error, httpx.ConnectError):
+        return HTTPException(
             status_code=503,
             detail="Model service unavailable. Please ensure beat-books-model is running.",
         )
-    except httpx.HTTPStatusError as e:
-        raise HTTPException(
-            status_code=e.response.status_code,
-            detail=f"Model service error: {e.response.text}",
+    if isinstance(error, httpx.HTTPStatusError):
+        return HTTPException(
+            status_code=error.response.status_code,
+            detail=f"Model service error: {error.response.text}",
         )
-    except httpx.TimeoutException:
+    return HTTPException(
+        status_code=504, detail="Model service timeout. Request took too long."
+    )
+
+
+@router.get("/matrix")
+async def get_matchup_matrix(
+    format: Literal["json", "npy"] = Query(
+        "json", description="Nested JSON lists, or a NumPy .npy array"
+    ),
+):
+    """
+    Every matchup's prediction under the active model, as one matrix.
+
+    ``values[home][away]`` holds ``fields`` for that matchup, with teams in
+    ``teams`` order (null where the model gave no prediction). ``npy`` returns
+    the same 32x32x6 float64 array in NumPy format, with teams and fields in
+    X-Matrix-Teams and X-Matrix-Fields headers.
+
+    Raises:
+        HTTPException: 503 until a matrix for the active model has been built
+    """
+    matrix = matchup_matrix.current
+    active = model_versions.active
+    if matrix is None or active is None or matrix.version != active:
         raise HTTPException(
-            status_code=504, detail="Model service timeout. Request took too long."
+            status_code=503,
+            detail="Matchup matrix for the active model is not available yet.",
         )
+    if format == "npy":
+        headers = {
+            **active.headers(),
+            "X-Matrix-Teams": ",".join(TEAMS),
+            "X-Matrix-Fields": ",".join(FIELDS),
+        }
+        return Response(matrix.npy, media_type=NPY, headers=headers)
+    return FastJSONResponse(matrix.to_json(), headers=active.headers())
 
 
 @router.get("/backtest/{run_id}", response_model=BacktestResponse)
@@ -176,12 +329,8 @@ async def get_backtest_results(run_id: str):
         HTTPException: 503 if model service is unavailable
     """
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{settings.MODEL_SERVICE_URL}/backtest/{run_id}", timeout=10.0
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await model_client.get(f"/backtest/{run_id}")
+        return trusted_response(response.json(), BacktestResponse)
     except httpx.ConnectError:
         raise HTTPException(
             status_code=503,
@@ -216,12 +365,8 @@ async def list_models():
         HTTPException: 503 if model service is unavailable
     """
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{settings.MODEL_SERVICE_URL}/models", timeout=10.0
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await model_client.get("/models")
+        return trusted_response(response.json(), ModelsListResponse)
     except httpx.ConnectError:
         raise HTTPException(
             status_code=503,
@@ -238,35 +383,85 @@ async def list_models():
         )
 
 
-async def _predict_single(
-    home_team: str, away_team: str
-) -> Union[PredictionResponse, BatchPredictionError]:
-    """Call model service for a single game prediction."""
+async def predict_matchup(home_team: str, away_team: str) -> BatchPredictionItem:
+    """One matchup's prediction, however it can be served quickest.
+
+    Tries the matchup matrix, then the prediction cache, then the model; while
+    the model is down, a last-known-good prediction is returned as degraded.
+    Team names must already be validated.
+
+    Raises:
+        httpx.HTTPError: if the model call failed and nothing could stand in
+    """
+    active = model_versions.active
+    matchup = matchup_matrix.lookup(home_team, away_team, active)
+    if matchup is not None:
+        return BatchPredictionItem(
+            prediction=trusted_model(PredictionResponse, matchup)
+        )
+    cached = prediction_cache.get(home_team, away_team, active)
+    if cached is not None:
+        return BatchPredictionItem(
+            prediction=trusted_model(PredictionResponse, cached.data)
+        )
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{settings.MODEL_SERVICE_URL}/predict",
-                params={"team1": home_team, "team2": away_team},
-                timeout=10.0,
-            )
-            response.raise_for_status()
-            return PredictionResponse(**response.json())
+        response = await model_client.get(
+            "/predict", params={"team1": home_team, "team2": away_team}
+        )
+    except (httpx.ConnectError, httpx.TimeoutException, httpx.HTTPStatusError) as e:
+        stored = await _last_known_good(home_team, away_team, e)
+        if stored is None:
+            raise
+        return BatchPredictionItem(
+            prediction=trusted_model(PredictionResponse, stored.data),
+            degraded=True,
+            age_seconds=round(stored.age, 1),
+        )
+    data = response.json()
+    prediction = trusted_model(PredictionResponse, data)
+    last_known_good.put(home_team, away_team, data)
+    if model_versions.active is not None:
+        prediction_cache.set(home_team, away_team, data)
+    return BatchPredictionItem(prediction=prediction)
+
+
+async def _predict_single(home_team: str, away_team: str) -> BatchPredictionItem:
+    """``predict_matchup``, with model failures reported as an error item."""
+    try:
+        return await predict_matchup(home_team, away_team)
     except (httpx.ConnectError, httpx.TimeoutException, httpx.HTTPStatusError) as e:
         msg = str(e)
         if isinstance(e, httpx.ConnectError):
             msg = "Model service unavailable"
         elif isinstance(e, httpx.TimeoutException):
             msg = "Model service timeout"
-        return BatchPredictionError(team1=home_team, team2=away_team, error=msg)
+        return BatchPredictionItem(
+            error=BatchPredictionError(team1=home_team, team2=away_team, error=msg)
+        )
 
 
 @router.post("/batch", response_model=BatchPredictionResponse)
-async def predict_batch(batch: BatchRequest):
+async def predict_batch(
+    batch: BatchRequest,
+    request: Request,
+    idempotency_key: Optional[str] = Header(
+        None,
+        alias=IDEMPOTENCY_KEY_HEADER,
+        max_length=255,
+        description="Replay the result of an earlier request sent with this key",
+    ),
+):
     """
     Predict outcomes for multiple games in a single request.
 
     Handles partial failures — if some games fail, successes are still returned.
+    A repeated ``Idempotency-Key`` replays the first response. Larger batches
+    go to ``/predictions/batch/stream``.
     """
+    return await idempotent(request, idempotency_key, partial(_predict_batch, batch))
+
+
+async def _predict_batch(batch: BatchRequest):
     if not batch.games:
         return BatchPredictionResponse(results=[], total=0, succeeded=0, failed=0)
 
@@ -289,29 +484,163 @@ async def predict_batch(batch: BatchRequest):
             failed += 1
             continue
 
-        result = await _predict_single(home, away)
-        if isinstance(result, PredictionResponse):
-            results.append(BatchPredictionItem(prediction=result))
+        item = await _predict_single(home, away)
+        results.append(item)
+        if item.prediction is not None:
             succeeded += 1
         else:
-            results.append(BatchPredictionItem(error=result))
             failed += 1
 
-    return BatchPredictionResponse(
-        results=results,
-        total=len(batch.games),
-        succeeded=succeeded,
-        failed=failed,
+    return FastJSONResponse(
+        BatchPredictionResponse(
+            results=results,
+            total=len(batch.games),
+            succeeded=succeeded,
+            failed=failed,
+        )
     )
 
 
-@router.get("/week/{season}/{week}", response_model=BatchPredictionResponse)
-async def predict_week(season: int, week: int):
+async def _ndjson_lines(
+    chunks: AsyncIterator[bytes],
+) -> AsyncIterator[tuple[int, Optional[bytes]]]:
+    """Number and yield each non-blank line of an NDJSON body as it arrives.
+
+    Lines longer than ``MAX_STREAM_LINE_BYTES`` are yielded empty. A line
+    past ``PREDICTION_STREAM_MAX_GAMES`` is yielded as None and ends reading.
     """
-    Predict all games for a given NFL week.
+    buffer = bytearray()
+    index = 0
+    oversized = False
+
+    def line_at(end: int) -> Optional[bytes]:
+        if index >= settings.PREDICTION_STREAM_MAX_GAMES:
+            return None
+        if oversized or end > MAX_STREAM_LINE_BYTES:
+            return b""
+        return bytes(buffer[:end])
+
+    async for chunk in chunks:
+        buffer += chunk
+        while True:
+            end = buffer.find(b"\n")
+            if end < 0:
+                if len(buffer) > MAX_STREAM_LINE_BYTES:
+                    oversized = True
+                    buffer.clear()
+                break
+            if oversized or buffer[:end].strip():
+                line = line_at(end)
+                yield index, line
+                if line is None:
+                    return
+                index += 1
+                oversized = False
+            del buffer[: end + 1]
+    if oversized or buffer.strip():
+        yield index, line_at(len(buffer))
+
+
+def _stream_error(
+    index: int, error: str, team1: str = "", team2: str = ""
+) -> StreamedPredictionItem:
+    return StreamedPredictionItem(
+        index=index,
+        error=BatchPredictionError(team1=team1, team2=team2, error=error),
+    )
+
 
-    Fetches schedule from beat-books-data, then predicts each game.
+async def _predict_line(line: tuple[int, Optional[bytes]]) -> StreamedPredictionItem:
+    index, body = line
+    if body is None:
+        return _stream_error(
+            index,
+            f"Stream exceeds {settings.PREDICTION_STREAM_MAX_GAMES} games;"
+            " the rest was not read",
+        )
+    try:
+        game = BatchGameInput.model_validate_json(body)
+    except ValidationError:
+        return _stream_error(index, "Expected a JSON object with team1 and team2")
+    try:
+        home = validate_team_name(game.team1)
+        away = validate_team_name(game.team2)
+    except HTTPException as e:
+        return _stream_error(index, str(e.detail), game.team1, game.team2)
+    try:
+        item = await _predict_single(home, away)
+    except ValidationError:
+        return _stream_error(index, "Invalid prediction from model service", home, away)
+    return StreamedPredictionItem(index=index, **dict(item))
+
+
+@router.post("/batch/stream", openapi_extra=PREDICTION_STREAM_BODY)
+async def predict_batch_stream(request: Request):
+    """
+    Predict a stream of games, returning each result as soon as it is ready.
+
+    The body is NDJSON, one ``{"team1": ..., "team2": ...}`` object per line,
+    and is read as it arrives; up to ``PREDICTION_STREAM_MAX_GAMES`` lines
+    are predicted, ``PREDICTION_CONCURRENCY`` at a time. Results are sent in
+    completion order as NDJSON ``StreamedPredictionItem`` lines whose
+    ``index`` is the game's line number (0-based, blank lines skipped). With
+    ``Accept: text/event-stream`` they are ``prediction`` events instead,
+    followed by a ``done`` event with the totals. Bad lines become error
+    items; they do not end the stream. A longer body gets one more error
+    item, at index ``PREDICTION_STREAM_MAX_GAMES``, and ``truncated: true``
+    in the totals.
     """
+    sse = SSE in request.headers.get("accept", "")
+
+    async def body() -> AsyncIterator[bytes]:
+        total = succeeded = 0
+        truncated = False
+        results = unordered_map(
+            _predict_line,
+            _ndjson_lines(request.stream()),
+            settings.PREDICTION_CONCURRENCY,
+        )
+        async with aclosing(results):
+            async for item in results:
+                if item.index >= settings.PREDICTION_STREAM_MAX_GAMES:
+                    truncated = True
+                else:
+                    total += 1
+                    if item.prediction is not None:
+                        succeeded += 1
+                yield sse_event("prediction", item) if sse else dumps(item) + b"\n"
+        if sse:
+            summary: dict[str, Any] = {
+                "total": total,
+                "succeeded": succeeded,
+                "failed": total - succeeded,
+                "truncated": truncated,
+            }
+            yield sse_event("done", summary)
+
+    # The body is read while the response streams, so nothing else may
+    # consume ``receive()``.
+    if sse:
+        return RequestStreamingResponse(
+            body(), media_type=SSE, headers={"Cache-Control": "no-cache"}
+        )
+    return RequestStreamingResponse(body(), media_type=NDJSON)
+
+
+async def _predict_scheduled(game: dict) -> BatchPredictionItem:
+    home = game.get("home_team", "")
+    away = game.get("away_team", "")
+    if not home or not away:
+        return BatchPredictionItem(
+            error=BatchPredictionError(
+                team1=home, team2=away, error="Missing team in schedule data"
+            )
+        )
+    return await _predict_single(home, away)
+
+
+async def week_predictions(season: int, week: int) -> BatchPredictionResponse:
+    """Fetch a week's schedule and predict its games, a few at a time."""
     schedule = await data_client.get(
         "/stats/games", params={"season": season, "week": week}
     )
@@ -323,35 +652,29 @@ async def predict_week(season: int, week: int):
     if not games:
         return BatchPredictionResponse(results=[], total=0, succeeded=0, failed=0)
 
-    results: List[BatchPredictionItem] = []
-    succeeded = 0
-    failed = 0
-
-    for game in games:
-        home = game.get("home_team", "")
-        away = game.get("away_team", "")
-        if not home or not away:
-            results.append(
-                BatchPredictionItem(
-                    error=BatchPredictionError(
-                        team1=home, team2=away, error="Missing team in schedule data"
-                    )
-                )
-            )
-            failed += 1
-            continue
-
-        result = await _predict_single(home, away)
-        if isinstance(result, PredictionResponse):
-            results.append(BatchPredictionItem(prediction=result))
-            succeeded += 1
-        else:
-            results.append(BatchPredictionItem(error=result))
-            failed += 1
-
+    async with aclosing(
+        ordered_map(_predict_scheduled, games, settings.PREDICTION_CONCURRENCY)
+    ) as items:
+        results = [item async for item in items]
+    succeeded = sum(1 for item in results if item.prediction is not None)
     return BatchPredictionResponse(
         results=results,
         total=len(games),
         succeeded=succeeded,
-        failed=failed,
+        failed=len(results) - succeeded,
     )
+
+
+@router.get("/week/{season}/{week}", response_model=BatchPredictionResponse)
+async def predict_week(season: int, week: int):
+    """
+    Predict all games for a given NFL week.
+
+    Fetches schedule from beat-books-data, then predicts each game. The
+    current and next week are kept warm in the background when
+    ``PREWARM_INTERVAL`` is set.
+    """
+    return FastJSONResponse(await week_predictions(season, week))
+
+
+prewarmer.warmers.append(week_predictions)
@@ -1,25 +1,380 @@
-from fastapi import APIRouter
+import asyncio
+import base64
+from dataclasses import asdict
+from datetime import datetime
+from functools import partial
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Optional
+
+from fastapi import APIRouter, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from src.core.cache import response_cache, scrape_tags
 from src.core.client import data_client
+from src.core.config import settings
+from src.core.idempotency import IDEMPOTENCY_KEY_HEADER, idempotent
+from src.core.jobs import Job, JobStatus, scrape_jobs
+from src.core.responses import FastJSONResponse, sse_event
+from src.core.teams import VALID_NFL_TEAMS, NFLTeam
+from src.core.uploads import (
+    MAX_PART_HEADER_BYTES,
+    MultipartReader,
+    UploadSummary,
+    checked_upload,
+    multipart_body,
+    multipart_boundary,
+    new_boundary,
+)
 
 router = APIRouter()
 
+ASYNC_DESCRIPTION = (
+    "Return 202 with a job ID to poll (the default); false waits for the scrape"
+)
+IDEMPOTENCY_DESCRIPTION = "Replay the result of an earlier request sent with this key"
+CHECKSUM_HEADER = "X-Content-SHA256"
+
+# Documents the optional upload; the body is parsed by hand so it can stream.
+EXCEL_UPLOAD_BODY = {
+    "requestBody": {
+        "required": False,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "properties": {"file": {"type": "string", "format": "binary"}},
+                }
+            }
+        },
+    }
+}
+
+
+class JobProgress(BaseModel):
+    """Steps completed out of the job's total."""
+
+    completed: int
+    total: int
+
+
+class JobResponse(BaseModel):
+    """Status of a scrape job."""
+
+    job_id: str
+    key: str
+    status: JobStatus
+    progress: JobProgress
+    submitted_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[dict[str, Any]] = None
+    status_url: str
+    result_url: str
+
+
+def _job_response(job: Job) -> JobResponse:
+    return JobResponse(
+        job_id=job.id,
+        key=job.key,
+        status=job.status,
+        progress=JobProgress(completed=job.completed, total=job.total),
+        submitted_at=job.submitted_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+        error=job.error,
+        status_url=f"/scrape/jobs/{job.id}",
+        result_url=f"/scrape/jobs/{job.id}/result",
+    )
+
+
+def _get_job(job_id: str) -> Job:
+    job = scrape_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Scrape job '{job_id}' not found.")
+    return job
+
+
+async def _submit(
+    key: str, run: Callable[[Job], Awaitable[Any]], run_async: bool
+) -> Any:
+    """Run a scrape as a job, deduplicated by ``key``.
+
+    With ``run_async`` the caller gets 202 and the job's status to poll;
+    otherwise (``?async=false``) the response waits for the job.
+    """
+    job, _ = scrape_jobs.submit(key, run)
+    if run_async:
+        status = _job_response(job)
+        return FastJSONResponse(
+            status, status_code=202, headers={"Location": status.status_url}
+        )
+    return await scrape_jobs.wait(job)
+
+
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_scrape_job(job_id: str):
+    """Status and progress of a scrape job."""
+    return FastJSONResponse(_job_response(_get_job(job_id)))
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_scrape_job_events(job_id: str):
+    """Stream a job's progress as Server-Sent Events.
+
+    Per-team season scrapes send a ``team`` event as each team finishes;
+    every job ends with a ``done`` event carrying its status and result.
+    Events already published are replayed first.
+    """
+    job = _get_job(job_id)
+
+    async def events() -> AsyncIterator[bytes]:
+        async for event in job.follow():
+            name = event["event"]
+            yield sse_event(name, {k: v for k, v in event.items() if k != "event"})
+
+    return StreamingResponse(
+        events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"}
+    )
+
+
+@router.get("/jobs/{job_id}/result")
+async def get_scrape_job_result(job_id: str):
+    """Result of a finished scrape job.
+
+    Returns 202 with the job status while it is still queued or running, and
+    the backend's error status if the scrape failed.
+    """
+    job = _get_job(job_id)
+    if not job.finished:
+        return FastJSONResponse(_job_response(job), status_code=202)
+    return await scrape_jobs.wait(job)
+
 
 @router.get("/{team}/{year}")
-async def scrape_team(team: str, year: int):
+async def scrape_team(
+    team: str,
+    year: int,
+    run_async: bool = Query(True, alias="async", description=ASYNC_DESCRIPTION),
+):
     """Trigger scraping for a single team/year. Delegates to beat-books-data."""
-    result = await data_client.get(f"/scrape/{team}/{year}")
-    return result
+
+    async def run(job: Job) -> Any:
+        result = await data_client.get(f"/scrape/{team}/{year}")
+        response_cache.invalidate(scrape_tags(year, team))
+        return result
+
+    return await _submit(f"team:{team.upper()}:{year}", run, run_async)
+
+
+def resume_token(year: int, done: Iterable[str]) -> str:
+    """Opaque token naming the teams of ``year`` that were scraped."""
+    raw = f"{year}:{','.join(sorted(done))}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def parse_resume_token(token: str, year: int) -> set[str]:
+    """Teams already scraped according to ``token``.
+
+    Raises:
+        HTTPException: 400 if the token is malformed or for another season
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+        token_year, _, teams = raw.partition(":")
+        done = {team for team in teams.split(",") if team}
+        valid = int(token_year) == year and done <= VALID_NFL_TEAMS
+    except ValueError:
+        valid = False
+    if not valid:
+        raise HTTPException(
+            status_code=400, detail=f"Invalid resume token for season {year}."
+        )
+    return done
+
+
+async def _scrape_team_with_retries(team: str, year: int) -> dict[str, Any]:
+    """Scrape one team, retrying backend (5xx) failures with backoff."""
+    attempts = max(settings.SCRAPE_TEAM_ATTEMPTS, 1)
+    attempt = 1
+    while True:
+        try:
+            await data_client.get(f"/scrape/{team}/{year}")
+            response_cache.invalidate(scrape_tags(year, team))
+            return {"team": team, "status": "succeeded", "attempts": attempt}
+        except HTTPException as e:
+            if e.status_code < 500 or attempt >= attempts:
+                return {
+                    "team": team,
+                    "status": "failed",
+                    "attempts": attempt,
+                    "error": {"status_code": e.status_code, "detail": e.detail},
+                }
+        await asyncio.sleep(settings.RETRY_BASE_DELAY * 2 ** (attempt - 1))
+        attempt += 1
+
+
+async def _scrape_season_by_team(job: Job, year: int, skip: set[str]) -> dict[str, Any]:
+    """Scrape every team of ``year`` not in ``skip``, a few at a time."""
+    teams = [team.value for team in NFLTeam if team.value not in skip]
+    job.total = len(teams)
+    limit = asyncio.Semaphore(max(settings.SCRAPE_TEAM_CONCURRENCY, 1))
+    outcomes: dict[str, dict[str, Any]] = {}
+
+    async def scrape(team: str) -> None:
+        async with limit:
+            outcome = await _scrape_team_with_retries(team, year)
+        outcomes[team] = outcome
+        job.completed += 1
+        job.publish(
+            {"event": "team", **outcome, "completed": job.completed, "total": job.total}
+        )
+
+    await asyncio.gather(*(scrape(team) for team in teams))
+    succeeded = {t for t, o in outcomes.items() if o["status"] == "succeeded"}
+    return {
+        "year": year,
+        "teams": [outcomes[team] for team in teams],
+        "succeeded": len(succeeded),
+        "failed": len(teams) - len(succeeded),
+        "skipped": sorted(skip),
+        "resume_token": resume_token(year, skip | succeeded),
+    }
 
 
 @router.get("/{year}")
-async def scrape_year(year: int):
-    """Trigger scraping for all teams in a year. Delegates to beat-books-data."""
-    result = await data_client.get(f"/scrape/{year}")
-    return result
+async def scrape_year(
+    year: int,
+    run_async: bool = Query(True, alias="async", description=ASYNC_DESCRIPTION),
+    per_team: bool = Query(
+        False, description="Scrape each team separately, with retries and progress"
+    ),
+    resume: Optional[str] = Query(
+        None, description="Resume token from an earlier per-team run"
+    ),
+):
+    """Trigger scraping for all teams in a year. Delegates to beat-books-data.
+
+    With ``per_team`` the season is split into one scrape per team, run
+    ``SCRAPE_TEAM_CONCURRENCY`` at a time with per-team retries. The result
+    reports each team and a ``resume_token``; passing it back as ``resume``
+    skips the teams that already succeeded.
+    """
+    if resume is not None and not per_team:
+        raise HTTPException(
+            status_code=400, detail="resume can only be used with per_team=true."
+        )
+    if per_team:
+        skip = parse_resume_token(resume, year) if resume else set()
+
+        async def run_per_team(job: Job) -> Any:
+            return await _scrape_season_by_team(job, year, skip)
+
+        return await _submit(f"year:{year}:per-team", run_per_team, run_async)
+
+    async def run(job: Job) -> Any:
+        result = await data_client.get(f"/scrape/{year}")
+        response_cache.invalidate(scrape_tags(year))
+        return result
+
+    return await _submit(f"year:{year}", run, run_async)
+
+
+async def _upload_excel(request: Request, sha256: Optional[str]) -> Any:
+    """Stream the uploaded spreadsheet to beat-books-data and scrape it."""
+    try:
+        length: Optional[int] = int(request.headers["content-length"])
+    except (KeyError, ValueError):
+        length = None
+    if length and length > settings.SCRAPE_UPLOAD_MAX_BYTES + MAX_PART_HEADER_BYTES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Upload exceeds {settings.SCRAPE_UPLOAD_MAX_BYTES} bytes.",
+        )
+
+    reader = MultipartReader(
+        request.stream(), multipart_boundary(request.headers["content-type"])
+    )
+    part = await reader.next_file()
+    if part is None:
+        raise HTTPException(status_code=400, detail="Upload has no file part.")
+    summary = UploadSummary(filename=part.get_filename() or "upload.xlsx")
+    boundary = new_boundary()
+    body = multipart_body(
+        boundary,
+        "file",
+        summary.filename,
+        part.get("content-type", "application/octet-stream"),
+        checked_upload(
+            reader.read(),
+            summary,
+            settings.SCRAPE_UPLOAD_MAX_BYTES,
+            expected_sha256=sha256,
+            total=length,
+        ),
+    )
+    result = await data_client.upload(
+        "/scrape/excel", body, f"multipart/form-data; boundary={boundary}"
+    )
+    response_cache.invalidate(scrape_tags())
+    return {**result, "upload": asdict(summary)}
+
+
+@router.post("/excel", openapi_extra=EXCEL_UPLOAD_BODY)
+async def scrape_excel(
+    request: Request,
+    run_async: Optional[bool] = Query(
+        None, alias="async", description=ASYNC_DESCRIPTION
+    ),
+    idempotency_key: Optional[str] = Header(
+        None,
+        alias=IDEMPOTENCY_KEY_HEADER,
+        max_length=255,
+        description=IDEMPOTENCY_DESCRIPTION,
+    ),
+    content_sha256: Optional[str] = Header(
+        None,
+        alias=CHECKSUM_HEADER,
+        pattern="^[0-9a-fA-F]{64}$",
+        description="SHA-256 (hex) the uploaded file must match",
+    ),
+):
+    """Trigger batch scraping from Excel file. Delegates to beat-books-data.
+
+    Without a body, beat-books-data scrapes the spreadsheet it already has.
+    A ``multipart/form-data`` upload is streamed to it chunk by chunk instead,
+    up to ``SCRAPE_UPLOAD_MAX_BYTES`` and checked against ``X-Content-SHA256``
+    when given; the response adds the file's size and SHA-256. Uploads run
+    while the request is open, so ``async=true`` is not supported for them.
+
+    Retrying with the same ``Idempotency-Key`` returns the first request's
+    result (or attaches to it while running) instead of starting another
+    batch scrape. Keyed uploads must send ``X-Content-SHA256``, which stands
+    in for the body when matching retries.
+    """
+    content_type = request.headers.get("content-type", "")
+    if content_type.lower().startswith("multipart/form-data"):
+        if run_async:  # only when asked for; uploads always wait
+            raise HTTPException(
+                status_code=400, detail="async is not supported for uploads."
+            )
+        if idempotency_key and not content_sha256:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Uploads with an Idempotency-Key need {CHECKSUM_HEADER}.",
+            )
+        return await idempotent(
+            request,
+            idempotency_key,
+            partial(_upload_excel, request, content_sha256),
+            body_digest=content_sha256,
+        )
 
+    async def run(job: Job) -> Any:
+        result = await data_client.post("/scrape/excel")
+        response_cache.invalidate(scrape_tags())
+        return result
 
-@router.post("/excel")
-async def scrape_excel():
-    """Trigger batch scraping from Excel file. Delegates to beat-books-data."""
-    result = await data_client.post("/scrape/excel")
-    return result
+    return await idempotent(
+        request,
+        idempotency_key,
+        partial(_submit, "excel", run, run_async is not False),
+    )
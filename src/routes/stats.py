@@ -1,14 +1,31 @@
-from typing import Optional
-from fastapi import APIRouter, Query
+from contextlib import aclosing
+from typing import Any, AsyncGenerator, AsyncIterator, Optional
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
 from src.core.client import data_client
+from src.core.config import settings
 from src.core.enums import Position
+from src.core.fanout import ordered_map
+from src.core.models import PaginationMeta
+from src.core.negotiation import allow_passthrough, passthrough_var
+from src.core.projection import FIELDS_DESCRIPTION, projected_get
+from src.core.responses import dumps
 
-router = APIRouter()
+router = APIRouter(dependencies=[Depends(allow_passthrough)])
+
+# Largest page beat-books-data serves; /players/all always asks for it.
+MAX_PAGE_LIMIT = 200
 
 
 @router.get("/teams/{team}/stats")
-async def get_team_stats(team: str, season: int = Query(..., ge=1920, le=2100)):
+async def get_team_stats(
+    team: str,
+    season: int = Query(..., ge=1920, le=2100),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+):
     """Get team statistics. Delegates to beat-books-data."""
+    if fields:
+        return await projected_get(f"/stats/teams/{team}", {"season": season}, fields)
     result = await data_client.get(f"/stats/teams/{team}", params={"season": season})
     return result
 
@@ -19,32 +36,83 @@ async def get_players(
     position: Optional[Position] = Query(None),
     page: int = Query(1, ge=1),
     limit: int = Query(50, ge=1, le=200),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
 ):
     """Get player statistics with filtering. Delegates to beat-books-data."""
     params: dict[str, int | str] = {"season": season, "page": page, "limit": limit}
     if position:
         params["position"] = position.value
 
+    if fields:
+        return await projected_get("/stats/players", params, fields)
     result = await data_client.get("/stats/players", params=params)
     return result
 
 
+async def _ndjson(
+    first: dict[str, Any], pages: AsyncGenerator[dict[str, Any], None]
+) -> AsyncIterator[bytes]:
+    async with aclosing(pages):
+        yield b"".join(dumps(r) + b"\n" for r in first.get("data") or [])
+        async for page in pages:
+            yield b"".join(dumps(r) + b"\n" for r in page.get("data") or [])
+
+
+@router.get("/players/all")
+async def get_all_players(
+    season: int = Query(..., ge=1920, le=2100),
+    position: Optional[Position] = Query(None),
+):
+    """Stream every player for a season as NDJSON, in page order.
+
+    The first page gives ``total_pages``; the rest are fetched from
+    beat-books-data concurrently (``PAGINATION_CONCURRENCY`` at a time) and
+    only as fast as the client reads.
+    """
+    # Records are re-encoded as NDJSON, so backend bytes cannot be relayed.
+    passthrough_var.set(False)
+    params: dict[str, int | str] = {"season": season, "limit": MAX_PAGE_LIMIT}
+    if position:
+        params["position"] = position.value
+
+    async def fetch_page(page: int) -> dict[str, Any]:
+        return await data_client.get("/stats/players", params={**params, "page": page})
+
+    first = await fetch_page(1)
+    pagination = first.get("pagination")
+    total_pages = (
+        PaginationMeta.model_validate(pagination).total_pages if pagination else 1
+    )
+    pages = ordered_map(
+        fetch_page, range(2, total_pages + 1), settings.PAGINATION_CONCURRENCY
+    )
+    return StreamingResponse(_ndjson(first, pages), media_type="application/x-ndjson")
+
+
 @router.get("/games")
 async def get_games(
     season: int = Query(..., ge=1920, le=2100),
     week: Optional[int] = Query(None, ge=1, le=22),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
 ):
     """Get game results. Delegates to beat-books-data."""
     params = {"season": season}
     if week is not None:
         params["week"] = week
 
+    if fields:
+        return await projected_get("/stats/games", params, fields)
     result = await data_client.get("/stats/games", params=params)
     return result
 
 
 @router.get("/standings")
-async def get_standings(season: int = Query(..., ge=1920, le=2100)):
+async def get_standings(
+    season: int = Query(..., ge=1920, le=2100),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+):
     """Get season standings. Delegates to beat-books-data."""
+    if fields:
+        return await projected_get("/stats/standings", {"season": season}, fields)
     result = await data_client.get("/stats/standings", params={"season": season})
     return result
@@ -1,3 +1,5 @@
+from unittest.mock import MagicMock
+
 import pytest
 from fastapi.testclient import TestClient
 from src.main import app
@@ -7,3 +9,69 @@ from src.main import app
 def client():
     """FastAPI test client for E2E testing."""
     return TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def reset_circuit_breakers():
+    """Start every test with closed circuits so failures don't leak between tests."""
+    from src.core.client import data_client, model_client
+
+    for breaker in (data_client.circuit_breaker, model_client.circuit_breaker):
+        breaker.record_success()
+    yield
+    for breaker in (data_client.circuit_breaker, model_client.circuit_breaker):
+        breaker.record_success()
+
+
+@pytest.fixture(autouse=True)
+def reset_rate_limits():
+    """Give every test a fresh rate-limit window so request counts don't add up."""
+    from src.core.rate_limit import limiter
+
+    limiter.reset()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def reset_upstream_pools():
+    """Drop pooled upstream clients so each test's httpx patches take effect."""
+    from src.core.client import data_client, model_client
+
+    for backend in (data_client, model_client):
+        backend.slots._client = None
+    yield
+
+
+@pytest.fixture
+def make_prediction():
+    """Factory for beat-books-model prediction payloads; override any field."""
+
+    def make(home="chiefs", away="eagles", **fields):
+        return {
+            "home_team": home,
+            "away_team": away,
+            "home_win_probability": 0.6,
+            "away_win_probability": 0.4,
+            "predicted_spread": -2.5,
+            "model_version": "v1.0",
+            "feature_version": "f1",
+            "edge_vs_market": 0.01,
+            "recommended_bet_size": 0.02,
+            "bet_recommendation": "NO_BET",
+            **fields,
+        }
+
+    return make
+
+
+@pytest.fixture
+def model_response():
+    """Wrap a body in just enough of ``httpx.Response`` for model calls."""
+
+    def wrap(body):
+        response = MagicMock()
+        response.status_code = 200
+        response.json.return_value = body
+        return response
+
+    return wrap
@@ -0,0 +1,197 @@
+"""Tests for batching distinct upstream keys."""
+
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from src.core.batching import BatchLoader
+from src.core.client import DataServiceClient
+
+
+class _Recorder:
+    def __init__(self, fail_batch=False, drop=()):
+        self.batches = []
+        self.singles = []
+        self.fail_batch = fail_batch
+        self.drop = set(drop)
+
+    async def batch(self, keys):
+        self.batches.append(list(keys))
+        if self.fail_batch:
+            raise HTTPException(status_code=404)
+        return {key: key * 10 for key in keys if key not in self.drop}
+
+    async def single(self, key):
+        self.singles.append(key)
+        if key < 0:
+            raise ValueError("bad key")
+        return key * 10
+
+
+class TestBatchLoader:
+    """Keys requested together are fetched together."""
+
+    @pytest.mark.asyncio
+    async def test_same_tick_keys_share_one_batch(self):
+        rec = _Recorder()
+        loader = BatchLoader("test", rec.batch, rec.single)
+
+        results = await asyncio.gather(*(loader.load(k) for k in (1, 2, 3, 2)))
+
+        assert results == [10, 20, 30, 20]
+        assert rec.batches == [[1, 2, 3]]
+        assert rec.singles == []
+
+    @pytest.mark.asyncio
+    async def test_lone_key_uses_single_call(self):
+        rec = _Recorder()
+        loader = BatchLoader("test", rec.batch, rec.single)
+
+        assert await loader.load(7) == 70
+        assert rec.batches == []
+        assert rec.singles == [7]
+
+    @pytest.mark.asyncio
+    async def test_window_collects_later_keys(self):
+        rec = _Recorder()
+        loader = BatchLoader("test", rec.batch, rec.single, window=0.05)
+
+        async def later(key):
+            await asyncio.sleep(0.01)
+            return await loader.load(key)
+
+        assert await asyncio.gather(loader.load(1), later(2)) == [10, 20]
+        assert rec.batches == [[1, 2]]
+
+    @pytest.mark.asyncio
+    async def test_max_batch_dispatches_early(self):
+        rec = _Recorder()
+        loader = BatchLoader("test", rec.batch, rec.single, max_batch=2)
+
+        await asyncio.gather(*(loader.load(k) for k in (1, 2, 3, 4)))
+
+        assert rec.batches == [[1, 2], [3, 4]]
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_falls_back_to_single_calls(self):
+        rec = _Recorder(fail_batch=True)
+        loader = BatchLoader("test", rec.batch, rec.single)
+
+        results = await asyncio.gather(
+            loader.load(1), loader.load(-1), return_exceptions=True
+        )
+
+        assert results[0] == 10
+        assert isinstance(results[1], ValueError)
+        assert sorted(rec.singles) == [-1, 1]
+
+    @pytest.mark.asyncio
+    async def test_missing_keys_are_fetched_individually(self):
+        rec = _Recorder(drop={2})
+        loader = BatchLoader("test", rec.batch, rec.single)
+
+        assert await asyncio.gather(loader.load(1), loader.load(2)) == [10, 20]
+        assert rec.singles == [2]
+
+    @pytest.mark.asyncio
+    async def test_running_batches_are_referenced_until_done(self):
+        release = asyncio.Event()
+
+        async def batch(keys):
+            await release.wait()
+            return {key: key for key in keys}
+
+        loader = BatchLoader("test", batch, _Recorder().single)
+        pending = asyncio.ensure_future(asyncio.gather(loader.load(1), loader.load(2)))
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert len(loader._tasks) == 1
+
+        release.set()
+        assert await pending == [1, 2]
+        assert not loader._tasks
+
+    @pytest.mark.asyncio
+    async def test_crashed_batch_fails_its_callers(self):
+        loader = BatchLoader("test", _Recorder().batch, _Recorder().single)
+
+        async def crash(batch):
+            raise RuntimeError("boom")
+
+        with patch.object(loader, "_run", crash):
+            with pytest.raises(RuntimeError, match="boom"):
+                await loader.load(1)
+        assert not loader._tasks
+
+
+def _backend(handler):
+    real_client = httpx.AsyncClient
+
+    def factory(**kwargs):
+        return real_client(transport=httpx.MockTransport(handler), **kwargs)
+
+    return patch("src.core.client.httpx.AsyncClient", side_effect=factory)
+
+
+class TestTeamStatsBatching:
+    """data_client.get merges concurrent team stats lookups."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_team_lookups_become_one_multi_get(self):
+        sent = []
+
+        def handler(request):
+            sent.append(request.url)
+            teams = request.url.params["teams"].split(",")
+            return httpx.Response(
+                200, json={team: {"data": {"team": team}} for team in teams}
+            )
+
+        with patch(
+            "src.core.client.settings.UPSTREAM_TEAM_STATS_BATCH_PATH", "/stats/teams"
+        ):
+            client = DataServiceClient()
+        with _backend(handler):
+            results = await asyncio.gather(
+                *(
+                    client.get(f"/stats/teams/{team}", params={"season": 2024})
+                    for team in ("KC", "BUF", "SF")
+                )
+            )
+
+        assert [r["data"]["team"] for r in results] == ["KC", "BUF", "SF"]
+        assert len(sent) == 1
+        assert sent[0].path == "/stats/teams"
+        assert sent[0].params["teams"] == "KC,BUF,SF"
+
+    @pytest.mark.asyncio
+    async def test_backend_without_multi_get_gets_individual_calls(self):
+        sent = []
+
+        def handler(request):
+            sent.append(request.url.path)
+            if request.url.path == "/stats/teams":
+                return httpx.Response(404, json={"error": "not found"})
+            return httpx.Response(200, json={"data": {"team": request.url.path}})
+
+        with patch(
+            "src.core.client.settings.UPSTREAM_TEAM_STATS_BATCH_PATH", "/stats/teams"
+        ):
+            client = DataServiceClient()
+        with _backend(handler):
+            results = await asyncio.gather(
+                client.get("/stats/teams/KC", params={"season": 2024}),
+                client.get("/stats/teams/BUF", params={"season": 2024}),
+            )
+
+        assert [r["data"]["team"] for r in results] == [
+            "/stats/teams/KC",
+            "/stats/teams/BUF",
+        ]
+        assert sorted(sent) == ["/stats/teams", "/stats/teams/BUF", "/stats/teams/KC"]
+
+    def test_batching_is_off_by_default(self):
+        assert DataServiceClient().team_stats_loader is None
@@ -0,0 +1,259 @@
+"""Tests for the tagged response cache and its invalidation webhook."""
+
+import asyncio
+import json
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.core.auth import sign_webhook
+from src.core.cache import TaggedCache, cache_policy, response_cache, scrape_tags
+from src.core.client import data_client
+
+SECRET = "webhook-secret"
+
+
+@pytest.fixture
+def stats_cache():
+    """Cache stats responses for the test, starting and ending empty."""
+    response_cache.clear()
+    with patch("src.core.cache.settings.CACHE_STATS_TTL", 60.0):
+        yield response_cache
+    response_cache.clear()
+
+
+class TestTaggedCache:
+    @pytest.mark.asyncio
+    async def test_hit_until_ttl_expires(self):
+        cache = TaggedCache(max_entries=10)
+        load = AsyncMock(return_value={"data": 1})
+
+        assert await cache.fetch("k", load, ttl=60) == {"data": 1}
+        assert await cache.fetch("k", load, ttl=60) == {"data": 1}
+        assert load.await_count == 1
+
+        cache.set("k", "old", ttl=0)
+        assert cache.get("k") == (False, None)
+
+    def test_invalidate_drops_only_tagged_entries(self):
+        cache = TaggedCache(max_entries=10)
+        cache.set("kc", 1, ttl=60, tags=["season:2024", "team:kc:2024"])
+        cache.set("buf", 2, ttl=60, tags=["season:2024", "team:buf:2024"])
+        cache.set("old", 3, ttl=60, tags=["season:2023"])
+
+        assert cache.invalidate(["team:kc:2024"]) == 1
+        assert cache.get("kc") == (False, None)
+        assert cache.get("buf") == (True, 2)
+
+        assert cache.invalidate(["season:2024"]) == 1
+        assert len(cache) == 1
+
+    def test_evicts_least_recently_used(self):
+        cache = TaggedCache(max_entries=2)
+        cache.set("a", 1, ttl=60)
+        cache.set("b", 2, ttl=60)
+        cache.get("a")
+        cache.set("c", 3, ttl=60)
+
+        assert cache.get("b") == (False, None)
+        assert cache.get("a") == (True, 1)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_load(self):
+        cache = TaggedCache(max_entries=10)
+        calls = 0
+
+        async def load():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return calls
+
+        results = await asyncio.gather(*(cache.fetch("k", load, 60) for _ in range(5)))
+        assert results == [1] * 5
+        assert calls == 1
+
+    @pytest.mark.asyncio
+    async def test_load_in_flight_during_invalidation_is_not_stored(self):
+        cache = TaggedCache(max_entries=10)
+        release = asyncio.Event()
+
+        async def load():
+            await release.wait()
+            return "stale"
+
+        pending = asyncio.ensure_future(cache.fetch("k", load, 60, ["season:2024"]))
+        await asyncio.sleep(0)
+        cache.invalidate(["season:2024"])
+        release.set()
+
+        assert await pending == "stale"
+        assert cache.get("k") == (False, None)
+
+        assert cache._invalidated_at == {}
+
+    @pytest.mark.asyncio
+    async def test_cancelled_leader_hands_load_to_waiters(self):
+        cache = TaggedCache(max_entries=10)
+        calls = 0
+        release = asyncio.Event()
+
+        async def load():
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                await asyncio.Event().wait()  # until cancelled
+            await release.wait()
+            return calls
+
+        leader = asyncio.ensure_future(cache.fetch("k", load, 60))
+        await asyncio.sleep(0)
+        waiters = [asyncio.ensure_future(cache.fetch("k", load, 60)) for _ in range(3)]
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await asyncio.gather(*waiters) == [2, 2, 2]
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        assert calls == 2
+        assert cache.get("k") == (True, 2)
+
+    @pytest.mark.asyncio
+    async def test_invalidations_are_kept_only_while_loads_are_in_flight(self):
+        cache = TaggedCache(max_entries=10)
+        cache.invalidate(["season:2023"])
+        assert cache._invalidated_at == {}
+
+        release = asyncio.Event()
+
+        async def load():
+            await release.wait()
+            return 1
+
+        pending = asyncio.ensure_future(cache.fetch("k", load, 60, ["season:2024"]))
+        await asyncio.sleep(0)
+        cache.invalidate(["season:2024"])
+        assert set(cache._invalidated_at) == {"season:2024"}
+        release.set()
+        await pending
+        assert cache._invalidated_at == {}
+
+
+class TestCachePolicy:
+    def test_disabled_by_default(self):
+        assert cache_policy("/stats/teams/KC", {"season": 2024}) is None
+
+    def test_tags_team_stats_and_season_summaries(self, stats_cache):
+        ttl, tags = cache_policy("/stats/teams/KC", {"season": 2024})
+        assert ttl == 60.0
+        assert tags == ["stats", "season:2024", "team:kc:2024"]
+
+        _, tags = cache_policy("/stats/standings", {"season": 2024})
+        assert "season-summary:2024" in tags
+
+    def test_reads_without_season_are_not_cached(self, stats_cache):
+        assert cache_policy("/stats/players", {"limit": 10}) is None
+
+    def test_scrape_tags(self):
+        assert scrape_tags() == ["stats"]
+        assert scrape_tags(2024) == ["season:2024"]
+        assert scrape_tags(2024, "KC") == ["team:kc:2024", "season-summary:2024"]
+
+
+class TestClientCaching:
+    @pytest.mark.asyncio
+    async def test_cacheable_reads_hit_backend_once(self, stats_cache):
+        with patch.object(
+            data_client, "_make_request", new_callable=AsyncMock
+        ) as mock_request:
+            mock_request.return_value = {"data": {"wins": 11}}
+            for _ in range(3):
+                await data_client.get("/stats/standings", params={"season": 2024})
+            stats_cache.invalidate(scrape_tags(2024))
+            await data_client.get("/stats/standings", params={"season": 2024})
+
+        assert mock_request.await_count == 2
+
+
+class TestScrapeInvalidation:
+    def test_team_scrape_evicts_that_teams_stats(self, client, stats_cache):
+        stats_cache.set("kc", 1, ttl=60, tags=["team:kc:2024"])
+        stats_cache.set("buf", 2, ttl=60, tags=["team:buf:2024"])
+        stats_cache.set("games", 3, ttl=60, tags=["season-summary:2024"])
+
+        with patch.object(data_client, "get", new_callable=AsyncMock) as mock_get:
+            mock_get.return_value = {"data": {"status": "completed"}}
+            assert client.get("/scrape/KC/2024?async=false").status_code == 200
+
+        assert stats_cache.get("kc") == (False, None)
+        assert stats_cache.get("games") == (False, None)
+        assert stats_cache.get("buf") == (True, 2)
+
+    def test_failed_scrape_keeps_entries(self, client, stats_cache):
+        from fastapi import HTTPException
+
+        stats_cache.set("kc", 1, ttl=60, tags=["team:kc:2024"])
+        with patch.object(data_client, "get", new_callable=AsyncMock) as mock_get:
+            mock_get.side_effect = HTTPException(status_code=503, detail="down")
+            assert client.get("/scrape/KC/2024?async=false").status_code == 503
+
+        assert stats_cache.get("kc") == (True, 1)
+
+
+class TestInvalidationWebhook:
+    def _post(self, client, body, timestamp=None, secret=SECRET):
+        raw = json.dumps(body).encode()
+        timestamp = str(int(time.time())) if timestamp is None else timestamp
+        headers = {
+            "Content-Type": "application/json",
+            "X-Timestamp": timestamp,
+            "X-Signature": sign_webhook(raw, timestamp, secret),
+        }
+        return client.post("/cache/invalidate", content=raw, headers=headers)
+
+    @pytest.fixture(autouse=True)
+    def webhook_secret(self):
+        with patch("src.core.auth.settings.CACHE_WEBHOOK_SECRET", SECRET):
+            yield
+
+    def test_signed_request_invalidates_tags(self, client, stats_cache):
+        stats_cache.set("kc", 1, ttl=60, tags=["team:kc:2024"])
+
+        response = self._post(client, {"tags": ["team:kc:2024"]})
+
+        assert response.status_code == 200
+        assert response.json() == {"invalidated": 1}
+        assert len(stats_cache) == 0
+
+    def test_bad_signature_rejected(self, client):
+        response = self._post(client, {"tags": ["stats"]}, secret="wrong")
+        assert response.status_code == 401
+        assert response.json()["detail"]["error"]["code"] == "INVALID_SIGNATURE"
+
+    def test_non_ascii_signature_rejected(self, client):
+        headers = {
+            "X-Timestamp": str(int(time.time())),
+            "X-Signature": "sha256=\u00e9".encode("latin-1"),
+        }
+        response = client.post(
+            "/cache/invalidate", json={"tags": ["stats"]}, headers=headers
+        )
+        assert response.status_code == 401
+
+    def test_stale_timestamp_rejected(self, client):
+        stale = str(int(time.time()) - 3600)
+        assert self._post(client, {"tags": ["stats"]}, stale).status_code == 401
+
+    def test_missing_headers_rejected(self, client):
+        response = client.post("/cache/invalidate", json={"tags": ["stats"]})
+        assert response.status_code == 401
+
+    def test_empty_tags_rejected(self, client):
+        assert self._post(client, {"tags": []}).status_code == 422
+
+    def test_disabled_without_secret(self, client):
+        with patch("src.core.auth.settings.CACHE_WEBHOOK_SECRET", ""):
+            assert self._post(client, {"tags": ["stats"]}).status_code == 404
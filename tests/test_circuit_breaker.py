@@ -103,7 +103,7 @@ class TestCircuitBreakerIntegration:
         data_client.circuit_breaker.record_failure()
 
         try:
-            response = client.get("/scrape/2024")
+            response = client.get("/scrape/2024?async=false")
             assert response.status_code == 503
             assert "CIRCUIT_OPEN" in response.json()["detail"]["error"]["code"]
         finally:
@@ -0,0 +1,296 @@
+"""Tests for response compression."""
+
+import gzip
+import json
+from dataclasses import replace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from src.core.cache import TaggedCache
+from src.core.compression import (
+    BROTLI,
+    GZIP,
+    ZSTD,
+    CompressionMiddleware,
+    benchmark,
+    codecs,
+    negotiate_encoding,
+)
+from src.core.responses import adapter_for
+
+GAMES = {"data": [{"game_id": i, "home": "KC", "away": "BUF"} for i in range(200)]}
+
+
+def _app(cache):
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=100, cache=cache)
+
+    async def load():
+        return GAMES
+
+    @app.get("/games")
+    async def games():
+        return await cache.fetch("games", load, 60, ["games"])
+
+    @app.get("/uncached")
+    async def uncached():
+        return GAMES
+
+    @app.get("/tiny")
+    async def tiny():
+        return {"ok": True}
+
+    @app.get("/text")
+    async def text():
+        return PlainTextResponse("x" * 1000, media_type="image/png")
+
+    @app.get("/stream")
+    async def stream():
+        async def lines():
+            for game in GAMES["data"]:
+                yield json.dumps(game) + "\n"
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    return TestClient(app)
+
+
+def _fail(body):
+    raise AssertionError("body compressed twice")
+
+
+class TestNegotiateEncoding:
+    """Accept-Encoding parsing."""
+
+    @pytest.mark.parametrize(
+        "accept,expected",
+        [
+            (None, None),
+            ("identity", None),
+            ("gzip", GZIP),
+            ("gzip, br", BROTLI),
+            ("gzip, br, zstd", ZSTD),
+            ("gzip;q=1.0, zstd;q=0.5", GZIP),
+            ("zstd;q=0, *", BROTLI),
+            ("deflate", None),
+        ],
+    )
+    def test_negotiate(self, accept, expected):
+        assert negotiate_encoding(accept) == expected
+
+
+class TestCompressionMiddleware:
+    """Bodies above the threshold are compressed in the preferred encoding."""
+
+    @pytest.mark.parametrize("encoding", [GZIP, BROTLI, ZSTD])
+    def test_compresses_json(self, encoding):
+        client = _app(TaggedCache(10))
+        response = client.get("/games", headers={"Accept-Encoding": encoding})
+
+        assert response.headers["content-encoding"] == encoding
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert int(response.headers["content-length"]) < len(json.dumps(GAMES))
+        assert response.json() == GAMES
+
+    def test_small_bodies_are_not_compressed(self):
+        client = _app(TaggedCache(10))
+        response = client.get("/tiny", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+
+    def test_incompressible_types_are_skipped(self):
+        client = _app(TaggedCache(10))
+        response = client.get("/text", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+
+    @pytest.mark.parametrize("encoding", [GZIP, BROTLI, ZSTD])
+    def test_reuses_variant_stored_with_cache_entry(self, encoding):
+        cache = TaggedCache(10)
+        client = _app(cache)
+        client.get("/games", headers={"Accept-Encoding": encoding})
+        (entry,) = cache._entries.values()
+        assert [key[1] for key in entry.variants] == [encoding]
+        assert cache.variant_bytes == len(next(iter(entry.variants.values())))
+
+        failing = replace(codecs[encoding], compress=_fail)
+        with patch.dict(codecs, {encoding: failing}):
+            response = client.get("/games", headers={"Accept-Encoding": encoding})
+        assert response.json() == GAMES
+
+    def test_invalidating_entry_drops_its_variants(self):
+        cache = TaggedCache(10)
+        client = _app(cache)
+        client.get("/games", headers={"Accept-Encoding": "gzip"})
+        cache.invalidate(["games"])
+        assert cache.variant_bytes == 0
+
+        compress = MagicMock(wraps=codecs[GZIP].compress)
+        with patch.dict(codecs, {GZIP: replace(codecs[GZIP], compress=compress)}):
+            response = client.get("/games", headers={"Accept-Encoding": "gzip"})
+        assert response.json() == GAMES
+        compress.assert_called_once()
+
+    def test_uncached_bodies_are_not_hashed(self):
+        client = _app(TaggedCache(10))
+        with patch("src.core.compression.hashlib.blake2b", side_effect=AssertionError):
+            response = client.get("/uncached", headers={"Accept-Encoding": "gzip"})
+        assert response.json() == GAMES
+
+    @pytest.mark.parametrize("encoding", [GZIP, BROTLI, ZSTD])
+    def test_streams_are_compressed_incrementally(self, encoding):
+        client = _app(TaggedCache(10))
+        response = client.get("/stream", headers={"Accept-Encoding": encoding})
+
+        assert response.headers["content-encoding"] == encoding
+        assert "content-length" not in response.headers
+        lines = response.text.splitlines()
+        assert len(lines) == len(GAMES["data"])
+
+    def test_gateway_routes_are_compressed(self, client):
+        with patch(
+            "src.routes.stats.data_client.get", new_callable=AsyncMock
+        ) as mock_get:
+            mock_get.return_value = GAMES
+            response = client.get(
+                "/games?season=2024", headers={"Accept-Encoding": "gzip"}
+            )
+
+        assert response.headers["content-encoding"] == GZIP
+        assert response.json() == GAMES
+
+
+def _backend(handler):
+    real_client = httpx.AsyncClient
+
+    def factory(**kwargs):
+        return real_client(transport=httpx.MockTransport(handler), **kwargs)
+
+    return patch("src.core.client.httpx.AsyncClient", side_effect=factory)
+
+
+class _WireStream(httpx.AsyncByteStream):
+    """Response body as it arrives off the network (not pre-read by httpx)."""
+
+    def __init__(self, body):
+        self.body = body
+
+    async def __aiter__(self):
+        yield self.body
+
+
+def _gzipped_response(payload, **headers):
+    return httpx.Response(
+        200,
+        headers={"content-encoding": "gzip", **headers},
+        stream=_WireStream(gzip.compress(json.dumps(payload).encode())),
+    )
+
+
+def _encoded(encoding):
+    def handler(request):
+        body = codecs[encoding].compress(json.dumps(GAMES).encode())
+        return httpx.Response(
+            200,
+            headers={"content-encoding": encoding, "content-type": "application/json"},
+            stream=_WireStream(body),
+        )
+
+    return handler
+
+
+def _gzipped(request):
+    return _gzipped_response(GAMES, **{"content-type": "application/json"})
+
+
+class TestCompressedUpstream:
+    """Backend bodies are requested compressed and forwarded without inflating."""
+
+    def test_requests_compressed_transport(self, client):
+        sent = []
+
+        def handler(request):
+            sent.append(request)
+            return _gzipped(request)
+
+        with _backend(handler):
+            client.get("/games?season=2024")
+
+        assert sent[0].headers["Accept-Encoding"] == "zstd, br, gzip"
+
+    def test_forwards_compressed_body(self, client):
+        with _backend(_gzipped), patch.object(
+            httpx.Response, "json", side_effect=AssertionError("inflated")
+        ):
+            response = client.get(
+                "/games?season=2024", headers={"Accept-Encoding": "gzip"}
+            )
+
+        assert response.headers["content-encoding"] == GZIP
+        assert response.json() == GAMES
+
+    @pytest.mark.parametrize("encoding", [ZSTD, BROTLI])
+    def test_forwards_zstd_and_brotli_bodies(self, client, encoding):
+        with _backend(_encoded(encoding)), patch.object(
+            httpx.Response, "json", side_effect=AssertionError("inflated")
+        ):
+            response = client.get(
+                "/games?season=2024", headers={"Accept-Encoding": encoding}
+            )
+
+        assert response.headers["content-encoding"] == encoding
+        assert response.json() == GAMES
+
+    def test_inflates_when_client_lacks_encoding(self, client):
+        with _backend(_gzipped):
+            response = client.get(
+                "/games?season=2024", headers={"Accept-Encoding": "identity"}
+            )
+
+        assert "content-encoding" not in response.headers
+        assert response.json() == GAMES
+
+    def test_validated_routes_are_not_forwarded(self, client):
+        odds = {"data": []}
+
+        def handler(request):
+            return _gzipped_response(odds, **{"content-type": "application/json"})
+
+        with _backend(handler), patch(
+            "src.core.responses.adapter_for", wraps=adapter_for
+        ) as adapter:
+            response = client.get("/odds/live", headers={"Accept-Encoding": "gzip"})
+
+        assert response.json() == odds
+        adapter.assert_called_once()
+
+
+class TestCompressedVariants:
+    """Variants live on cache entries within a shared byte budget."""
+
+    def test_budget_and_eviction(self):
+        cache = TaggedCache(max_entries=1, max_variant_bytes=10)
+        cache.set("a", 1, 60)
+        entry = cache._entries["a"]
+        cache.add_variant(entry, b"a", GZIP, b"12345")
+        cache.add_variant(entry, b"a", BROTLI, b"123456")
+
+        assert cache.variant(entry, b"a", GZIP) == b"12345"
+        assert cache.variant(entry, b"a", BROTLI) is None
+        assert cache.variant_bytes == 5
+
+        cache.set("b", 2, 60)
+        assert cache.variant_bytes == 0
+        cache.add_variant(entry, b"a", GZIP, b"12345")
+        assert cache.variant_bytes == 0
+
+
+def test_benchmark_reports_each_level():
+    body = json.dumps(GAMES).encode()
+    rows = benchmark(body, rounds=1)
+    assert {row["encoding"] for row in rows} == {GZIP, BROTLI, ZSTD}
+    gzip_row = next(r for r in rows if r["encoding"] == GZIP)
+    assert gzip_row["ratio"] > 1
@@ -0,0 +1,114 @@
+"""Tests for the bounded fan-out helpers."""
+
+import asyncio
+
+import pytest
+
+from src.core.fanout import ordered_map, unordered_map
+
+
+class TestOrderedMap:
+    """ordered_map preserves order and bounds concurrency."""
+
+    @pytest.mark.asyncio
+    async def test_yields_in_input_order(self):
+        async def slow_echo(n):
+            await asyncio.sleep(0.001 * (5 - n))
+            return n
+
+        results = [r async for r in ordered_map(slow_echo, range(5), limit=3)]
+        assert results == [0, 1, 2, 3, 4]
+
+    @pytest.mark.asyncio
+    async def test_bounds_in_flight_calls(self):
+        in_flight = peak = 0
+
+        async def work(n):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+            return n
+
+        async for _ in ordered_map(work, range(20), limit=4):
+            pass
+        assert peak <= 4
+
+    @pytest.mark.asyncio
+    async def test_failure_cancels_outstanding_calls(self):
+        cancelled = []
+
+        async def work(n):
+            if n == 0:
+                raise ValueError("boom")
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.append(n)
+                raise
+
+        with pytest.raises(ValueError):
+            async for _ in ordered_map(work, range(4), limit=4):
+                pass
+        assert sorted(cancelled) == [1, 2, 3]
+
+
+async def _stream(items):
+    for item in items:
+        yield item
+
+
+class TestUnorderedMap:
+    """unordered_map yields in completion order and reads input lazily."""
+
+    @pytest.mark.asyncio
+    async def test_yields_in_completion_order(self):
+        gates = [asyncio.Event() for _ in range(3)]
+
+        async def gated(n):
+            await gates[n].wait()
+            return n
+
+        results = unordered_map(gated, _stream(range(3)), limit=3)
+        order = []
+        for n in (2, 0, 1):
+            gates[n].set()
+            order.append(await anext(results))
+        assert order == [2, 0, 1]
+        await results.aclose()
+
+    @pytest.mark.asyncio
+    async def test_reads_input_only_as_calls_finish(self):
+        read = []
+
+        async def source():
+            for n in range(100):
+                read.append(n)
+                yield n
+
+        async def echo(n):
+            return n
+
+        results = unordered_map(echo, source(), limit=4)
+        assert await anext(results) in range(4)
+        assert len(read) == 4
+        await results.aclose()
+
+    @pytest.mark.asyncio
+    async def test_failure_cancels_outstanding_calls(self):
+        cancelled = []
+
+        async def work(n):
+            if n == 0:
+                raise ValueError("boom")
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.append(n)
+                raise
+
+        with pytest.raises(ValueError):
+            async for _ in unordered_map(work, _stream(range(4)), limit=4):
+                pass
+        assert sorted(cancelled) == [1, 2, 3]
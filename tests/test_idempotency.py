@@ -0,0 +1,141 @@
+"""Tests for Idempotency-Key handling on POST routes."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import HTTPException
+
+from src.core.idempotency import IdempotencyStore, idempotency_store
+
+
+@pytest.fixture(autouse=True)
+def empty_store():
+    idempotency_store.clear()
+    yield
+    idempotency_store.clear()
+
+
+class TestIdempotencyStore:
+    @pytest.mark.asyncio
+    async def test_repeated_key_replays_result(self):
+        store = IdempotencyStore(ttl=60, max_entries=10)
+        call = AsyncMock(return_value={"rows": 1})
+
+        assert await store.run("k", "fp", call) == ({"rows": 1}, False)
+        assert await store.run("k", "fp", call) == ({"rows": 1}, True)
+        assert call.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_in_flight_duplicates_attach(self):
+        store = IdempotencyStore(ttl=60, max_entries=10)
+        release = asyncio.Event()
+        calls = 0
+
+        async def call():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return "done"
+
+        first = asyncio.ensure_future(store.run("k", "fp", call))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(store.run("k", "fp", call))
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await first == ("done", False)
+        assert await second == ("done", True)
+        assert calls == 1
+
+    @pytest.mark.asyncio
+    async def test_key_reused_for_other_request_rejected(self):
+        store = IdempotencyStore(ttl=60, max_entries=10)
+        await store.run("k", "fp", AsyncMock(return_value=1))
+
+        with pytest.raises(HTTPException) as exc:
+            await store.run("k", "other", AsyncMock())
+        assert exc.value.status_code == 422
+
+    @pytest.mark.asyncio
+    async def test_server_errors_are_not_remembered(self):
+        store = IdempotencyStore(ttl=60, max_entries=10)
+        failing = AsyncMock(side_effect=HTTPException(status_code=503))
+        with pytest.raises(HTTPException):
+            await store.run("k", "fp", failing)
+
+        assert await store.run("k", "fp", AsyncMock(return_value=1)) == (1, False)
+
+    @pytest.mark.asyncio
+    async def test_client_errors_are_replayed(self):
+        store = IdempotencyStore(ttl=60, max_entries=10)
+        failing = AsyncMock(side_effect=HTTPException(status_code=404))
+        for _ in range(2):
+            with pytest.raises(HTTPException):
+                await store.run("k", "fp", failing)
+        assert failing.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_results_expire(self):
+        store = IdempotencyStore(ttl=0, max_entries=10)
+        call = AsyncMock(return_value=1)
+        await store.run("k", "fp", call)
+        await store.run("k", "fp", call)
+        assert call.await_count == 2
+
+
+class TestIdempotentRoutes:
+    def test_excel_scrape_runs_once_per_key(self, client):
+        headers = {"Idempotency-Key": "excel-1"}
+        with patch(
+            "src.routes.scrape.data_client.post", new_callable=AsyncMock
+        ) as mock_post:
+            mock_post.return_value = {"data": {"rows_processed": 100}}
+            first = client.post("/scrape/excel?async=false", headers=headers)
+            second = client.post("/scrape/excel?async=false", headers=headers)
+            other = client.post(
+                "/scrape/excel?async=false", headers={"Idempotency-Key": "2"}
+            )
+
+        assert first.json() == second.json() == {"data": {"rows_processed": 100}}
+        assert "idempotent-replayed" not in first.headers
+        assert second.headers["idempotent-replayed"] == "true"
+        assert other.status_code == 200
+        assert mock_post.await_count == 2
+
+    def test_async_excel_replay_returns_same_job(self, client):
+        headers = {"Idempotency-Key": "excel-async"}
+        with patch(
+            "src.routes.scrape.data_client.post", new_callable=AsyncMock
+        ) as mock_post:
+            mock_post.return_value = {"data": {}}
+            first = client.post("/scrape/excel", headers=headers)
+            second = client.post("/scrape/excel", headers=headers)
+
+        assert first.status_code == second.status_code == 202
+        assert second.json()["job_id"] == first.json()["job_id"]
+        assert second.headers["location"] == first.headers["location"]
+
+    def test_without_key_every_request_runs(self, client):
+        with patch(
+            "src.routes.scrape.data_client.post", new_callable=AsyncMock
+        ) as mock_post:
+            mock_post.return_value = {"data": {}}
+            client.post("/scrape/excel?async=false")
+            client.post("/scrape/excel?async=false")
+        assert mock_post.await_count == 2
+
+    def test_batch_prediction_key_reused_with_other_body(self, client):
+        headers = {"Idempotency-Key": "batch-1"}
+        empty = client.post("/predictions/batch", json={"games": []}, headers=headers)
+        replay = client.post("/predictions/batch", json={"games": []}, headers=headers)
+        reused = client.post(
+            "/predictions/batch",
+            json={"games": [{"team1": "chiefs", "team2": "bills"}]},
+            headers=headers,
+        )
+
+        assert empty.status_code == replay.status_code == 200
+        assert replay.headers["idempotent-replayed"] == "true"
+        assert reused.status_code == 422
+        assert reused.json()["detail"]["error"]["code"] == "IDEMPOTENCY_KEY_REUSED"
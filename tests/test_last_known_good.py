@@ -0,0 +1,188 @@
+"""Tests for degraded mode: the model circuit and last-known-good predictions."""
+
+import asyncio
+import threading
+import time
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from src.core.circuit_breaker import CircuitState
+from src.core.client import CircuitOpenError, model_client
+from src.core.last_known_good import LastKnownGoodStore
+
+
+@pytest.fixture
+def prediction(make_prediction):
+    return make_prediction("chiefs", "eagles")
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = LastKnownGoodStore(str(tmp_path / "lkg.sqlite3"), max_age=3600)
+    with patch("src.routes.predictions.last_known_good", store):
+        yield store
+    store.close()
+
+
+async def _save(store, home, away, data):
+    store.put(home, away, data)
+    await store.flush()
+
+
+def _wait_for_writes(store):
+    """Let background writes started on the test client's loop finish."""
+    deadline = time.monotonic() + 5
+    while store._writes and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+class TestLastKnownGoodStore:
+    @pytest.mark.asyncio
+    async def test_latest_prediction_per_matchup(self, store, prediction):
+        await _save(store, "chiefs", "eagles", {**prediction, "model_version": "v0.9"})
+        await _save(store, "chiefs", "eagles", prediction)
+
+        stored = await store.get("chiefs", "eagles")
+        assert stored is not None
+        assert stored.data == prediction
+        assert stored.age < 5
+        assert await store.get("eagles", "chiefs") is None
+
+    @pytest.mark.asyncio
+    async def test_pending_write_blocks_neither_caller_nor_reads(
+        self, store, prediction
+    ):
+        await _save(store, "chiefs", "eagles", {**prediction, "model_version": "v0.9"})
+        release = threading.Event()
+        write = store._write
+
+        def slow_write(row):
+            with store._write_lock:
+                release.wait(5)
+            write(row)
+
+        with patch.object(store, "_write", slow_write):
+            store.put("chiefs", "eagles", prediction)
+            stored = await store.get("chiefs", "eagles")
+            assert stored.data["model_version"] == "v0.9"
+            release.set()
+            await store.flush()
+        assert (await store.get("chiefs", "eagles")).data == prediction
+
+    @pytest.mark.asyncio
+    async def test_survives_reopening(self, store, prediction):
+        await _save(store, "chiefs", "eagles", prediction)
+        store.close()
+
+        reopened = LastKnownGoodStore(store.path, max_age=0)
+        assert (await reopened.get("chiefs", "eagles")).data == prediction
+        reopened.close()
+
+    @pytest.mark.asyncio
+    async def test_expired_predictions_are_not_served(self, store, prediction):
+        with patch("src.core.last_known_good.time.time", return_value=1000.0):
+            store.put("chiefs", "eagles", prediction)
+        await store.flush()
+        assert await store.get("chiefs", "eagles") is None
+
+    @pytest.mark.asyncio
+    async def test_disabled_without_path(self, prediction):
+        store = LastKnownGoodStore("", max_age=0)
+        await _save(store, "chiefs", "eagles", prediction)
+        assert await store.get("chiefs", "eagles") is None
+
+
+class TestModelCircuit:
+    @pytest.mark.asyncio
+    async def test_opens_after_failures_and_fails_fast(self):
+        breaker = model_client.circuit_breaker
+        with patch(
+            "httpx.AsyncClient.get", side_effect=httpx.ConnectError("refused")
+        ) as mock_get:
+            for _ in range(breaker.failure_threshold):
+                with pytest.raises(httpx.ConnectError):
+                    await model_client.get("/predict")
+            assert breaker.state == CircuitState.OPEN
+
+            with pytest.raises(CircuitOpenError):
+                await model_client.get("/predict")
+        assert mock_get.await_count == breaker.failure_threshold
+
+    @pytest.mark.asyncio
+    async def test_client_errors_do_not_count(self):
+        response = httpx.Response(404, request=httpx.Request("GET", "http://m"))
+        with patch("httpx.AsyncClient.get", AsyncMock(return_value=response)):
+            for _ in range(model_client.circuit_breaker.failure_threshold):
+                with pytest.raises(httpx.HTTPStatusError):
+                    await model_client.get("/predict")
+        assert model_client.circuit_breaker.state == CircuitState.CLOSED
+
+
+class TestDegradedPredictions:
+    @patch("httpx.AsyncClient.get")
+    def test_predict_serves_last_known_good_while_model_is_down(
+        self, mock_get, store, client, prediction, model_response
+    ):
+        mock_get.return_value = model_response(prediction)
+        live = client.get("/predictions/predict?team1=chiefs&team2=eagles")
+        assert live.status_code == 200
+        assert "degraded" not in live.json()
+        _wait_for_writes(store)
+
+        for _ in range(model_client.circuit_breaker.failure_threshold):
+            model_client.circuit_breaker.record_failure()
+        response = client.get("/predictions/predict?team1=chiefs&team2=eagles")
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["degraded"] is True
+        assert body["age_seconds"] >= 0
+        assert body["predicted_spread"] == prediction["predicted_spread"]
+        assert response.headers["X-Degraded"] == "true"
+        assert int(response.headers["Age"]) >= 0
+        assert response.headers["X-Model-Version"] == "v1.0"
+        assert mock_get.await_count == 1
+
+    @patch("httpx.AsyncClient.get")
+    def test_predict_without_stored_prediction_still_fails(
+        self, mock_get, store, client
+    ):
+        mock_get.side_effect = httpx.ConnectError("refused")
+        response = client.get("/predictions/predict?team1=chiefs&team2=eagles")
+        assert response.status_code == 503
+
+    @patch("httpx.AsyncClient.get")
+    def test_client_errors_are_not_degraded(self, mock_get, store, client, prediction):
+        asyncio.run(_save(store, "chiefs", "eagles", prediction))
+        request = httpx.Request("GET", "http://model/predict")
+        mock_get.return_value = httpx.Response(422, text="bad", request=request)
+
+        response = client.get("/predictions/predict?team1=chiefs&team2=eagles")
+        assert response.status_code == 422
+
+    @patch("httpx.AsyncClient.get")
+    def test_batch_marks_degraded_items(self, mock_get, store, client, prediction):
+        asyncio.run(_save(store, "chiefs", "eagles", prediction))
+        mock_get.side_effect = httpx.ReadTimeout("slow")
+
+        response = client.post(
+            "/predictions/batch",
+            json={
+                "games": [
+                    {"team1": "chiefs", "team2": "eagles"},
+                    {"team1": "ravens", "team2": "steelers"},
+                ]
+            },
+        )
+
+        data = response.json()
+        assert data["succeeded"] == 1
+        assert data["failed"] == 1
+        first, second = data["results"]
+        assert first["degraded"] is True
+        assert first["age_seconds"] >= 0
+        assert first["prediction"]["home_team"] == "chiefs"
+        assert second["degraded"] is False
+        assert second["error"]["error"] == "Model service timeout"
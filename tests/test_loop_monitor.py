@@ -0,0 +1,101 @@
+"""Tests for the event loop lag monitor and load shedding."""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.core.loop_monitor import (
+    LoopLagMonitor,
+    Priority,
+    classify,
+    loop_monitor,
+    should_shed,
+)
+
+
+class TestLoopLagMonitor:
+    """Validate lag sampling and percentiles."""
+
+    @pytest.mark.asyncio
+    async def test_detects_blocked_loop(self):
+        monitor = LoopLagMonitor(interval=0.01, window=100)
+        monitor.start()
+        try:
+            await asyncio.sleep(0.02)
+            time.sleep(0.1)  # block the loop
+            await asyncio.sleep(0.03)
+        finally:
+            await monitor.stop()
+        assert max(monitor.samples) >= 0.05
+
+    def test_percentiles(self):
+        monitor = LoopLagMonitor(interval=0.1, window=100)
+        for i in range(100):
+            monitor.record(i / 1000)
+        p = monitor.percentiles()
+        assert p[0.5] == pytest.approx(0.05)
+        assert p[0.99] == pytest.approx(0.099)
+
+    def test_current_lag_uses_recent_samples(self):
+        monitor = LoopLagMonitor(interval=0.1, window=100)
+        monitor.record(2.0)
+        for _ in range(10):
+            monitor.record(0.001)
+        assert monitor.current_lag() == pytest.approx(0.001)
+
+
+class TestAdmissionPolicy:
+    """Validate path priorities and shedding tiers."""
+
+    def test_classification(self):
+        assert classify("/") == Priority.CRITICAL
+        assert classify("/predictions/predict") == Priority.CRITICAL
+        assert classify("/debug/tasks") == Priority.CRITICAL
+        assert classify("/scrape/2024") == Priority.LOW
+        assert classify("/predictions/batch") == Priority.LOW
+        assert classify("/standings") == Priority.NORMAL
+
+    def test_low_priority_shed_first(self):
+        assert should_shed(Priority.LOW, 0.3, threshold=0.25)
+        assert not should_shed(Priority.NORMAL, 0.3, threshold=0.25)
+        assert should_shed(Priority.NORMAL, 0.6, threshold=0.25)
+        assert not should_shed(Priority.CRITICAL, 10.0, threshold=0.25)
+
+    def test_zero_threshold_disables_shedding(self):
+        assert not should_shed(Priority.LOW, 10.0, threshold=0)
+
+
+class TestLoadSheddingMiddleware:
+    """Validate 503 + Retry-After responses under lag."""
+
+    def test_sheds_scrapes_when_lagging(self, client):
+        with patch.object(loop_monitor, "current_lag", return_value=0.4):
+            response = client.get("/scrape/2024")
+        assert response.status_code == 503
+        assert response.json()["error"]["code"] == "OVERLOADED"
+        assert int(response.headers["Retry-After"]) >= 1
+
+    def test_keeps_serving_health_and_predict(self, client):
+        with patch.object(loop_monitor, "current_lag", return_value=5.0), patch(
+            "src.routes.predictions.model_client.get", new_callable=AsyncMock
+        ) as mock_get:
+            mock_get.side_effect = Exception("unreachable")
+            assert client.get("/").status_code == 200
+            response = client.get("/predictions/predict?team1=chiefs&team2=bad")
+        assert response.status_code == 400
+
+    def test_normal_routes_served_below_double_threshold(self, client):
+        with patch.object(loop_monitor, "current_lag", return_value=0.3), patch(
+            "src.routes.stats.data_client.get", new_callable=AsyncMock
+        ) as mock_get:
+            mock_get.return_value = {"data": []}
+            response = client.get("/standings?season=2024")
+        assert response.status_code == 200
+
+    def test_lag_metrics_exported(self, client):
+        loop_monitor.record(0.002)
+        body = client.get("/metrics").text
+        assert "event_loop_lag_seconds_bucket" in body
+        assert 'event_loop_lag_quantile_seconds{quantile="0.99"}' in body
@@ -0,0 +1,181 @@
+"""Tests for the precomputed matchup matrix."""
+
+import asyncio
+import io
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import numpy as np
+import pytest
+
+from src.core.matchups import FIELDS, TEAMS, MatchupMatrixBuilder, matchup_matrix
+from src.core.model_versions import ModelVersion, model_versions, prediction_cache
+
+V1 = ModelVersion("v1.0", "f1")
+
+
+@pytest.fixture
+def prediction(make_prediction):
+    """Payloads that recommend a bet only for the chiefs at home."""
+
+    def make(home, away, **fields):
+        bet = "BET" if home == "chiefs" else "NO_BET"
+        return make_prediction(home, away, bet_recommendation=bet, **fields)
+
+    return make
+
+
+@pytest.fixture
+def built(prediction, model_response):
+    """A fresh builder whose model calls are answered by a fake model."""
+
+    async def fake_predict(endpoint, params=None):
+        home, away = params["team1"], params["team2"]
+        if (home, away) == ("jets", "bills"):
+            raise httpx.ConnectError("refused")
+        if (home, away) == ("jets", "dolphins"):
+            return model_response(prediction(home, away, model_version="v0.9"))
+        return model_response(prediction(home, away))
+
+    builder = MatchupMatrixBuilder()
+    with patch("src.core.matchups.model_client.get", side_effect=fake_predict):
+        yield builder
+
+
+class TestMatrixBuild:
+    @pytest.mark.asyncio
+    async def test_every_matchup_predicted_per_call(self, built, prediction):
+        matrix = await built.build(V1)
+
+        assert matrix.values.shape == (32, 32, len(FIELDS))
+        assert matrix.coverage == 32 * 31 - 2
+        assert matrix.lookup("chiefs", "eagles") == prediction("chiefs", "eagles")
+        assert matrix.lookup("eagles", "chiefs")["bet_recommendation"] == "NO_BET"
+        assert matrix.lookup("jets", "bills") is None  # call failed
+        assert matrix.lookup("jets", "dolphins") is None  # other model version
+        assert matrix.lookup("chiefs", "chiefs") is None
+        assert not matrix.values.flags.writeable
+
+    @pytest.mark.asyncio
+    async def test_bulk_row_endpoint(self, prediction, model_response):
+        builder = MatchupMatrixBuilder()
+        calls = []
+
+        async def bulk(endpoint, params=None):
+            calls.append(endpoint)
+            home = params["team1"]
+            return model_response(
+                {
+                    away.upper(): prediction(home, away)
+                    for away in params["team2"].split(",")
+                }
+            )
+
+        with (
+            patch("src.core.matchups.model_client.get", side_effect=bulk),
+            patch("src.core.matchups.settings.MODEL_MATRIX_ROW_PATH", "/predict/row"),
+        ):
+            matrix = await builder.build(V1)
+
+        assert calls == ["/predict/row"] * 32
+        assert matrix.coverage == 32 * 31
+
+    @pytest.mark.asyncio
+    async def test_rebuilds_on_version_change_and_swaps_whole_matrix(self, built):
+        with patch("src.core.matchups.settings.MODEL_MATRIX_PRECOMPUTE", True):
+            built.on_version_change(V1)
+            await built._task
+            first = built.current
+
+            built.on_version_change(ModelVersion("v2.0", "f1"))
+            assert built.current is first  # old matrix served until the new one is done
+            await built._task
+
+        assert first.version == V1
+        assert built.current.version == ModelVersion("v2.0", "f1")
+        assert built.current.coverage == 0  # fake model still answers v1.0
+        assert built.lookup("chiefs", "eagles", V1) is None
+
+    def test_disabled_by_default(self, built):
+        built.on_version_change(V1)
+        assert built._task is None
+
+
+class TestMatrixRoutes:
+    @pytest.fixture(autouse=True)
+    def active_matrix(self, built):
+        model_versions.active = V1
+        matchup_matrix.current = asyncio.run(built.build(V1))
+        yield
+        matchup_matrix.current = None
+        model_versions.active = None
+
+    def test_predict_served_from_matrix(self, client, prediction):
+        with patch(
+            "src.routes.predictions.model_client.get", new_callable=AsyncMock
+        ) as mock_predict:
+            response = client.get("/predictions/predict?team1=chiefs&team2=eagles")
+
+        mock_predict.assert_not_called()
+        assert response.json() == prediction("chiefs", "eagles")
+        assert response.headers["x-model-version"] == "v1.0"
+
+    def test_missing_matchup_falls_back_to_model(
+        self, client, prediction, model_response
+    ):
+        with patch(
+            "src.routes.predictions.model_client.get", new_callable=AsyncMock
+        ) as mock_predict:
+            mock_predict.return_value = model_response(prediction("jets", "bills"))
+            response = client.get("/predictions/predict?team1=jets&team2=bills")
+
+        mock_predict.assert_awaited_once()
+        assert response.status_code == 200
+
+    def test_unknown_team_names_fall_back_to_model(
+        self, client, prediction, model_response
+    ):
+        games = [
+            {"home_team": "chiefs", "away_team": "eagles"},
+            {"home_team": "KC", "away_team": "PHI"},
+        ]
+        with (
+            patch(
+                "src.routes.predictions.data_client.get",
+                AsyncMock(return_value={"data": {"games": games}}),
+            ),
+            patch(
+                "src.routes.predictions.model_client.get", new_callable=AsyncMock
+            ) as mock_predict,
+        ):
+            mock_predict.return_value = model_response(prediction("KC", "PHI"))
+            response = client.get("/predictions/week/2024/1")
+        prediction_cache.clear()
+
+        assert response.status_code == 200
+        assert response.json()["succeeded"] == 2
+        mock_predict.assert_awaited_once_with(
+            "/predict", params={"team1": "KC", "team2": "PHI"}
+        )
+
+    def test_matrix_as_json(self, client):
+        body = client.get("/predictions/matrix").json()
+
+        assert body["teams"] == list(TEAMS)
+        assert body["fields"] == list(FIELDS)
+        chiefs, eagles = TEAMS.index("chiefs"), TEAMS.index("eagles")
+        assert body["values"][chiefs][eagles] == [0.6, 0.4, -2.5, 0.01, 0.02, 1.0]
+        assert body["values"][chiefs][chiefs] == [None] * len(FIELDS)
+
+    def test_matrix_as_npy(self, client):
+        response = client.get("/predictions/matrix?format=npy")
+
+        assert response.headers["content-type"] == "application/x-npy"
+        assert response.headers["x-matrix-teams"].split(",") == list(TEAMS)
+        values = np.load(io.BytesIO(response.content), allow_pickle=False)
+        assert values.shape == (32, 32, len(FIELDS))
+        assert values[TEAMS.index("chiefs"), TEAMS.index("eagles"), 0] == 0.6
+
+    def test_matrix_unavailable_for_other_version(self, client):
+        model_versions.active = ModelVersion("v2.0", "f1")
+        assert client.get("/predictions/matrix").status_code == 503
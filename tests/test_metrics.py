@@ -1,39 +1,173 @@
-"""Tests for Prometheus metrics endpoint (issue #26)."""
-
-
-class TestMetricsEndpoint:
-    """Validate the /metrics endpoint."""
-
-    def test_metrics_returns_200(self, client):
-        response = client.get("/metrics")
-        assert response.status_code == 200
-
-    def test_metrics_returns_prometheus_format(self, client):
-        response = client.get("/metrics")
-        content_type = response.headers.get("content-type", "")
-        assert "text/plain" in content_type or "text/plain" in response.text[:100]
-
-    def test_metrics_contains_request_count(self, client):
-        # Make a request first to generate metrics
-        client.get("/")
-        response = client.get("/metrics")
-        body = response.text
-        assert "http_requests_total" in body or "http_request_duration" in body
-
-    def test_metrics_contains_duration_histogram(self, client):
-        client.get("/")
-        response = client.get("/metrics")
-        body = response.text
-        assert "http_request_duration" in body
-
-    def test_metrics_has_method_label(self, client):
-        client.get("/")
-        response = client.get("/metrics")
-        body = response.text
-        assert 'method="GET"' in body
-
-    def test_metrics_has_handler_label(self, client):
-        client.get("/")
-        response = client.get("/metrics")
-        body = response.text
-        assert 'handler="/"' in body
+"""Tests for Prometheus metrics endpoint (issue #26)."""
+
+from unittest.mock import patch
+
+import pytest
+
+
+class TestMetricsEndpoint:
+    """Validate the /metrics endpoint."""
+
+    def test_metrics_returns_200(self, client):
+        response = client.get("/metrics")
+        assert response.status_code == 200
+
+    def test_metrics_returns_prometheus_format(self, client):
+        response = client.get("/metrics")
+        content_type = response.headers.get("content-type", "")
+        assert "text/plain" in content_type or "text/plain" in response.text[:100]
+
+    def test_metrics_contains_request_count(self, client):
+        # Make a request first to generate metrics
+        client.get("/")
+        response = client.get("/metrics")
+        body = response.text
+        assert "http_requests_total" in body or "http_request_duration" in body
+
+    def test_metrics_contains_duration_histogram(self, client):
+        client.get("/")
+        response = client.get("/metrics")
+        body = response.text
+        assert "http_request_duration" in body
+
+    def test_metrics_has_method_label(self, client):
+        client.get("/")
+        response = client.get("/metrics")
+        body = response.text
+        assert 'method="GET"' in body
+
+    def test_metrics_has_handler_label(self, client):
+        client.get("/")
+        response = client.get("/metrics")
+        body = response.text
+        assert 'handler="/"' in body
+
+    def test_metrics_labels_by_route_template(self, client):
+        client.get("/teams/chiefs/stats?season=1800")
+        client.get("/teams/eagles/stats?season=1800")
+        body = client.get("/metrics").text
+        assert 'handler="/teams/{team}/stats"' in body
+        assert 'handler="/teams/chiefs/stats"' not in body
+
+
+class TestFallbackMetricsMiddleware:
+    """Validate the prometheus_client fallback used without the instrumentator."""
+
+    def _make_app(self, registry, max_handlers=100):
+        from fastapi import FastAPI
+        from src.core.metrics import MetricsMiddleware
+
+        app = FastAPI()
+
+        @app.get("/items/{item_id}")
+        async def get_item(item_id: str):
+            return {"id": item_id}
+
+        @app.get("/things/{thing_id}")
+        async def get_thing(thing_id: str):
+            return {"id": thing_id}
+
+        app.add_middleware(
+            MetricsMiddleware, registry=registry, max_handlers=max_handlers
+        )
+        return app
+
+    def test_labels_use_route_template(self):
+        from fastapi.testclient import TestClient
+        from prometheus_client import CollectorRegistry, generate_latest
+
+        registry = CollectorRegistry()
+        test_client = TestClient(self._make_app(registry))
+        for item_id in ("a", "b", "c"):
+            test_client.get(f"/items/{item_id}")
+        body = generate_latest(registry).decode()
+        assert 'handler="/items/{item_id}"' in body
+        assert 'handler="/items/a"' not in body
+
+    def test_unmatched_paths_share_one_label(self):
+        from fastapi.testclient import TestClient
+        from prometheus_client import CollectorRegistry, generate_latest
+
+        registry = CollectorRegistry()
+        test_client = TestClient(self._make_app(registry))
+        test_client.get("/nope/1")
+        test_client.get("/nope/2")
+        body = generate_latest(registry).decode()
+        assert 'handler="<unmatched>"' in body
+        assert "/nope/" not in body
+
+    def test_handler_cardinality_is_capped(self):
+        from fastapi.testclient import TestClient
+        from prometheus_client import CollectorRegistry, generate_latest
+
+        registry = CollectorRegistry()
+        test_client = TestClient(self._make_app(registry, max_handlers=1))
+        test_client.get("/items/a")
+        test_client.get("/things/b")
+        body = generate_latest(registry).decode()
+        assert 'handler="/items/{item_id}"' in body
+        assert 'handler="<other>"' in body
+        assert 'handler="/things/{thing_id}"' not in body
+
+    def test_duration_uses_gateway_buckets(self):
+        from fastapi.testclient import TestClient
+        from prometheus_client import CollectorRegistry, generate_latest
+
+        registry = CollectorRegistry()
+        TestClient(self._make_app(registry)).get("/items/a")
+        body = generate_latest(registry).decode()
+        assert 'le="0.005"' in body
+        assert 'le="30.0"' in body
+
+
+class TestInstrumentatorHandlerCap:
+    """Validate the handler cap on prometheus-fastapi-instrumentator metrics."""
+
+    def test_handler_cardinality_is_capped(self):
+        instrumentator = pytest.importorskip("prometheus_fastapi_instrumentator")
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+        from prometheus_client import CollectorRegistry, generate_latest
+
+        from src.core.metrics import capped_handlers
+
+        app = FastAPI()
+
+        @app.get("/items/{item_id}")
+        async def get_item(item_id: str):
+            return {"id": item_id}
+
+        @app.get("/things/{thing_id}")
+        async def get_thing(thing_id: str):
+            return {"id": thing_id}
+
+        registry = CollectorRegistry()
+        default = instrumentator.metrics.default(registry=registry)
+        instrumentator.Instrumentator(registry=registry).add(
+            capped_handlers(default, max_handlers=1)
+        ).instrument(app)
+        test_client = TestClient(app)
+        test_client.get("/items/a")
+        test_client.get("/things/b")
+        body = generate_latest(registry).decode()
+        assert 'handler="/items/{item_id}"' in body
+        assert 'handler="<other>"' in body
+        assert 'handler="/things/{thing_id}"' not in body
+
+
+class TestMultiprocessExposition:
+    """Validate aggregation across workers via PROMETHEUS_MULTIPROC_DIR."""
+
+    def test_render_uses_multiprocess_collector(self, tmp_path, monkeypatch):
+        from src.core import metrics
+
+        monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+        with patch.object(metrics.multiprocess, "MultiProcessCollector") as collector:
+            metrics.render_latest()
+        collector.assert_called_once()
+
+    def test_render_uses_default_registry_single_process(self, monkeypatch):
+        from src.core import metrics
+
+        monkeypatch.delenv("PROMETHEUS_MULTIPROC_DIR", raising=False)
+        assert b"python_info" in metrics.render_latest()
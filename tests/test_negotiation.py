@@ -0,0 +1,144 @@
+"""Tests for MessagePack / CBOR content negotiation."""
+
+from unittest.mock import AsyncMock, patch
+
+import cbor2
+import httpx
+import msgpack
+import pytest
+
+from src.core.negotiation import CBOR, JSON, MSGPACK, negotiate
+
+TEAM_STATS = {"data": {"team": "KC", "season": 2024, "wins": 14}, "pagination": None}
+
+
+def _backend(handler):
+    """Patch the data client's httpx.AsyncClient onto a mock transport."""
+    real_client = httpx.AsyncClient
+
+    def factory(**kwargs):
+        return real_client(transport=httpx.MockTransport(handler), **kwargs)
+
+    return patch("src.core.client.httpx.AsyncClient", side_effect=factory)
+
+
+class TestNegotiate:
+    """Accept header parsing."""
+
+    @pytest.mark.parametrize(
+        "accept,expected",
+        [
+            (None, JSON),
+            ("*/*", JSON),
+            ("application/msgpack", MSGPACK),
+            ("application/x-msgpack", MSGPACK),
+            ("application/cbor", CBOR),
+            ("application/json, application/msgpack", JSON),
+            ("application/json;q=0.5, application/msgpack", MSGPACK),
+            ("application/msgpack;q=0, application/json", JSON),
+            ("text/html, application/xml", JSON),
+        ],
+    )
+    def test_negotiate(self, accept, expected):
+        assert negotiate(accept) == expected
+
+
+class TestBinaryResponses:
+    """Routes encode the same payload in the negotiated format."""
+
+    def test_msgpack_response(self, client):
+        with patch(
+            "src.routes.stats.data_client.get", new_callable=AsyncMock
+        ) as mock_get:
+            mock_get.return_value = TEAM_STATS
+            response = client.get(
+                "/teams/KC/stats?season=2024",
+                headers={"Accept": "application/msgpack"},
+            )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == MSGPACK
+        assert "Accept" in response.headers["vary"]
+        assert msgpack.unpackb(response.content) == TEAM_STATS
+
+    def test_cbor_response_with_models(self, client):
+        prediction = {
+            "home_team": "chiefs",
+            "away_team": "eagles",
+            "home_win_probability": 0.62,
+            "away_win_probability": 0.38,
+            "predicted_spread": -3.5,
+            "model_version": "v1.0",
+            "feature_version": "v1.0",
+            "edge_vs_market": 0.04,
+            "recommended_bet_size": 0.025,
+            "bet_recommendation": "BET",
+        }
+        with patch(
+            "src.routes.predictions.model_client.get", new_callable=AsyncMock
+        ) as mock_get:
+            mock_get.return_value.json = lambda: prediction
+            response = client.get(
+                "/predictions/predict?team1=chiefs&team2=eagles",
+                headers={"Accept": "application/cbor"},
+            )
+
+        assert response.headers["content-type"] == CBOR
+        assert cbor2.loads(response.content)["home_win_probability"] == 0.62
+
+    def test_json_remains_default(self, client):
+        with patch(
+            "src.routes.stats.data_client.get", new_callable=AsyncMock
+        ) as mock_get:
+            mock_get.return_value = TEAM_STATS
+            response = client.get("/teams/KC/stats?season=2024")
+
+        assert response.headers["content-type"] == JSON
+        assert response.json() == TEAM_STATS
+
+
+class TestPassthrough:
+    """Proxy routes relay backend bytes when it speaks the negotiated format."""
+
+    def test_forwards_backend_bytes(self, client):
+        body = msgpack.packb(TEAM_STATS)
+        sent = []
+
+        def handler(request):
+            sent.append(request)
+            return httpx.Response(200, headers={"content-type": MSGPACK}, content=body)
+
+        with _backend(handler):
+            response = client.get(
+                "/teams/KC/stats?season=2024",
+                headers={"Accept": "application/msgpack"},
+            )
+
+        assert response.status_code == 200
+        assert response.content == body
+        assert sent[0].headers["Accept"].startswith(MSGPACK)
+
+    def test_transcodes_json_backend(self, client):
+        def handler(request):
+            return httpx.Response(200, json=TEAM_STATS)
+
+        with _backend(handler):
+            response = client.get(
+                "/teams/KC/stats?season=2024",
+                headers={"Accept": "application/msgpack"},
+            )
+
+        assert response.headers["content-type"] == MSGPACK
+        assert msgpack.unpackb(response.content) == TEAM_STATS
+
+    def test_json_requests_do_not_send_accept(self, client):
+        sent = []
+
+        def handler(request):
+            sent.append(request)
+            return httpx.Response(200, json=TEAM_STATS)
+
+        with _backend(handler):
+            client.get("/teams/KC/stats?season=2024")
+
+        assert sent[0].headers["Accept"] == "*/*"
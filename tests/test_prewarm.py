@@ -0,0 +1,124 @@
+"""Tests for background pre-warming of upcoming weeks."""
+
+import asyncio
+from datetime import date
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.core.cache import response_cache
+from src.core.model_versions import ModelVersion, model_versions, prediction_cache
+from src.core.prewarm import Prewarmer, nfl_week, season_kickoff, upcoming_weeks
+from src.routes.predictions import week_predictions
+
+V1 = ModelVersion("v1.0", "f1")
+
+
+class TestNflWeek:
+    def test_kickoff_is_thursday_after_labor_day(self):
+        assert season_kickoff(2024) == date(2024, 9, 5)
+        assert season_kickoff(2025) == date(2025, 9, 4)
+
+    @pytest.mark.parametrize(
+        "day, expected",
+        [
+            (date(2024, 9, 5), (2024, 1)),
+            (date(2024, 9, 11), (2024, 1)),
+            (date(2024, 9, 12), (2024, 2)),
+            (date(2024, 7, 1), (2024, 1)),
+            (date(2025, 1, 5), (2024, 18)),
+            (date(2025, 2, 9), (2024, 18)),
+        ],
+    )
+    def test_week_of_day(self, day, expected):
+        assert nfl_week(day) == expected
+
+    def test_upcoming_weeks(self):
+        assert upcoming_weeks(date(2024, 9, 12)) == [(2024, 2), (2024, 3)]
+        assert upcoming_weeks(date(2025, 1, 5)) == [(2024, 18)]
+
+
+class TestPrewarmer:
+    @pytest.mark.asyncio
+    async def test_warm_runs_every_warmer_and_survives_failures(self):
+        prewarmer = Prewarmer(interval=60)
+        calls = []
+
+        async def ok(season, week):
+            calls.append((season, week))
+
+        prewarmer.warmers += [AsyncMock(side_effect=RuntimeError("down")), ok]
+        await prewarmer.warm(date(2024, 9, 12))
+
+        assert calls == [(2024, 2), (2024, 3)]
+
+    @pytest.mark.asyncio
+    async def test_model_change_triggers_a_warm(self):
+        prewarmer = Prewarmer(interval=3600)
+        warmed = asyncio.Event()
+        warmer = AsyncMock(side_effect=lambda season, week: warmed.set())
+        prewarmer.warmers.append(warmer)
+
+        prewarmer.start()
+        try:
+            await asyncio.wait_for(warmed.wait(), 1)
+            first = warmer.await_count
+            warmed.clear()
+            prewarmer.trigger(V1)
+            await asyncio.wait_for(warmed.wait(), 1)
+            assert warmer.await_count > first
+        finally:
+            await prewarmer.stop()
+
+    def test_disabled_without_interval(self):
+        prewarmer = Prewarmer(interval=0)
+        prewarmer.warmers.append(AsyncMock())
+        prewarmer.start()
+        assert prewarmer._task is None
+
+
+class TestWeekWarming:
+    @pytest.fixture(autouse=True)
+    def warm_caches(self):
+        response_cache.clear()
+        prediction_cache.clear()
+        model_versions.active = V1
+        with patch("src.core.cache.settings.CACHE_STATS_TTL", 60.0):
+            yield
+        model_versions.active = None
+        response_cache.clear()
+        prediction_cache.clear()
+
+    @pytest.mark.asyncio
+    async def test_warm_week_fills_schedule_and_prediction_caches(
+        self, make_prediction, model_response
+    ):
+        games = [
+            {"home_team": "chiefs", "away_team": "ravens"},
+            {"home_team": "eagles", "away_team": "packers"},
+        ]
+        schedule = AsyncMock(return_value={"data": {"games": games}})
+
+        async def predict(endpoint, params=None):
+            return model_response(make_prediction(params["team1"], params["team2"]))
+
+        with (
+            patch("src.core.client.data_client._get", schedule),
+            patch(
+                "src.routes.predictions.model_client.get", side_effect=predict
+            ) as model,
+        ):
+            warmed = await week_predictions(2024, 1)
+            assert warmed.succeeded == 2
+            assert model.await_count == 2
+
+            served = await week_predictions(2024, 1)
+
+        assert served.succeeded == 2
+        assert [item.prediction.home_team for item in served.results] == [
+            "chiefs",
+            "eagles",
+        ]
+        assert schedule.await_count == 1
+        assert model.await_count == 2
+        assert prediction_cache.get("eagles", "packers", V1) is not None
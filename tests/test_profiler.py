@@ -0,0 +1,112 @@
+"""Tests for the admin-only sampling profiler and task dump."""
+
+import threading
+import time
+import xml.etree.ElementTree as ET
+from collections import Counter
+from unittest.mock import patch
+
+import pytest
+
+from src.core.profiler import (
+    ProfilerBusyError,
+    SamplingProfiler,
+    collapsed,
+    flamegraph_svg,
+)
+
+ADMIN = {"X-Admin-Key": "admin-secret"}
+
+
+@pytest.fixture
+def admin_key():
+    with patch("src.core.auth.settings") as mock_settings:
+        mock_settings.API_KEYS = ""
+        mock_settings.ADMIN_API_KEY = "admin-secret"
+        yield
+
+
+class TestSamplingProfiler:
+    """Validate sampling and rendering."""
+
+    def test_samples_target_thread(self):
+        stop = threading.Event()
+
+        def busy_worker():
+            while not stop.is_set():
+                time.sleep(0.001)
+
+        worker = threading.Thread(target=busy_worker)
+        worker.start()
+        try:
+            samples = SamplingProfiler(worker.ident, 0.001).run(0.05)
+        finally:
+            stop.set()
+            worker.join()
+
+        assert sum(samples.values()) > 0
+        assert any("busy_worker" in stack for stack in samples)
+
+    def test_only_one_profile_at_a_time(self):
+        SamplingProfiler._lock.acquire()
+        try:
+            with pytest.raises(ProfilerBusyError):
+                SamplingProfiler(threading.get_ident(), 0.001).run(0.01)
+        finally:
+            SamplingProfiler._lock.release()
+
+    def test_collapsed_format(self):
+        samples = Counter({"main;handler;encode": 3, "main;idle": 1})
+        assert collapsed(samples) == "main;handler;encode 3\nmain;idle 1\n"
+
+    def test_flamegraph_is_valid_svg(self):
+        samples = Counter({"main;handler;<encode>": 3, "main;idle": 1})
+        svg = flamegraph_svg(samples)
+        root = ET.fromstring(svg)
+        assert root.tag.endswith("svg")
+        assert "&lt;encode&gt;" in svg
+
+
+class TestDebugEndpoints:
+    """Validate access control and responses of /debug endpoints."""
+
+    def test_hidden_when_admin_key_unset(self, client):
+        with patch("src.core.auth.settings") as mock_settings:
+            mock_settings.API_KEYS = ""
+            mock_settings.ADMIN_API_KEY = ""
+            response = client.get("/debug/tasks", headers=ADMIN)
+        assert response.status_code == 404
+
+    def test_wrong_admin_key_forbidden(self, client, admin_key):
+        response = client.get("/debug/tasks", headers={"X-Admin-Key": "nope"})
+        assert response.status_code == 403
+        assert response.json()["detail"]["error"]["code"] == "FORBIDDEN"
+
+    def test_non_ascii_admin_key_forbidden(self, client, admin_key):
+        headers = {"X-Admin-Key": "s\u00e9cret".encode("latin-1")}
+        response = client.get("/debug/tasks", headers=headers)
+        assert response.status_code == 403
+
+    def test_profile_returns_collapsed_stacks(self, client, admin_key):
+        response = client.get("/debug/profile?seconds=0.05", headers=ADMIN)
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        line = response.text.splitlines()[0]
+        assert int(line.rsplit(" ", 1)[1]) >= 1
+
+    def test_profile_returns_svg(self, client, admin_key):
+        response = client.get("/debug/profile?seconds=0.05&format=svg", headers=ADMIN)
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "image/svg+xml"
+        ET.fromstring(response.text)
+
+    def test_profile_duration_is_bounded(self, client, admin_key):
+        response = client.get("/debug/profile?seconds=3600", headers=ADMIN)
+        assert response.status_code == 422
+
+    def test_tasks_lists_in_flight_tasks(self, client, admin_key):
+        response = client.get("/debug/tasks", headers=ADMIN)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == len(data["tasks"]) >= 1
+        assert {"name", "coroutine", "done", "stack"} <= set(data["tasks"][0])
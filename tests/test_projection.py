@@ -0,0 +1,216 @@
+"""Tests for ?fields= projection."""
+
+import json
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import msgpack
+import pytest
+from fastapi import HTTPException
+
+from src.core.projection import (
+    JSONProjector,
+    parse_fields,
+    project,
+    project_envelope,
+)
+
+PLAYERS = {
+    "data": [
+        {
+            "name": f"Player {i}",
+            "team": {"abbr": "KC", "city": "Kansas City"},
+            "stats": {"passing": {"yards": 100 * i, "td": i}, "rushing": {"yards": i}},
+        }
+        for i in range(20)
+    ],
+    "pagination": {"page": 1, "limit": 50, "total": 20, "total_pages": 1},
+}
+FIELDS = "name,team.abbr,stats.passing.yards"
+
+
+def _feed_in_chunks(projector, raw, size):
+    out = b"".join(projector.feed(raw[i : i + size]) for i in range(0, len(raw), size))
+    return out + projector.close()
+
+
+class _WireStream(httpx.AsyncByteStream):
+    def __init__(self, body, chunk_size=7):
+        self.body = body
+        self.chunk_size = chunk_size
+
+    async def __aiter__(self):
+        for i in range(0, len(self.body), self.chunk_size):
+            yield self.body[i : i + self.chunk_size]
+
+
+def _backend(handler):
+    real_client = httpx.AsyncClient
+
+    def factory(**kwargs):
+        return real_client(transport=httpx.MockTransport(handler), **kwargs)
+
+    return patch("src.core.client.httpx.AsyncClient", side_effect=factory)
+
+
+class TestProject:
+    """Selection trees and in-memory projection."""
+
+    def test_parse_nested_paths(self):
+        assert parse_fields(FIELDS) == {
+            "name": {},
+            "team": {"abbr": {}},
+            "stats": {"passing": {"yards": {}}},
+        }
+
+    def test_rejects_empty_paths(self):
+        with pytest.raises(HTTPException) as exc:
+            parse_fields("name,,team")
+        assert exc.value.status_code == 400
+
+    def test_project_record(self):
+        record = PLAYERS["data"][3]
+        assert project(record, parse_fields(FIELDS)) == {
+            "name": "Player 3",
+            "team": {"abbr": "KC"},
+            "stats": {"passing": {"yards": 300}},
+        }
+
+    def test_envelope_keys_are_kept(self):
+        projected = project_envelope(PLAYERS, parse_fields("name"))
+        assert projected["pagination"] == PLAYERS["pagination"]
+        assert projected["data"][0] == {"name": "Player 0"}
+
+
+class TestJSONProjector:
+    """The streaming projector matches in-memory projection for any chunking."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 3, 16, 4096])
+    def test_matches_in_memory_projection(self, chunk_size):
+        tree = parse_fields(FIELDS)
+        raw = json.dumps(PLAYERS, indent=2).encode()
+        out = _feed_in_chunks(JSONProjector(tree), raw, chunk_size)
+        assert json.loads(out) == project_envelope(PLAYERS, tree)
+
+    def test_handles_structural_characters_in_strings(self):
+        payload = {"data": [{"name": 'a "]}" b', "x": 1}], "note": "[{"}
+        out = _feed_in_chunks(
+            JSONProjector({"name": {}}), json.dumps(payload).encode(), 2
+        )
+        assert json.loads(out) == {"data": [{"name": 'a "]}" b'}], "note": "[{"}
+
+    def test_single_record_data(self):
+        payload = {"data": {"name": "KC", "wins": 14}}
+        out = _feed_in_chunks(
+            JSONProjector({"wins": {}}), json.dumps(payload).encode(), 5
+        )
+        assert json.loads(out) == {"data": {"wins": 14}}
+
+    def test_truncated_body_raises(self):
+        projector = JSONProjector({"name": {}})
+        projector.feed(b'{"data": [{"name": "a"}')
+        with pytest.raises(ValueError):
+            projector.close()
+
+
+class TestProjectedRoutes:
+    """Stats and odds routes project in the gateway or forward ?fields=."""
+
+    def test_players_projected_while_streaming(self, client):
+        sent = []
+
+        def handler(request):
+            sent.append(request)
+            return httpx.Response(
+                200,
+                headers={"content-type": "application/json"},
+                stream=_WireStream(json.dumps(PLAYERS).encode()),
+            )
+
+        with _backend(handler):
+            response = client.get(f"/players?season=2024&fields={FIELDS}")
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["data"][1] == {
+            "name": "Player 1",
+            "team": {"abbr": "KC"},
+            "stats": {"passing": {"yards": 100}},
+        }
+        assert body["pagination"]["total"] == 20
+        assert "fields" not in sent[0].url.params
+
+    def test_forwards_fields_when_backend_supports_it(self, client):
+        with patch(
+            "src.core.projection.data_client.get", new_callable=AsyncMock
+        ) as mock_get, patch(
+            "src.core.projection.settings.UPSTREAM_SUPPORTS_FIELDS", True
+        ):
+            mock_get.return_value = {"data": [{"name": "KC"}]}
+            response = client.get("/standings?season=2024&fields=name")
+
+        assert response.json() == {"data": [{"name": "KC"}]}
+        mock_get.assert_called_once_with(
+            "/stats/standings", params={"season": 2024, "fields": "name"}
+        )
+
+    def test_odds_skip_model_validation_when_projected(self, client):
+        with patch(
+            "src.core.projection.data_client.get", new_callable=AsyncMock
+        ) as mock_get, patch(
+            "src.core.projection.settings.UPSTREAM_SUPPORTS_FIELDS", True
+        ):
+            mock_get.return_value = {"data": [{"game_id": "g1"}]}
+            response = client.get("/odds/live?fields=game_id")
+
+        assert response.status_code == 200
+        assert response.json() == {"data": [{"game_id": "g1"}]}
+
+    def test_odds_history_projects_history_records(self, client):
+        history = {
+            "game_id": "g1",
+            "history": [{"book": "dk", "spread": -3.5, "total": 47.5}],
+        }
+        expected = {"game_id": "g1", "history": [{"book": "dk", "spread": -3.5}]}
+
+        def handler(request):
+            return httpx.Response(
+                200,
+                headers={"content-type": "application/json"},
+                stream=_WireStream(json.dumps(history).encode()),
+            )
+
+        with _backend(handler):
+            streamed = client.get("/odds/history/g1?fields=book,spread")
+        with patch(
+            "src.core.projection.data_client.get", new_callable=AsyncMock
+        ) as mock_get:
+            mock_get.return_value = history
+            packed = client.get(
+                "/odds/history/g1?fields=book,spread",
+                headers={"Accept": "application/msgpack"},
+            )
+
+        assert streamed.json() == expected
+        assert msgpack.unpackb(packed.content) == expected
+
+    def test_binary_formats_project_parsed_payload(self, client):
+        with patch(
+            "src.core.projection.data_client.get", new_callable=AsyncMock
+        ) as mock_get:
+            mock_get.return_value = PLAYERS
+            response = client.get(
+                "/players?season=2024&fields=name",
+                headers={"Accept": "application/msgpack"},
+            )
+
+        assert msgpack.unpackb(response.content)["data"][0] == {"name": "Player 0"}
+
+    def test_upstream_error_is_returned_before_streaming(self, client):
+        def handler(request):
+            return httpx.Response(404, json={"error": "not found"})
+
+        with _backend(handler):
+            response = client.get("/standings?season=2024&fields=name")
+
+        assert response.status_code == 404
@@ -0,0 +1,113 @@
+"""Tests for the fast JSON response engine and trusted-upstream helpers."""
+
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import HTTPException
+from pydantic import BaseModel, ValidationError
+
+from src.core.responses import (
+    FastJSONResponse,
+    adapter_for,
+    dumps,
+    trusted_model,
+    trusted_response,
+)
+
+
+class Item(BaseModel):
+    name: str
+    score: float
+
+
+class Envelope(BaseModel):
+    data: list[Item]
+
+
+class TestFastJSONResponse:
+    """Validate direct-to-bytes encoding."""
+
+    def test_encodes_nested_models(self):
+        response = FastJSONResponse({"data": [Item(name="a", score=1.5)]})
+        assert json.loads(response.body) == {"data": [{"name": "a", "score": 1.5}]}
+
+    def test_compact_output(self):
+        assert dumps({"a": [1, 2]}) == b'{"a":[1,2]}'
+
+    def test_is_app_default_response_class(self):
+        from src.main import app
+
+        assert app.router.default_response_class is FastJSONResponse
+
+
+class TestTrustedUpstream:
+    """Validate once-only and sampled validation."""
+
+    def test_adapter_is_cached(self):
+        assert adapter_for(Envelope) is adapter_for(Envelope)
+
+    def test_validated_response_drops_unknown_fields(self):
+        response = trusted_response(
+            {"data": [{"name": "a", "score": "2", "secret": "x"}]},
+            Envelope,
+            sample_rate=1.0,
+        )
+        assert json.loads(response.body) == {"data": [{"name": "a", "score": 2.0}]}
+
+    def test_invalid_upstream_payload_is_bad_gateway(self):
+        with pytest.raises(HTTPException) as exc_info:
+            trusted_response({"data": [{"name": "a"}]}, Envelope, sample_rate=1.0)
+        assert exc_info.value.status_code == 502
+        assert exc_info.value.detail["error"]["code"] == "BAD_UPSTREAM_RESPONSE"
+
+    def test_unsampled_response_passes_through(self):
+        payload = {"data": [{"name": "a"}]}
+        response = trusted_response(payload, Envelope, sample_rate=0.0)
+        assert json.loads(response.body) == payload
+
+    def test_trusted_model_validates_when_sampled(self):
+        with pytest.raises(ValidationError):
+            trusted_model(Item, {"name": "a"}, sample_rate=1.0)
+
+    def test_trusted_model_constructs_when_unsampled(self):
+        item = trusted_model(Item, {"name": "a", "score": 3.0}, sample_rate=0.0)
+        assert isinstance(item, Item)
+        assert item.score == 3.0
+
+
+class TestRoutesUseTrustedResponses:
+    """Proxied routes validate upstream data exactly once."""
+
+    def test_odds_route_rejects_malformed_upstream(self, client):
+        with patch(
+            "src.routes.odds.data_client.get", new_callable=AsyncMock
+        ) as mock_get:
+            mock_get.return_value = {"data": [{"game_id": "x"}]}
+            response = client.get("/odds/live")
+        assert response.status_code == 502
+
+    def test_predict_skips_fastapi_revalidation(self, client):
+        prediction = {
+            "home_team": "chiefs",
+            "away_team": "eagles",
+            "home_win_probability": 0.62,
+            "away_win_probability": 0.38,
+            "predicted_spread": -3.5,
+            "model_version": "v1.0",
+            "feature_version": "v1.0",
+            "edge_vs_market": 0.04,
+            "recommended_bet_size": 0.025,
+            "bet_recommendation": "BET",
+        }
+        with patch(
+            "src.routes.predictions.model_client.get", new_callable=AsyncMock
+        ) as mock_get, patch(
+            "fastapi.routing.serialize_response", new_callable=AsyncMock
+        ) as serialize:
+            mock_get.return_value.json = lambda: prediction
+            response = client.get("/predictions/predict?team1=chiefs&team2=eagles")
+
+        assert response.status_code == 200
+        assert response.json()["home_win_probability"] == 0.62
+        serialize.assert_not_called()
@@ -218,3 +218,112 @@ class TestBackoff:
         assert len(delays) == 2
         # Second delay should be larger than first (exponential)
         assert delays[1] > delays[0]
+
+
+class TestNoRetryForScrapes:
+    """Scrapes start work on the backend, so they are never retried."""
+
+    @pytest.mark.asyncio
+    async def test_scrape_timeout_is_not_retried(self, retry_client):
+        call_count = 0
+
+        async def mock_request(*args, **kwargs):
+            nonlocal call_count
+            call_count += 1
+            raise httpx.ReadTimeout("timed out")
+
+        with patch("src.core.client.httpx.AsyncClient") as mock_cls:
+            mock_http = AsyncMock()
+            mock_http.request = mock_request
+            mock_http.__aenter__ = AsyncMock(return_value=mock_http)
+            mock_http.__aexit__ = AsyncMock(return_value=False)
+            mock_cls.return_value = mock_http
+
+            with pytest.raises(Exception):
+                await retry_client._make_request("GET", "/scrape/KC/2024")
+
+        assert call_count == 1
+
+
+class TestNonIdempotentRetries:
+    """POSTs are retried only when the request never reached the backend."""
+
+    async def _post(self, retry_client, failures):
+        call_count = 0
+
+        mock_success = MagicMock()
+        mock_success.status_code = 200
+        mock_success.json.return_value = {"data": "ok"}
+        mock_success.raise_for_status = MagicMock()
+
+        async def mock_request(*args, **kwargs):
+            nonlocal call_count
+            call_count += 1
+            if call_count <= len(failures):
+                raise failures[call_count - 1]
+            return mock_success
+
+        with patch("src.core.client.httpx.AsyncClient") as mock_cls:
+            mock_http = AsyncMock()
+            mock_http.request = mock_request
+            mock_http.__aenter__ = AsyncMock(return_value=mock_http)
+            mock_http.__aexit__ = AsyncMock(return_value=False)
+            mock_cls.return_value = mock_http
+
+            try:
+                return await retry_client.post("/scrape/excel"), call_count
+            except Exception as e:
+                return e, call_count
+
+    @pytest.mark.asyncio
+    async def test_connect_errors_are_retried(self, retry_client):
+        result, call_count = await self._post(
+            retry_client,
+            [httpx.ConnectError("refused"), httpx.ConnectTimeout("connect timeout")],
+        )
+        assert result == {"data": "ok"}
+        assert call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_read_timeout_is_not_retried(self, retry_client):
+        result, call_count = await self._post(
+            retry_client, [httpx.ReadTimeout("timed out")]
+        )
+        assert result.status_code == 503
+        assert call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_backend_503_is_not_retried(self, retry_client):
+        mock_503 = MagicMock()
+        mock_503.status_code = 503
+        mock_503.text = "{}"
+        mock_503.json.return_value = {}
+        error = httpx.HTTPStatusError("503", request=MagicMock(), response=mock_503)
+
+        result, call_count = await self._post(retry_client, [error])
+        assert result.status_code == 503
+        assert call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_streamed_upload_is_sent_once(self, retry_client):
+        call_count = 0
+
+        async def mock_request(*args, **kwargs):
+            nonlocal call_count
+            call_count += 1
+            raise httpx.ConnectError("refused")
+
+        async def body():
+            yield b"data"
+
+        with patch("src.core.client.httpx.AsyncClient") as mock_cls:
+            mock_http = AsyncMock()
+            mock_http.request = mock_request
+            mock_http.__aenter__ = AsyncMock(return_value=mock_http)
+            mock_http.__aexit__ = AsyncMock(return_value=False)
+            mock_cls.return_value = mock_http
+
+            with pytest.raises(Exception):
+                await retry_client.upload("/scrape/excel", body(), "text/plain")
+
+        assert call_count == 1
@@ -0,0 +1,103 @@
+"""Tests for the /batch sub-request endpoint."""
+
+import json
+from unittest.mock import AsyncMock, patch
+
+from fastapi import HTTPException
+
+
+async def _fake_get(endpoint, params=None):
+    if endpoint == "/stats/teams/BAD":
+        raise HTTPException(status_code=404, detail="Team not found")
+    return {"data": {"endpoint": endpoint, "params": params}}
+
+
+class TestBatch:
+    """Tests for POST /batch."""
+
+    def test_results_in_request_order_with_per_item_status(self, client):
+        with patch("src.routes.stats.data_client.get", side_effect=_fake_get):
+            response = client.post(
+                "/batch",
+                json={
+                    "requests": [
+                        {"path": "/standings?season=2024"},
+                        {"path": "/teams/BAD/stats?season=2024"},
+                        {"path": "/teams/KC/stats?season=2024"},
+                    ]
+                },
+            )
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [r["index"] for r in results] == [0, 1, 2]
+        assert [r["status"] for r in results] == [200, 404, 200]
+        assert results[0]["body"]["data"]["endpoint"] == "/stats/standings"
+        assert results[1]["body"] == {"detail": "Team not found"}
+        assert results[2]["body"]["data"]["params"] == {"season": 2024}
+
+    def test_sub_request_validation_errors_are_per_item(self, client):
+        with patch("src.routes.stats.data_client.get", side_effect=_fake_get):
+            response = client.post(
+                "/batch",
+                json={
+                    "requests": [
+                        {"path": "/standings"},
+                        {"path": "https://example.com/"},
+                        {"path": "/batch"},
+                    ]
+                },
+            )
+
+        assert [r["status"] for r in response.json()["results"]] == [422, 400, 400]
+
+    def test_sub_requests_are_checked_like_direct_requests(self, client):
+        with patch("src.core.auth.settings") as mock_settings:
+            mock_settings.API_KEYS = "valid-key-123"
+            mock_settings.ADMIN_API_KEY = ""
+            with patch(
+                "src.routes.stats.data_client.get", new_callable=AsyncMock
+            ) as mock_get:
+                mock_get.return_value = {"data": []}
+                response = client.post(
+                    "/batch",
+                    json={
+                        "requests": [
+                            {"path": "/games?season=2024"},
+                            {"path": "/debug/tasks"},
+                        ]
+                    },
+                    headers={"X-API-Key": "valid-key-123"},
+                )
+
+        assert [r["status"] for r in response.json()["results"]] == [200, 404]
+
+    def test_batch_itself_requires_auth(self, client):
+        with patch("src.core.auth.settings") as mock_settings:
+            mock_settings.API_KEYS = "valid-key-123"
+            response = client.post("/batch", json={"requests": []})
+        assert response.status_code == 401
+
+    def test_streams_ndjson_when_requested(self, client):
+        with patch("src.routes.stats.data_client.get", side_effect=_fake_get):
+            response = client.post(
+                "/batch",
+                json={
+                    "requests": [
+                        {"path": f"/standings?season={season}"}
+                        for season in range(2020, 2025)
+                    ]
+                },
+                headers={"Accept": "application/x-ndjson"},
+            )
+
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert [line["index"] for line in lines] == [0, 1, 2, 3, 4]
+        assert all(line["status"] == 200 for line in lines)
+
+    def test_too_many_sub_requests_rejected(self, client):
+        response = client.post(
+            "/batch", json={"requests": [{"path": "/standings"}] * 51}
+        )
+        assert response.status_code == 422
@@ -0,0 +1,199 @@
+"""Tests for the composite team dashboard endpoint."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+GAMES = {
+    "data": [
+        {"game_id": "g1", "home_team": "chiefs", "away_team": "lions"},
+        {"game_id": "g2", "home_team": "bills", "away_team": "jets"},
+    ]
+}
+
+
+def _data(endpoint, params=None):
+    if endpoint == "/stats/games":
+        return GAMES
+    if endpoint == "/odds/live":
+        return {
+            "data": [{"game_id": "g1", "home_team": "lions", "away_team": "chiefs"}]
+        }
+    return {"data": {"endpoint": endpoint}}
+
+
+async def _data_async(endpoint, params=None):
+    return _data(endpoint, params)
+
+
+class TestTeamDashboard:
+    """Tests for GET /teams/{team}/dashboard."""
+
+    @pytest.fixture
+    def prediction(self, make_prediction):
+        return make_prediction("chiefs", "lions", bet_recommendation="BET")
+
+    def test_sections_are_fetched_concurrently(
+        self, client, prediction, model_response
+    ):
+        in_flight = 0
+        peak = 0
+
+        async def fake_get(endpoint, params=None):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return _data(endpoint, params)
+
+        with patch(
+            "src.routes.dashboard.data_client.get", side_effect=fake_get
+        ) as mock_get, patch(
+            "src.routes.predictions.model_client.get", new_callable=AsyncMock
+        ) as mock_model:
+            mock_model.return_value = model_response(prediction)
+            response = client.get("/teams/chiefs/dashboard?season=2024&opponent=lions")
+
+        assert response.status_code == 200
+        sections = response.json()["sections"]
+        assert {name: s["status"] for name, s in sections.items()} == {
+            "stats": "ok",
+            "games": "ok",
+            "standings": "ok",
+            "odds": "ok",
+            "prediction": "ok",
+        }
+        assert sections["games"]["data"]["data"] == [GAMES["data"][0]]
+        assert sections["prediction"]["data"]["bet_recommendation"] == "BET"
+        assert peak == 4
+        mock_get.assert_any_call("/stats/teams/chiefs", params={"season": 2024})
+        mock_model.assert_called_once_with(
+            "/predict", params={"team1": "chiefs", "team2": "lions"}
+        )
+
+    def test_failed_section_is_reported_in_place(self, client):
+        async def fake_get(endpoint, params=None):
+            if endpoint == "/stats/standings":
+                raise HTTPException(status_code=502, detail="bad gateway")
+            return _data(endpoint, params)
+
+        with patch("src.routes.dashboard.data_client.get", side_effect=fake_get):
+            response = client.get("/teams/chiefs/dashboard?season=2024")
+
+        assert response.status_code == 200
+        sections = response.json()["sections"]
+        assert sections["standings"] == {
+            "status": "error",
+            "data": None,
+            "error": {"status_code": 502, "detail": "bad gateway"},
+        }
+        assert sections["stats"]["status"] == "ok"
+        assert sections["prediction"]["status"] == "skipped"
+
+    def test_unexpected_errors_fail_only_their_section(self, client):
+        async def fake_get(endpoint, params=None):
+            if endpoint == "/odds/live":
+                raise KeyError("sport")
+            return _data(endpoint, params)
+
+        with patch("src.routes.dashboard.data_client.get", side_effect=fake_get), patch(
+            "src.routes.predictions.model_client.get",
+            side_effect=ValueError("bad payload"),
+        ):
+            response = client.get("/teams/chiefs/dashboard?season=2024&opponent=lions")
+
+        assert response.status_code == 200
+        sections = response.json()["sections"]
+        assert sections["odds"]["error"] == {
+            "status_code": 500,
+            "detail": "Internal error",
+        }
+        assert sections["prediction"]["error"]["status_code"] == 500
+        assert sections["games"]["status"] == "ok"
+
+    def test_model_outage_only_fails_prediction(self, client):
+        with patch(
+            "src.routes.dashboard.data_client.get", side_effect=_data_async
+        ), patch(
+            "src.routes.predictions.model_client.get",
+            side_effect=httpx.ConnectError("refused"),
+        ):
+            response = client.get("/teams/chiefs/dashboard?season=2024&opponent=lions")
+
+        sections = response.json()["sections"]
+        assert sections["prediction"]["error"]["status_code"] == 503
+        assert sections["odds"]["status"] == "ok"
+
+    def test_prediction_served_from_cache(self, client, prediction):
+        from src.core.model_versions import ModelVersion, model_versions
+        from src.core.model_versions import prediction_cache
+
+        prediction_cache.clear()
+        prediction_cache.set("chiefs", "lions", prediction)
+        model_versions.active = ModelVersion("v1.0", "f1")
+        try:
+            with patch(
+                "src.routes.dashboard.data_client.get", side_effect=_data_async
+            ), patch(
+                "src.routes.predictions.model_client.get", new_callable=AsyncMock
+            ) as mock_model:
+                response = client.get(
+                    "/teams/chiefs/dashboard?season=2024&opponent=lions"
+                )
+        finally:
+            model_versions.active = None
+            prediction_cache.clear()
+
+        section = response.json()["sections"]["prediction"]
+        assert section["data"]["bet_recommendation"] == "BET"
+        mock_model.assert_not_awaited()
+
+    def test_model_outage_serves_last_known_good(self, client, tmp_path, prediction):
+        from src.core.last_known_good import LastKnownGoodStore
+
+        store = LastKnownGoodStore(str(tmp_path / "lkg.sqlite3"), max_age=0)
+
+        async def save():
+            store.put("chiefs", "lions", prediction)
+            await store.flush()
+
+        asyncio.run(save())
+        with patch("src.routes.predictions.last_known_good", store), patch(
+            "src.routes.dashboard.data_client.get", side_effect=_data_async
+        ), patch(
+            "src.routes.predictions.model_client.get",
+            side_effect=httpx.ConnectError("refused"),
+        ):
+            response = client.get("/teams/chiefs/dashboard?season=2024&opponent=lions")
+        store.close()
+
+        section = response.json()["sections"]["prediction"]
+        assert section["status"] == "ok"
+        assert section["data"]["degraded"] is True
+        assert section["data"]["predicted_spread"] == prediction["predicted_spread"]
+
+    def test_invalid_opponent_fails_prediction_section(self, client):
+        with patch("src.routes.dashboard.data_client.get", side_effect=_data_async):
+            response = client.get("/teams/chiefs/dashboard?season=2024&opponent=xyz")
+
+        prediction = response.json()["sections"]["prediction"]
+        assert prediction["status"] == "error"
+        assert prediction["error"]["status_code"] == 400
+
+    def test_all_sections_failing_returns_503(self, client):
+        with patch(
+            "src.routes.dashboard.data_client.get",
+            side_effect=HTTPException(status_code=503, detail="down"),
+        ):
+            response = client.get("/teams/chiefs/dashboard?season=2024")
+
+        assert response.status_code == 503
+        assert response.json()["sections"]["stats"]["status"] == "error"
+
+    def test_season_is_required(self, client):
+        response = client.get("/teams/chiefs/dashboard")
+        assert response.status_code == 422
@@ -0,0 +1,116 @@
+"""E2E tests for bulk export routes."""
+
+import csv
+import io
+from unittest.mock import AsyncMock, patch
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from fastapi import HTTPException
+
+
+def _games(endpoint, params):
+    season = params["season"]
+    return {
+        "data": [
+            {"game_id": f"{season}-1", "home": "KC", "home_score": 27},
+            {"game_id": f"{season}-2", "home": "BUF", "home_score": None},
+        ],
+        "pagination": None,
+    }
+
+
+def _players(endpoint, params):
+    page = params["page"]
+    return {
+        "data": [{"player": f"p{params['season']}-{page}", "yards": page * 100}],
+        "pagination": {"page": page, "limit": 200, "total": 3, "total_pages": 3},
+    }
+
+
+class TestExportGames:
+    """Tests for /export/games."""
+
+    def test_csv_streams_seasons_in_order(self, client):
+        with patch(
+            "src.routes.export.data_client.get", new_callable=AsyncMock
+        ) as mock_get:
+            mock_get.side_effect = _games
+            response = client.get("/export/games?seasons=2021-2023&format=csv")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        assert "games_2021-2023.csv" in response.headers["content-disposition"]
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert [r["game_id"] for r in rows] == [
+            "2021-1",
+            "2021-2",
+            "2022-1",
+            "2022-2",
+            "2023-1",
+            "2023-2",
+        ]
+        assert rows[0]["season"] == "2021"
+        assert mock_get.call_count == 3
+
+    def test_arrow_stream(self, client):
+        with patch(
+            "src.routes.export.data_client.get", new_callable=AsyncMock
+        ) as mock_get:
+            mock_get.side_effect = _games
+            response = client.get("/export/games?seasons=2020,2024&format=arrow")
+
+        table = pa.ipc.open_stream(response.content).read_all()
+        assert table.num_rows == 4
+        assert table.column("season").to_pylist() == [2020, 2020, 2024, 2024]
+
+    def test_filename_is_built_from_parsed_seasons(self, client):
+        with patch(
+            "src.routes.export.data_client.get", new_callable=AsyncMock
+        ) as mock_get:
+            mock_get.side_effect = _games
+            response = client.get("/export/games", params={"seasons": "2024\n"})
+            listed = client.get("/export/games?seasons=2024,2020")
+
+        assert response.status_code == 200
+        disposition = response.headers["content-disposition"]
+        assert disposition == 'attachment; filename="games_2024.csv"'
+        assert "games_2020-2024.csv" in listed.headers["content-disposition"]
+
+    def test_invalid_seasons(self, client):
+        response = client.get("/export/games?seasons=1800-1801")
+        assert response.status_code == 400
+
+    def test_upstream_failure_before_streaming(self, client):
+        with patch(
+            "src.routes.export.data_client.get", new_callable=AsyncMock
+        ) as mock_get:
+            mock_get.side_effect = HTTPException(status_code=503, detail="down")
+            response = client.get("/export/games?seasons=2024")
+
+        assert response.status_code == 503
+
+
+class TestExportPlayers:
+    """Tests for /export/players."""
+
+    def test_parquet_includes_every_page(self, client):
+        with patch(
+            "src.routes.export.data_client.get", new_callable=AsyncMock
+        ) as mock_get:
+            mock_get.side_effect = _players
+            response = client.get("/export/players?seasons=2023-2024&format=parquet")
+
+        assert response.status_code == 200
+        table = pq.read_table(io.BytesIO(response.content))
+        assert table.column("player").to_pylist() == [
+            "p2023-1",
+            "p2023-2",
+            "p2023-3",
+            "p2024-1",
+            "p2024-2",
+            "p2024-3",
+        ]
+        mock_get.assert_any_call(
+            "/stats/players", params={"season": 2024, "page": 3, "limit": 200}
+        )
@@ -38,19 +38,32 @@ class TestAllRoutesDocumented:
         "/scrape/{team}/{year}",
         "/scrape/{year}",
         "/scrape/excel",
+        "/scrape/jobs/{job_id}",
+        "/scrape/jobs/{job_id}/result",
+        "/scrape/jobs/{job_id}/events",
         "/teams/{team}/stats",
+        "/teams/{team}/dashboard",
+        "/batch",
         "/players",
+        "/players/all",
         "/games",
         "/standings",
         "/predictions/predict",
         "/predictions/backtest/{run_id}",
         "/predictions/models",
+        "/predictions/matrix",
         "/metrics",
         "/odds/live",
         "/odds/history/{game_id}",
         "/odds/best",
         "/predictions/batch",
+        "/predictions/batch/stream",
         "/predictions/week/{season}/{week}",
+        "/debug/profile",
+        "/debug/tasks",
+        "/cache/invalidate",
+        "/export/games",
+        "/export/players",
     ]
 
     def test_all_routes_present(self, client):
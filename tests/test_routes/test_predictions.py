@@ -1,21 +1,9 @@
+import json
 import pytest
 from unittest.mock import patch, AsyncMock, MagicMock
 from fastapi import status
 import httpx
 
-SAMPLE_PREDICTION = {
-    "home_team": "chiefs",
-    "away_team": "eagles",
-    "home_win_probability": 0.62,
-    "away_win_probability": 0.38,
-    "predicted_spread": -3.5,
-    "model_version": "v1.0",
-    "feature_version": "v1.0",
-    "edge_vs_market": 0.04,
-    "recommended_bet_size": 0.025,
-    "bet_recommendation": "BET",
-}
-
 
 class TestPredictEndpoint:
     """Tests for GET /predictions/predict endpoint."""
@@ -260,11 +248,11 @@ class TestBatchPredictions:
 
     @patch("httpx.AsyncClient.get")
     @pytest.mark.asyncio
-    async def test_batch_success(self, mock_get, client):
+    async def test_batch_success(self, mock_get, client, make_prediction):
         """Test batch prediction with all games succeeding."""
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = SAMPLE_PREDICTION
+        mock_response.json.return_value = make_prediction()
         mock_response.raise_for_status = MagicMock()
         mock_get.return_value = mock_response
 
@@ -282,11 +270,11 @@ class TestBatchPredictions:
 
     @patch("httpx.AsyncClient.get")
     @pytest.mark.asyncio
-    async def test_batch_partial_failure(self, mock_get, client):
+    async def test_batch_partial_failure(self, mock_get, client, make_prediction):
         """Test batch with mix of valid and invalid teams."""
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json.return_value = SAMPLE_PREDICTION
+        mock_response.json.return_value = make_prediction()
         mock_response.raise_for_status = MagicMock()
         mock_get.return_value = mock_response
 
@@ -328,7 +316,9 @@ class TestWeekPredictions:
 
     @patch("httpx.AsyncClient.get")
     @pytest.mark.asyncio
-    async def test_week_predictions_success(self, mock_httpx_get, client):
+    async def test_week_predictions_success(
+        self, mock_httpx_get, client, make_prediction
+    ):
         """Test week prediction that fetches schedule and predicts."""
         with patch(
             "src.routes.predictions.data_client.get", new_callable=AsyncMock
@@ -343,7 +333,7 @@ class TestWeekPredictions:
 
             predict_response = MagicMock()
             predict_response.status_code = 200
-            predict_response.json.return_value = SAMPLE_PREDICTION
+            predict_response.json.return_value = make_prediction()
             predict_response.raise_for_status = MagicMock()
             mock_httpx_get.return_value = predict_response
 
@@ -353,3 +343,257 @@ class TestWeekPredictions:
             data = response.json()
             assert data["total"] == 1
             assert data["succeeded"] == 1
+
+
+class TestPredictionCache:
+    """Predictions cached by matchup and active model version."""
+
+    @pytest.fixture(autouse=True)
+    def empty_cache(self):
+        from src.core.model_versions import model_versions, prediction_cache
+
+        prediction_cache.clear()
+        yield
+        prediction_cache.clear()
+        model_versions.active = None
+
+    @staticmethod
+    def _models_response(model_version):
+        response = MagicMock()
+        response.json.return_value = {
+            "models": [
+                {
+                    "model_version": "v0.9",
+                    "feature_version": "v1.0",
+                    "is_active": False,
+                },
+                {
+                    "model_version": model_version,
+                    "feature_version": "v1.0",
+                    "is_active": True,
+                },
+            ]
+        }
+        return response
+
+    @pytest.fixture
+    def prediction_response(self, make_prediction, model_response):
+        def respond(model_version="v1.0"):
+            return model_response(
+                make_prediction(model_version=model_version, feature_version="v1.0")
+            )
+
+        return respond
+
+    @pytest.mark.asyncio
+    async def test_repeat_predictions_served_from_cache(
+        self, client, prediction_response
+    ):
+        from src.core.model_versions import model_versions
+
+        with patch(
+            "src.core.model_versions.model_client.get", new_callable=AsyncMock
+        ) as mock_models:
+            mock_models.return_value = self._models_response("v1.0")
+            await model_versions.refresh()
+
+        url = "/predictions/predict?team1=chiefs&team2=eagles"
+        with patch(
+            "src.routes.predictions.model_client.get", new_callable=AsyncMock
+        ) as mock_predict:
+            mock_predict.return_value = prediction_response()
+            first = client.get(url)
+            second = client.get(url)
+
+        assert mock_predict.await_count == 1
+        assert first.json() == second.json()
+        assert second.headers["x-model-version"] == "v1.0"
+        assert second.headers["x-feature-version"] == "v1.0"
+
+    @pytest.mark.asyncio
+    async def test_model_change_invalidates_cache(self, client, prediction_response):
+        from src.core.model_versions import model_versions, prediction_cache
+
+        active = {"version": "v1.0"}
+        calls = []
+
+        async def model_service(endpoint, params=None):
+            calls.append(endpoint)
+            if endpoint == "/models":
+                return self._models_response(active["version"])
+            return prediction_response(active["version"])
+
+        url = "/predictions/predict?team1=chiefs&team2=eagles"
+        with patch("src.core.client.model_client.get", side_effect=model_service):
+            await model_versions.refresh()
+            client.get(url)
+            assert len(prediction_cache) == 1
+
+            active["version"] = "v2.0"
+            await model_versions.refresh()
+            assert len(prediction_cache) == 0
+            response = client.get(url)
+
+        assert calls.count("/predict") == 2
+        assert response.headers["x-model-version"] == "v2.0"
+
+    @pytest.mark.asyncio
+    async def test_no_caching_without_known_version(self, client, prediction_response):
+        from src.core.model_versions import model_versions
+
+        with patch(
+            "src.core.model_versions.model_client.get", new_callable=AsyncMock
+        ) as mock_models:
+            mock_models.side_effect = httpx.ConnectError("refused")
+            assert await model_versions.refresh() is None
+
+        with patch(
+            "src.routes.predictions.model_client.get", new_callable=AsyncMock
+        ) as mock_predict:
+            mock_predict.return_value = prediction_response()
+            client.get("/predictions/predict?team1=chiefs&team2=eagles")
+            response = client.get("/predictions/predict?team1=chiefs&team2=eagles")
+
+        assert mock_predict.await_count == 2
+        assert response.headers["x-model-version"] == "v1.0"
+
+    @pytest.mark.asyncio
+    async def test_batch_uses_cached_predictions(self, client, prediction_response):
+        from src.core.model_versions import model_versions
+
+        with patch(
+            "src.core.model_versions.model_client.get", new_callable=AsyncMock
+        ) as mock_models:
+            mock_models.return_value = self._models_response("v1.0")
+            await model_versions.refresh()
+
+        body = {"games": [{"team1": "chiefs", "team2": "eagles"}] * 3}
+        with patch(
+            "src.routes.predictions.model_client.get", new_callable=AsyncMock
+        ) as mock_predict:
+            mock_predict.return_value = prediction_response()
+            response = client.post("/predictions/batch", json=body)
+
+        assert response.json()["succeeded"] == 3
+        assert mock_predict.await_count == 1
+
+
+class TestBatchStream:
+    """Tests for POST /predictions/batch/stream."""
+
+    @pytest.fixture
+    def predict(self, make_prediction, model_response):
+        async def predict(endpoint, params=None):
+            if params["team1"] == "jets":
+                raise httpx.ConnectError("refused")
+            return model_response(make_prediction(params["team1"], params["team2"]))
+
+        return predict
+
+    def test_streams_ndjson_items_with_index(self, client, predict):
+        body = (
+            b'{"team1": "chiefs", "team2": "eagles"}\n'
+            b"\n"
+            b'{"team1": "jets", "team2": "bills"}\n'
+            b"not json\n"
+            b'{"team1": "xyz", "team2": "bills"}\n'
+            b'{"team1": "ravens", "team2": "steelers"}'
+        )
+        with patch("src.routes.predictions.model_client.get", side_effect=predict):
+            response = client.post(
+                "/predictions/batch/stream",
+                content=body,
+                headers={"Content-Type": "application/x-ndjson"},
+            )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        items = {
+            item["index"]: item
+            for item in map(json.loads, response.text.strip().split("\n"))
+        }
+        assert sorted(items) == [0, 1, 2, 3, 4]
+        assert items[0]["prediction"]["home_team"] == "chiefs"
+        assert items[1]["error"]["error"] == "Model service unavailable"
+        assert "team1" in items[2]["error"]["error"]
+        assert "Invalid team name" in items[3]["error"]["error"]
+        assert items[4]["prediction"]["away_team"] == "steelers"
+
+    def test_sse_ends_with_totals(self, client, predict):
+        body = b"".join(
+            b'{"team1": "chiefs", "team2": "%s"}\n' % team.encode()
+            for team in ("eagles", "bills", "ravens")
+        )
+        with patch("src.routes.predictions.model_client.get", side_effect=predict):
+            response = client.post(
+                "/predictions/batch/stream",
+                content=body,
+                headers={"Accept": "text/event-stream"},
+            )
+
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = response.text.strip().split("\n\n")
+        assert [e.split("\n")[0] for e in events] == ["event: prediction"] * 3 + [
+            "event: done"
+        ]
+        done = json.loads(events[-1].split("data: ", 1)[1])
+        assert done == {"total": 3, "succeeded": 3, "failed": 0, "truncated": False}
+
+    def test_oversized_line_arriving_with_its_newline_is_rejected(
+        self, client, predict
+    ):
+        from src.routes.predictions import MAX_STREAM_LINE_BYTES
+
+        padding = b" " * MAX_STREAM_LINE_BYTES
+        body = (
+            b'{"team1": "chiefs", "team2": "eagles"' + padding + b"}\n"
+            b'{"team1": "ravens", "team2": "steelers"}\n'
+        )
+        with patch("src.routes.predictions.model_client.get", side_effect=predict):
+            response = client.post("/predictions/batch/stream", content=body)
+
+        items = {
+            item["index"]: item
+            for item in map(json.loads, response.text.strip().split("\n"))
+        }
+        assert items[0]["prediction"] is None
+        assert "Expected a JSON object" in items[0]["error"]["error"]
+        assert items[1]["prediction"]["home_team"] == "ravens"
+
+    def test_reports_truncation_past_max_games(self, client, predict):
+        body = b'{"team1": "chiefs", "team2": "eagles"}\n' * 5
+        with (
+            patch("src.routes.predictions.settings.PREDICTION_STREAM_MAX_GAMES", 2),
+            patch("src.routes.predictions.model_client.get", side_effect=predict),
+        ):
+            lines = client.post("/predictions/batch/stream", content=body)
+            events = client.post(
+                "/predictions/batch/stream",
+                content=body,
+                headers={"Accept": "text/event-stream"},
+            )
+
+        items = sorted(
+            map(json.loads, lines.text.strip().split("\n")), key=lambda i: i["index"]
+        )
+        assert [item["index"] for item in items] == [0, 1, 2]
+        assert "Stream exceeds 2 games" in items[2]["error"]["error"]
+        done = json.loads(events.text.strip().split("\n\n")[-1].split("data: ")[1])
+        assert done == {"total": 2, "succeeded": 2, "failed": 0, "truncated": True}
+
+    def test_malformed_model_payload_becomes_error_item(self, client, model_response):
+        async def predict(endpoint, params=None):
+            return model_response({"home_team": params["team1"]})
+
+        body = b'{"team1": "chiefs", "team2": "eagles"}\n'
+        with (
+            patch("src.core.responses.settings.UPSTREAM_VALIDATION_SAMPLE_RATE", 1.0),
+            patch("src.routes.predictions.model_client.get", side_effect=predict),
+        ):
+            response = client.post("/predictions/batch/stream", content=body * 2)
+
+        items = [json.loads(line) for line in response.text.strip().split("\n")]
+        assert len(items) == 2
+        assert {item["error"]["error"] for item in items} == {
+            "Invalid prediction from model service"
+        }
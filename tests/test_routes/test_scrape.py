@@ -1,7 +1,24 @@
 """E2E tests for scrape routes."""
 
+import asyncio
+import json
+
 import pytest
 from unittest.mock import AsyncMock, patch
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from src.core.jobs import JobRegistry
+from src.main import app
+
+
+def _result(client, url):
+    """Poll a job result URL until the job has finished."""
+    for _ in range(100):
+        response = client.get(url)
+        if response.status_code != 202:
+            return response
+    raise AssertionError("job did not finish")
 
 
 class TestScrapeRoutes:
@@ -18,7 +35,7 @@ class TestScrapeRoutes:
                 "pagination": None,
             }
 
-            response = client.get("/scrape/KC/2024")
+            response = client.get("/scrape/KC/2024?async=false")
 
             assert response.status_code == 200
             data = response.json()
@@ -42,7 +59,7 @@ class TestScrapeRoutes:
                 "pagination": None,
             }
 
-            response = client.get("/scrape/2024")
+            response = client.get("/scrape/2024?async=false")
 
             assert response.status_code == 200
             data = response.json()
@@ -64,7 +81,7 @@ class TestScrapeRoutes:
                 "pagination": None,
             }
 
-            response = client.post("/scrape/excel")
+            response = client.post("/scrape/excel?async=false")
 
             assert response.status_code == 200
             data = response.json()
@@ -90,7 +107,7 @@ class TestScrapeRoutes:
                 },
             )
 
-            response = client.get("/scrape/KC/2024")
+            response = client.get("/scrape/KC/2024?async=false")
 
             assert response.status_code == 503
 
@@ -112,6 +129,182 @@ class TestScrapeRoutes:
                 },
             )
 
-            response = client.get("/scrape/INVALID/2024")
+            response = client.get("/scrape/INVALID/2024?async=false")
 
             assert response.status_code == 404
+
+
+class TestScrapeJobs:
+    """Tests for scrapes submitted as background jobs."""
+
+    def test_submit_returns_202_and_result_when_done(self):
+        with patch(
+            "src.routes.scrape.data_client.get", new_callable=AsyncMock
+        ) as mock_get, TestClient(app) as client:
+            mock_get.return_value = {"data": {"status": "completed"}}
+            response = client.get("/scrape/KC/2024")
+
+            assert response.status_code == 202
+            job = response.json()
+            assert response.headers["location"] == job["status_url"]
+
+            result = _result(client, job["result_url"])
+            status = client.get(job["status_url"]).json()
+
+        assert result.status_code == 200
+        assert result.json() == {"data": {"status": "completed"}}
+        assert status["status"] == "succeeded"
+        assert status["progress"] == {"completed": 1, "total": 1}
+        mock_get.assert_called_once_with("/scrape/KC/2024")
+
+    @pytest.mark.asyncio
+    async def test_duplicate_submissions_attach_to_running_job(self):
+        registry = JobRegistry("test", workers=1, history=10)
+        release = asyncio.Event()
+        calls = []
+
+        async def run(job):
+            calls.append(job.id)
+            await release.wait()
+            return "done"
+
+        first, created = registry.submit("team:KC:2024", run)
+        second, attached_created = registry.submit("team:KC:2024", run)
+        assert created and not attached_created
+        assert second is first
+
+        release.set()
+        assert await registry.wait(first) == "done"
+        third, created_again = registry.submit("team:KC:2024", run)
+        assert created_again and third is not first
+        release.set()
+        await registry.wait(third)
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_worker_pool_bounds_concurrency(self):
+        registry = JobRegistry("test", workers=2, history=10)
+        registry.start()
+        running = 0
+        peak = 0
+
+        async def run(job):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        try:
+            jobs = [registry.submit(f"year:{y}", run)[0] for y in range(2018, 2024)]
+            await asyncio.gather(*(registry.wait(job) for job in jobs))
+        finally:
+            await registry.stop()
+        assert peak == 2
+
+    def test_failed_job_result_returns_backend_status(self):
+        with patch(
+            "src.routes.scrape.data_client.get", new_callable=AsyncMock
+        ) as mock_get, TestClient(app) as client:
+            mock_get.side_effect = HTTPException(status_code=404, detail="no team")
+            job = client.get("/scrape/XX/2024").json()
+            result = _result(client, job["result_url"])
+            status = client.get(job["status_url"]).json()
+
+        assert result.status_code == 404
+        assert status["status"] == "failed"
+        assert status["error"] == {"status_code": 404, "detail": "no team"}
+
+    def test_unknown_job_returns_404(self, client):
+        assert client.get("/scrape/jobs/does-not-exist").status_code == 404
+
+
+class TestPerTeamSeasonScrape:
+    """Tests for GET /scrape/{year}?per_team=true."""
+
+    def test_scrapes_every_team_with_bounded_concurrency(self, client):
+        in_flight = 0
+        peak = 0
+        calls = []
+
+        async def fake_get(endpoint, params=None):
+            nonlocal in_flight, peak
+            calls.append(endpoint)
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+            return {"data": {"status": "completed"}}
+
+        with patch("src.routes.scrape.data_client.get", side_effect=fake_get), patch(
+            "src.routes.scrape.settings.SCRAPE_TEAM_CONCURRENCY", 3
+        ):
+            response = client.get("/scrape/2024?per_team=true&async=false")
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["succeeded"] == 32 and body["failed"] == 0
+        assert len(calls) == 32 and "/scrape/chiefs/2024" in calls
+        assert "/scrape/2024" not in calls
+        assert peak == 3
+
+    def test_failed_teams_are_retried_then_resumable(self, client):
+        attempts = {}
+
+        async def flaky_get(endpoint, params=None):
+            attempts[endpoint] = attempts.get(endpoint, 0) + 1
+            if endpoint == "/scrape/bills/2024":
+                raise HTTPException(status_code=503, detail="busy")
+            if endpoint == "/scrape/jets/2024" and attempts[endpoint] == 1:
+                raise HTTPException(status_code=502, detail="blip")
+            return {"data": {}}
+
+        with patch("src.routes.scrape.data_client.get", side_effect=flaky_get), patch(
+            "src.routes.scrape.settings.RETRY_BASE_DELAY", 0
+        ):
+            first = client.get("/scrape/2024?per_team=true&async=false").json()
+
+        teams = {t["team"]: t for t in first["teams"]}
+        assert teams["jets"] == {"team": "jets", "status": "succeeded", "attempts": 2}
+        assert teams["bills"]["status"] == "failed"
+        assert teams["bills"]["attempts"] == 3
+        assert first["succeeded"] == 31 and first["failed"] == 1
+
+        with patch(
+            "src.routes.scrape.data_client.get", new_callable=AsyncMock
+        ) as mock_get:
+            mock_get.return_value = {"data": {}}
+            second = client.get(
+                f"/scrape/2024?per_team=true&async=false"
+                f"&resume={first['resume_token']}"
+            ).json()
+
+        mock_get.assert_called_once_with("/scrape/bills/2024")
+        assert second["succeeded"] == 1
+        assert len(second["skipped"]) == 31
+
+    def test_resume_token_for_other_season_rejected(self, client):
+        from src.routes.scrape import resume_token
+
+        token = resume_token(2023, ["chiefs"])
+        response = client.get(f"/scrape/2024?per_team=true&resume={token}")
+        assert response.status_code == 400
+
+    def test_progress_streams_over_sse(self):
+        with patch(
+            "src.routes.scrape.data_client.get", new_callable=AsyncMock
+        ) as mock_get, TestClient(app) as client:
+            mock_get.return_value = {"data": {}}
+            job = client.get("/scrape/2024?per_team=true").json()
+            response = client.get(f"{job['status_url']}/events")
+
+        assert response.headers["content-type"].startswith("text/event-stream")
+        messages = response.text.strip().split("\n\n")
+        events = [m.splitlines()[0] for m in messages]
+        assert events.count("event: team") == 32
+        assert events[-1] == "event: done"
+        last_team = json.loads(messages[-2].splitlines()[1].removeprefix("data: "))
+        assert last_team["completed"] == last_team["total"] == 32
+        done = json.loads(messages[-1].splitlines()[1].removeprefix("data: "))
+        assert done["status"] == "succeeded"
+        assert done["result"]["resume_token"]
@@ -1,5 +1,7 @@
 """E2E tests for stats routes."""
 
+import json
+
 import pytest
 from unittest.mock import AsyncMock, patch
 
@@ -149,3 +151,44 @@ class TestStatsRoutes:
             assert response.status_code == 200
             data = response.json()
             assert data["data"] == []
+
+
+class TestAllPlayersRoute:
+    """Tests for the auto-paginating /players/all stream."""
+
+    @staticmethod
+    def _page(endpoint, params):
+        page = params["page"]
+        return {
+            "data": [{"name": f"p{page}-{i}"} for i in range(2)],
+            "pagination": {"page": page, "limit": 200, "total": 8, "total_pages": 4},
+        }
+
+    def test_streams_every_page_in_order(self, client):
+        """Test that all pages are fetched and emitted as NDJSON in page order."""
+        with patch(
+            "src.routes.stats.data_client.get", new_callable=AsyncMock
+        ) as mock_get:
+            mock_get.side_effect = self._page
+            response = client.get("/players/all?season=2024&position=QB")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        names = [json.loads(line)["name"] for line in response.text.splitlines()]
+        assert names == [f"p{page}-{i}" for page in range(1, 5) for i in range(2)]
+        mock_get.assert_any_call(
+            "/stats/players",
+            params={"season": 2024, "limit": 200, "position": "QB", "page": 4},
+        )
+        assert mock_get.call_count == 4
+
+    def test_single_page_without_pagination(self, client):
+        """Test a response without pagination metadata is a single page."""
+        with patch(
+            "src.routes.stats.data_client.get", new_callable=AsyncMock
+        ) as mock_get:
+            mock_get.return_value = {"data": [{"name": "a"}], "pagination": None}
+            response = client.get("/players/all?season=2024")
+
+        assert response.text == '{"name":"a"}\n'
+        mock_get.assert_called_once()
@@ -1,6 +1,10 @@
 """Tests for request tracing with correlation IDs (issue #27)."""
 
+import json
 import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
 
 
 class TestRequestIdGeneration:
@@ -51,3 +55,127 @@ class TestRequestIdOnAllEndpoints:
     def test_stats_endpoint(self, client):
         response = client.get("/teams/chiefs/stats?season=2024")
         assert "X-Request-ID" in response.headers
+
+
+class TestTraceContextPropagation:
+    """Verify request ID and W3C traceparent are forwarded upstream."""
+
+    def test_data_client_forwards_trace_headers(self, client):
+        captured = {}
+
+        async def mock_request(*args, **kwargs):
+            captured.update(kwargs["headers"])
+            response = MagicMock(status_code=200)
+            response.json.return_value = {"data": []}
+            return response
+
+        with patch("src.core.client.httpx.AsyncClient") as mock_cls:
+            mock_http = AsyncMock()
+            mock_http.request = mock_request
+            mock_http.__aenter__ = AsyncMock(return_value=mock_http)
+            mock_http.__aexit__ = AsyncMock(return_value=False)
+            mock_cls.return_value = mock_http
+
+            trace_id = "4bf92f3577b34da6a3ce929d0e0e4736"
+            response = client.get(
+                "/standings?season=2024",
+                headers={
+                    "X-Request-ID": "trace-me",
+                    "Accept-Encoding": "identity",
+                    "traceparent": f"00-{trace_id}-00f067aa0ba902b7-01",
+                },
+            )
+
+        assert response.status_code == 200
+        assert captured["X-Request-ID"] == "trace-me"
+        version, forwarded_trace, parent_id, flags = captured["traceparent"].split("-")
+        assert version == "00"
+        assert forwarded_trace == trace_id
+        assert parent_id != "00f067aa0ba902b7"
+        assert flags == "01"
+
+    def test_model_client_forwards_trace_headers(self, client):
+        with patch("httpx.AsyncClient.get", new_callable=AsyncMock) as mock_get:
+            mock_get.side_effect = httpx.ConnectError("down")
+            client.get("/predictions/models", headers={"X-Request-ID": "model-trace"})
+
+        headers = mock_get.call_args.kwargs["headers"]
+        assert headers["X-Request-ID"] == "model-trace"
+        assert headers["traceparent"].startswith("00-")
+
+    def test_outbound_headers_empty_outside_request(self):
+        from src.core.tracing import outbound_headers
+
+        assert outbound_headers() == {}
+
+
+class TestServerTiming:
+    """Verify the Server-Timing latency breakdown."""
+
+    def test_total_in_server_timing(self, client):
+        response = client.get("/")
+        assert "total;dur=" in response.headers["Server-Timing"]
+
+    def test_auth_and_serialize_spans(self, client):
+        with patch("src.core.auth.settings") as mock_settings, patch(
+            "src.routes.stats.data_client.get", new_callable=AsyncMock
+        ) as mock_get:
+            mock_settings.API_KEYS = "key-1"
+            mock_get.return_value = {"data": {}}
+            response = client.get(
+                "/teams/KC/stats?season=2024", headers={"X-API-Key": "key-1"}
+            )
+
+        timing = response.headers["Server-Timing"]
+        assert "auth;dur=" in timing
+        assert "serialize;dur=" in timing
+
+    def test_upstream_attempts_in_server_timing(self, client):
+        with patch("src.core.client.httpx.AsyncClient") as mock_cls:
+            mock_http = AsyncMock()
+            mock_http.request = AsyncMock(side_effect=httpx.ConnectError("down"))
+            mock_http.__aenter__ = AsyncMock(return_value=mock_http)
+            mock_http.__aexit__ = AsyncMock(return_value=False)
+            mock_cls.return_value = mock_http
+
+            with patch("src.core.client.asyncio.sleep", new_callable=AsyncMock):
+                response = client.get("/odds/live")
+
+        timing = response.headers["Server-Timing"]
+        assert timing.count("upstream;dur=") == 3
+        assert 'desc="beat-books-data"' in timing
+
+
+class TestOTLPExport:
+    """Verify sampled traces are exported as OTLP-JSON lines."""
+
+    def test_sampled_trace_written_to_file(self, client, tmp_path):
+        from src.core import tracing
+
+        path = tmp_path / "spans.jsonl"
+        trace_id = "0af7651916cd43dd8448eb211c80319c"
+        with patch.object(tracing, "_exporter", tracing.FileSpanExporter(str(path))):
+            client.get(
+                "/", headers={"traceparent": f"00-{trace_id}-b7ad6b7169203331-01"}
+            )
+
+        exported = json.loads(path.read_text().splitlines()[0])
+        spans = exported["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        root = next(s for s in spans if s["name"] == "total")
+        assert root["traceId"] == trace_id
+        assert root["parentSpanId"] == "b7ad6b7169203331"
+        assert root["kind"] == 2
+
+    def test_unsampled_trace_not_written(self, client, tmp_path):
+        from src.core import tracing
+
+        path = tmp_path / "spans.jsonl"
+        with patch.object(tracing, "_exporter", tracing.FileSpanExporter(str(path))):
+            client.get(
+                "/",
+                headers={
+                    "traceparent": "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-00"
+                },
+            )
+
+        assert not path.exists()
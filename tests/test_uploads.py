@@ -0,0 +1,146 @@
+"""Tests for streaming Excel uploads through /scrape/excel."""
+
+import hashlib
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+
+from src.core.uploads import MultipartReader, multipart_boundary
+
+BOUNDARY = "----test-boundary"
+FILE = b"PK\x03\x04" + b"spreadsheet\r\n--not-the-boundary\r\n" * 500
+
+
+def _multipart(content: bytes = FILE) -> bytes:
+    return (
+        (
+            f"--{BOUNDARY}\r\n"
+            'Content-Disposition: form-data; name="note"\r\n\r\n'
+            "week 1\r\n"
+            f"--{BOUNDARY}\r\n"
+            'Content-Disposition: form-data; name="file"; filename="schedule.xlsx"\r\n'
+            "Content-Type: application/vnd.ms-excel\r\n\r\n"
+        ).encode()
+        + content
+        + f"\r\n--{BOUNDARY}--\r\n".encode()
+    )
+
+
+async def _chunked(data: bytes, size: int, consumed: list[int]):
+    for start in range(0, len(data), size):
+        consumed.append(start)
+        yield data[start : start + size]
+
+
+class TestMultipartReader:
+    @pytest.mark.asyncio
+    async def test_streams_file_part_in_small_chunks(self):
+        consumed: list[int] = []
+        reader = MultipartReader(_chunked(_multipart(), 7, consumed), BOUNDARY.encode())
+
+        headers = await reader.next_file()
+        assert headers.get_filename() == "schedule.xlsx"
+        chunks = []
+        async for chunk in reader.read():
+            if not chunks:
+                first_at = len(consumed)
+            chunks.append(chunk)
+
+        assert b"".join(chunks) == FILE
+        assert first_at < len(consumed) / 10  # relayed long before the end
+        assert max(len(c) for c in chunks) <= 7 + len(BOUNDARY) + 4
+
+    @pytest.mark.asyncio
+    async def test_truncated_body_rejected(self):
+        body = _multipart()[:-100]
+        reader = MultipartReader(_chunked(body, 1024, []), BOUNDARY.encode())
+        await reader.next_file()
+
+        with pytest.raises(HTTPException) as exc:
+            async for _ in reader.read():
+                pass
+        assert exc.value.status_code == 400
+
+    def test_boundary_required(self):
+        assert multipart_boundary(f"multipart/form-data; boundary={BOUNDARY}") == (
+            BOUNDARY.encode()
+        )
+        with pytest.raises(HTTPException):
+            multipart_boundary("multipart/form-data")
+
+
+class TestExcelUpload:
+    def _post(self, client, body=None, **headers):
+        return client.post(
+            "/scrape/excel",
+            content=_multipart() if body is None else body,
+            headers={"Content-Type": f"multipart/form-data; boundary={BOUNDARY}"}
+            | headers,
+        )
+
+    @pytest.fixture
+    def backend(self):
+        """Fake beat-books-data upload endpoint that reads the relayed body."""
+        received = {}
+
+        async def upload(endpoint, content, content_type):
+            received["endpoint"] = endpoint
+            received["content_type"] = content_type
+            received["body"] = b""
+            async for chunk in content:
+                received["body"] += chunk
+            return {"data": {"status": "completed"}}
+
+        with patch("src.routes.scrape.data_client.upload", side_effect=upload):
+            yield received
+
+    def test_upload_relayed_with_checksum(self, client, backend):
+        sha = hashlib.sha256(FILE).hexdigest()
+        response = self._post(client, **{"X-Content-SHA256": sha.upper()})
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "data": {"status": "completed"},
+            "upload": {"filename": "schedule.xlsx", "bytes": len(FILE), "sha256": sha},
+        }
+        boundary = backend["content_type"].split("boundary=")[1]
+        assert backend["endpoint"] == "/scrape/excel"
+        assert backend["body"].startswith(f"--{boundary}\r\n".encode())
+        assert b'filename="schedule.xlsx"' in backend["body"]
+        assert FILE in backend["body"]
+        assert backend["body"].endswith(f"\r\n--{boundary}--\r\n".encode())
+
+    def test_checksum_mismatch_aborts_before_upload_completes(self, client, backend):
+        response = self._post(client, **{"X-Content-SHA256": "0" * 64})
+
+        assert response.status_code == 422
+        assert response.json()["detail"]["error"]["code"] == "CHECKSUM_MISMATCH"
+        assert FILE in backend["body"]
+        assert not backend["body"].endswith(b"--\r\n")
+
+    def test_size_limit_enforced(self, client, backend):
+        with patch("src.routes.scrape.settings.SCRAPE_UPLOAD_MAX_BYTES", 1000):
+            response = self._post(client)
+        assert response.status_code == 413
+        assert len(backend["body"]) < len(FILE)
+
+    def test_declared_length_over_limit_rejected_before_reading(self, client):
+        with patch("src.routes.scrape.settings.SCRAPE_UPLOAD_MAX_BYTES", 10):
+            with patch("src.routes.scrape.data_client.upload") as upload:
+                response = self._post(client)
+        assert response.status_code == 413
+        upload.assert_not_called()
+
+    def test_upload_without_file_part_rejected(self, client, backend):
+        body = f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=x\r\n\r\n1\r\n"
+        body += f"--{BOUNDARY}--\r\n"
+        assert self._post(client, body.encode()).status_code == 400
+
+    def test_async_upload_rejected(self, client):
+        response = client.post(
+            "/scrape/excel?async=true",
+            content=_multipart(),
+            headers={"Content-Type": f"multipart/form-data; boundary={BOUNDARY}"},
+        )
+        assert response.status_code == 400
@@ -0,0 +1,257 @@
+"""Tests for upstream client instrumentation."""
+
+import asyncio
+import threading
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from prometheus_client import REGISTRY
+
+from src.core.client import (
+    ConnectionSlots,
+    DataServiceClient,
+    ModelServiceClient,
+    upstream_route_template,
+)
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+async def _client_of(slots):
+    return slots.client()
+
+
+def _mock_async_client(mock_request):
+    mock_http = AsyncMock()
+    mock_http.request = mock_request
+    mock_http.__aenter__ = AsyncMock(return_value=mock_http)
+    mock_http.__aexit__ = AsyncMock(return_value=False)
+    return mock_http
+
+
+class TestRouteTemplates:
+    """Upstream endpoints are labelled by template, not concrete path."""
+
+    def test_team_stats_template(self):
+        assert upstream_route_template("/stats/teams/chiefs") == "/stats/teams/{team}"
+
+    def test_scrape_templates(self):
+        assert upstream_route_template("/scrape/KC/2024") == "/scrape/{team}/{year}"
+        assert upstream_route_template("/scrape/2024") == "/scrape/{year}"
+        assert upstream_route_template("/scrape/excel") == "/scrape/excel"
+
+    def test_odds_history_template(self):
+        assert (
+            upstream_route_template("/odds/history/game-123")
+            == "/odds/history/{game_id}"
+        )
+
+
+class TestConnectionSlots:
+    """Connection slots bound concurrency and report utilization."""
+
+    @pytest.mark.asyncio
+    async def test_waits_when_exhausted(self):
+        slots = ConnectionSlots("test-slots", limit=1)
+        order = []
+
+        async def worker(name):
+            async with slots.acquire():
+                order.append(f"{name}-start")
+                await asyncio.sleep(0.01)
+                order.append(f"{name}-end")
+
+        await asyncio.gather(worker("a"), worker("b"))
+        assert order == ["a-start", "a-end", "b-start", "b-end"]
+        assert slots.in_use == 0
+        assert _sample("upstream_pool_wait_seconds_count", backend="test-slots") == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_leak_slot(self):
+        slots = ConnectionSlots("test-cancel", limit=1)
+        async with slots.acquire():
+            waiter = asyncio.create_task(slots.acquire().__aenter__())
+            await asyncio.sleep(0)
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+        assert slots.in_use == 0
+
+    @pytest.mark.asyncio
+    async def test_one_pooled_client_per_backend(self):
+        slots = ConnectionSlots("test-pool", limit=3)
+        client = slots.client()
+        assert slots.client() is client
+        pool = client._transport._pool
+        assert pool._max_connections == 3
+        assert pool._max_keepalive_connections == 3
+        await slots.aclose()
+        assert slots.client() is not client
+        await slots.aclose()
+
+    def test_client_from_an_earlier_loop_is_closed(self):
+        slots = ConnectionSlots("test-loops", limit=1)
+
+        async def replace():
+            new = slots.client()
+            await asyncio.gather(*slots._retiring)
+            return new
+
+        old = asyncio.run(_client_of(slots))
+        new = asyncio.run(replace())
+        assert new is not old
+        assert old.is_closed
+        assert not new.is_closed
+
+    def test_client_on_a_running_loop_is_closed_there(self):
+        slots = ConnectionSlots("test-threads", limit=1)
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever)
+        thread.start()
+        try:
+            old = asyncio.run_coroutine_threadsafe(_client_of(slots), loop).result()
+            asyncio.run(_client_of(slots))
+            deadline = time.monotonic() + 1
+            while not old.is_closed and time.monotonic() < deadline:
+                time.sleep(0.001)
+            assert old.is_closed
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+    @pytest.mark.asyncio
+    async def test_detached_slot_is_held_until_released(self):
+        slots = ConnectionSlots("test-detach", limit=1)
+        async with slots.acquire() as detach:
+            release = detach()
+        assert slots.in_use == 1
+        release()
+        release()
+        assert slots.in_use == 0
+
+    @pytest.mark.asyncio
+    async def test_streamed_response_holds_its_slot_until_closed(self):
+        real_client = httpx.AsyncClient
+
+        async def body():
+            yield b"ok"
+
+        transport = httpx.MockTransport(
+            lambda request: httpx.Response(200, content=body())
+        )
+        client = DataServiceClient()
+        client.slots = ConnectionSlots("test-stream", limit=2)
+        with patch(
+            "src.core.client.httpx.AsyncClient",
+            side_effect=lambda **kwargs: real_client(transport=transport, **kwargs),
+        ) as factory:
+            first = await client.stream("/players")
+            second = await client.stream("/players")
+            assert client.slots.in_use == 2
+            await first.aclose()
+            await second.aclose()
+        assert client.slots.in_use == 0
+        assert factory.call_count == 1
+        await client.aclose()
+
+    def test_exports_pool_limit(self):
+        ConnectionSlots("test-limit", limit=7)
+        assert _sample("upstream_pool_connections_max", backend="test-limit") == 7
+
+
+class TestDataClientMetrics:
+    """DataServiceClient records latency, retries, backoff and breaker state."""
+
+    @pytest.mark.asyncio
+    async def test_records_retries_and_backoff(self):
+        client = DataServiceClient()
+        client.base_delay = 0.001
+        labels = {"backend": "beat-books-data", "route": "/stats/teams/{team}"}
+        retries_before = _sample("upstream_retries_total", **labels)
+        backoff_before = _sample(
+            "upstream_backoff_seconds_total", backend="beat-books-data"
+        )
+        ok = MagicMock(status_code=200)
+        ok.json.return_value = {"data": "ok"}
+        calls = 0
+
+        async def mock_request(*args, **kwargs):
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                raise httpx.ConnectError("refused")
+            return ok
+
+        with patch("src.core.client.httpx.AsyncClient") as mock_cls:
+            mock_cls.return_value = _mock_async_client(mock_request)
+            await client.get("/stats/teams/chiefs", params={"season": 2024})
+
+        assert _sample("upstream_retries_total", **labels) == retries_before + 1
+        assert (
+            _sample("upstream_backoff_seconds_total", backend="beat-books-data")
+            > backoff_before
+        )
+        assert (
+            _sample(
+                "upstream_request_duration_seconds_count",
+                method="GET",
+                outcome="2xx",
+                **labels,
+            )
+            >= 1
+        )
+
+    @pytest.mark.asyncio
+    async def test_records_circuit_rejection(self):
+        client = DataServiceClient()
+        client.circuit_breaker.failure_threshold = 1
+        client.circuit_breaker.record_failure()
+        before = _sample("upstream_circuit_rejections_total", backend="beat-books-data")
+
+        with pytest.raises(Exception):
+            await client.get("/stats/standings")
+
+        assert (
+            _sample("upstream_circuit_rejections_total", backend="beat-books-data")
+            == before + 1
+        )
+        assert _sample("upstream_circuit_state", backend="beat-books-data") == 2
+        client.circuit_breaker.record_success()
+        client._record_circuit_state()
+
+
+class TestModelClientMetrics:
+    """ModelServiceClient records per-route latency and propagates errors."""
+
+    @pytest.mark.asyncio
+    async def test_records_latency_by_outcome(self):
+        client = ModelServiceClient()
+        labels = {
+            "backend": "beat-books-model",
+            "route": "/predict",
+            "method": "GET",
+        }
+        before = _sample(
+            "upstream_request_duration_seconds_count", outcome="timeout", **labels
+        )
+        with patch("httpx.AsyncClient.get", new_callable=AsyncMock) as mock_get:
+            mock_get.side_effect = httpx.TimeoutException("slow")
+            with pytest.raises(httpx.TimeoutException):
+                await client.get("/predict", params={"team1": "a", "team2": "b"})
+
+        assert (
+            _sample(
+                "upstream_request_duration_seconds_count", outcome="timeout", **labels
+            )
+            == before + 1
+        )
+
+    def test_metrics_endpoint_exposes_upstream_metrics(self, client):
+        body = client.get("/metrics").text
+        assert "upstream_request_duration_seconds" in body
+        assert "upstream_pool_connections_max" in body